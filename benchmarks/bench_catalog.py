@@ -0,0 +1,45 @@
+"""Холодный старт двоичного каталога в зависимости от его размера
+
+Для каждого размера замеряется открытие каталога и первый поиск по ISBN,
+а для сравнения - восстановление PersistentLibrary из снимка.
+
+Запуск:
+    python -m benchmarks.bench_catalog [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.common import make_books
+from src.books import PrintedBook
+from src.catalog import write_catalog, MappedLibrary
+from src.storage import PersistentLibrary
+
+
+def run(sizes) -> None:
+    print(f"{'книг':>10} {'открытие, мс':>13} {'поиск ISBN, мс':>15} {'снимок, мс':>12}")
+    for size in sizes:
+        books = make_books(PrintedBook, size)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "books.cat")
+            write_catalog(path, books)
+            start = time.perf_counter()
+            with MappedLibrary(path) as library:
+                open_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                assert library.find_by_isbn(books[size // 2].isbn) is not None
+                lookup_ms = (time.perf_counter() - start) * 1000
+
+            with PersistentLibrary(directory, snapshot_every=None) as library:
+                library.add_books(books)
+                library.checkpoint()
+            start = time.perf_counter()
+            with PersistentLibrary(directory):
+                snapshot_ms = (time.perf_counter() - start) * 1000
+        print(f"{size:>10} {open_ms:>13.3f} {lookup_ms:>15.3f} {snapshot_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    run(parser.parse_args().sizes)
@@ -0,0 +1,60 @@
+"""Пропускная способность ThreadSafeLibrary при разной доле записей
+
+Запуск:
+    python -m benchmarks.bench_concurrency [--count N] [--ops N] [--threads 1 2 4 8]
+"""
+import argparse
+import random
+import threading
+import time
+from benchmarks.common import make_books
+from src.books import PrintedBook
+from src.concurrency import ThreadSafeLibrary
+
+
+def worker(library, books, ops, write_share, seed):
+    """ops операций: поиск по автору или году, либо удаление и повторное добавление книги"""
+    rng = random.Random(seed)
+    for _ in range(ops):
+        book = books[rng.randrange(len(books))]
+        if rng.random() < write_share:
+            with library.lock.writing():
+                if book.isbn in library.index:
+                    library.remove_book(book)
+                else:
+                    library.add_book(book)
+        elif rng.random() < 0.5:
+            library.query(author=book.author, year=book.year)
+        else:
+            library.find_by_isbn(book.isbn)
+
+
+def bench(books, threads, ops, write_share):
+    """Операций в секунду для threads потоков"""
+    library = ThreadSafeLibrary()
+    library.add_books(books)
+    workers = [threading.Thread(target=worker, args=(library, books, ops, write_share, seed))
+               for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def run(count, ops, thread_counts):
+    books = make_books(PrintedBook, count)
+    for label, write_share in (("чтение 95%", 0.05), ("чтение 50%", 0.5), ("запись 95%", 0.95)):
+        print(f"{label}:")
+        for threads in thread_counts:
+            print(f"  потоков {threads:>2}: {bench(books, threads, ops, write_share):>12,.0f} операций/с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--ops", type=int, default=20_000, help="операций на поток")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    run(args.count, args.ops, args.threads)
@@ -0,0 +1,82 @@
+"""Экономия памяти и скорость поиска при общих экземплярах автора, жанра и диктора
+
+Книги создаются из свежих строк, как после разбора CSV или JSON, где у каждой
+записи своя копия значения. Для сравнения общие экземпляры отключаются.
+
+Запуск:
+    python -m benchmarks.bench_encoding [--count N]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from benchmarks.common import author_pool, zipf_cum_weights
+from src import books as books_module
+from src.books import AudioBook
+from src.constants import GENRES, NARRATORS, TITLES
+from src.indexdict import IndexDict
+
+
+def _copy(text):
+    """Новый объект строки с тем же значением"""
+    return (text + " ")[:-1]
+
+
+def make_rows(count, seed=0):
+    """Поля аудиокниг со свежими строками автора, жанра и диктора"""
+    rng = random.Random(seed)
+    authors = author_pool()
+    picked = rng.choices(authors, cum_weights=zipf_cum_weights(len(authors)), k=count)
+    for i in range(count):
+        yield (rng.choice(TITLES), _copy(picked[i]), rng.randint(1800, 2026), _copy(rng.choice(GENRES)),
+               f"ISBN-{i:09d}", rng.randint(1, 10000), _copy(rng.choice(NARRATORS)))
+
+
+def build(count, interning):
+    """Книги и байт на книгу; interning=False временно отключает общие экземпляры"""
+    saved = books_module.intern_value
+    if not interning:
+        books_module.intern_value = str
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = [AudioBook(*row) for row in make_rows(count)]
+        elapsed = time.perf_counter() - start
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        books_module.intern_value = saved
+    return result, used / count, count / elapsed
+
+
+def lookup_rate(index, keys):
+    """Поисков count_by("author") в секунду"""
+    start = time.perf_counter()
+    for key in keys:
+        index.count_by("author", key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def run(count):
+    print(f"{count} аудиокниг")
+    for interning in (False, True):
+        label = "общие экземпляры" if interning else "свои копии строк"
+        result, per_book, rate = build(count, interning)
+        distinct = len({id(book.author) for book in result})
+        print(f"  {label:<18} {per_book:>7.1f} Б на книгу, {rate:>10,.0f} книг/с, объектов-авторов: {distinct}")
+
+        index = IndexDict()
+        index.add_books(result)
+        rng = random.Random(1)
+        sample = [book.author for book in rng.choices(result, k=200_000)]
+        # Ключ из запроса пользователя - отдельная строка; ключ, взятый у книги, - тот же объект, что в индексе
+        fresh = [_copy(author) for author in sample]
+        print(f"    поиск по автору: ключ книги {lookup_rate(index, sample):>12,.0f}/с, "
+              f"новая строка {lookup_rate(index, fresh):>12,.0f}/с")
+        del result, index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    run(parser.parse_args().count)
@@ -0,0 +1,47 @@
+"""Скорость потокового импорта CSV и JSON Lines (строк в секунду)
+
+Запуск:
+    python -m benchmarks.bench_importer [--count N]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+from benchmarks.common import book_fields
+from src.importer import import_books
+from src.library import Library
+from src.serialization import BOOK_FIELDS, BOOK_TYPES
+
+
+def write_files(directory, count):
+    """CSV и JSONL с одинаковыми книгами всех типов"""
+    rng = random.Random(0)
+    types = list(BOOK_TYPES.items())
+    columns = ["type"] + list(dict.fromkeys(f for fields in BOOK_FIELDS.values() for f in fields))
+    csv_path = os.path.join(directory, "books.csv")
+    jsonl_path = os.path.join(directory, "books.jsonl")
+    with open(csv_path, "w", encoding="utf-8", newline="") as csv_file, \
+            open(jsonl_path, "w", encoding="utf-8") as jsonl_file:
+        writer = csv.DictWriter(csv_file, columns)
+        writer.writeheader()
+        for i in range(count):
+            name, cls = types[i % len(types)]
+            record = {"type": name, **book_fields(cls, i, rng)}
+            writer.writerow(record)
+            jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return csv_path, jsonl_path
+
+
+def run(count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_files(directory, count):
+            report = import_books(Library(), path, os.path.join(directory, "rejects.jsonl"))
+            print(f"{os.path.basename(path):<12} {report}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    run(parser.parse_args().count)
@@ -0,0 +1,67 @@
+"""Память на одну книгу: раскладка через __dict__ против __slots__
+
+Запуск:
+    python -m benchmarks.bench_memory [--count N]
+"""
+import argparse
+import random
+import tracemalloc
+from benchmarks.common import BOOK_TYPES, book_fields
+
+
+def _slot_fields(cls):
+    """Поля из __slots__ класса и всех его предков, от базового к производному"""
+    fields = []
+    for base in reversed(cls.__mro__):
+        fields.extend(getattr(base, "__slots__", ()))
+    return tuple(fields)
+
+
+def _dict_class(cls):
+    """Класс с обычным __dict__ и теми же полями, что и cls (раскладка до __slots__)"""
+    fields = _slot_fields(cls)
+
+    def __init__(self, **values):
+        for field in fields:
+            setattr(self, field, values[field])
+
+    return type(f"Dict{cls.__name__}", (), {"__init__": __init__})
+
+
+def _measure(factory, count: int) -> float:
+    """Средний прирост памяти (байт) на один объект, созданный factory"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Список указателей на объекты к самим объектам не относится
+    list_overhead = 8 * len(objects)
+    del objects
+    return (after - before - list_overhead) / count
+
+
+def run(count: int) -> None:
+    print(f"{'Класс':<12} {'__dict__, Б':>12} {'__slots__, Б':>13} {'экономия':>9}")
+    for name, cls in BOOK_TYPES.items():
+        # Значения полей генерируем заранее, чтобы строки не попадали в замер
+        rng = random.Random(0)
+        rows = [book_fields(cls, i, rng) for i in range(count)]
+        dict_cls = _dict_class(cls)
+
+        def make_dict_book(i):
+            return dict_cls(**rows[i])
+
+        def make_slots_book(i):
+            return cls(**rows[i])
+
+        dict_bytes = _measure(make_dict_book, count)
+        slots_bytes = _measure(make_slots_book, count)
+        saved = 1 - slots_bytes / dict_bytes
+        print(f"{name:<12} {dict_bytes:>12.1f} {slots_bytes:>13.1f} {saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    run(parser.parse_args().count)
@@ -0,0 +1,57 @@
+"""Пропускная способность ShardedLibrary при разном числе процессов
+
+Каждый запрос query(author=, genre=) просматривает кандидатов во всех шардах
+параллельно; для сравнения тот же набор запросов выполняет обычная Library.
+
+Запуск:
+    python -m benchmarks.bench_sharding [--count N] [--queries N] [--shards 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import time
+from benchmarks.common import make_books
+from src.books import PrintedBook
+from src.constants import AUTHORS, GENRES
+from src.library import Library
+from src.sharding import ShardedLibrary
+
+
+def make_queries(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(AUTHORS), rng.choice(GENRES)) for _ in range(count)]
+
+
+def bench(library, queries):
+    """Запросов в секунду"""
+    start = time.perf_counter()
+    for author, genre in queries:
+        library.query(author=author, genre=genre)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def run(count, queries, shard_counts):
+    books = make_books(PrintedBook, count)
+    queries = make_queries(queries)
+    print(f"{count} книг, {len(queries)} запросов, ядер: {os.cpu_count()}")
+
+    library = Library()
+    library.add_books(books)
+    print(f"  Library          {bench(library, queries):>10,.0f} запросов/с")
+
+    for shards in shard_counts:
+        with ShardedLibrary(shards) as sharded:
+            start = time.perf_counter()
+            sharded.add_books(books)
+            load = time.perf_counter() - start
+            print(f"  шардов {shards:>2}        {bench(sharded, queries):>10,.0f} запросов/с"
+                  f"  (загрузка {load:.2f} с)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    run(args.count, args.queries, args.shards)
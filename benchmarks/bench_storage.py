@@ -0,0 +1,59 @@
+"""Скорость записи журнала операций и время восстановления библиотеки
+
+Запуск:
+    python -m benchmarks.bench_storage [--count N]
+"""
+import argparse
+import tempfile
+import time
+from benchmarks.common import make_books
+from src.books import PrintedBook
+from src.storage import PersistentLibrary
+
+
+def bench_writes(books, fsync_every) -> float:
+    """Операций добавления в секунду при заданном размере пакета fsync"""
+    with tempfile.TemporaryDirectory() as directory:
+        library = PersistentLibrary(directory, fsync_every=fsync_every, snapshot_every=None)
+        start = time.perf_counter()
+        for book in books:
+            library.add_book(book)
+        library.close()
+        return len(books) / (time.perf_counter() - start)
+
+
+def bench_recovery(books, tail: int) -> tuple:
+    """Время восстановления: снимок со всеми книгами, кроме tail последних, плюс журнал из tail операций"""
+    with tempfile.TemporaryDirectory() as directory:
+        with PersistentLibrary(directory, fsync_every=None, snapshot_every=None) as library:
+            library.add_books(books[:len(books) - tail])
+            library.checkpoint()
+            for book in books[len(books) - tail:]:
+                library.add_book(book)
+
+        start = time.perf_counter()
+        with PersistentLibrary(directory) as library:
+            elapsed = time.perf_counter() - start
+            assert len(library) == len(books)
+        return elapsed
+
+
+def run(count: int) -> None:
+    books = make_books(PrintedBook, count)
+
+    print(f"Запись {count} книг по одной:")
+    for fsync_every in (1, 10, 100, 1000, None):
+        label = "без fsync" if fsync_every is None else f"fsync каждые {fsync_every}"
+        # fsync на каждую запись медленный, поэтому для него берём меньше книг
+        sample = books if fsync_every not in (1, 10) else books[:min(count, 2000)]
+        print(f"  {label:<20} {bench_writes(sample, fsync_every):>12,.0f} операций/с")
+
+    print(f"Восстановление {count} книг:")
+    for tail in (0, count // 10, count):
+        print(f"  журнал {tail:>8} операций: {bench_recovery(books, tail):.3f} с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    run(parser.parse_args().count)
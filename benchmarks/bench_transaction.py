@@ -0,0 +1,64 @@
+"""Скорость записи: отдельные add_book/remove_book против одной транзакции на пакет
+
+Запуск:
+    python -m benchmarks.bench_transaction [--count N] [--batch N]
+"""
+import argparse
+import time
+from benchmarks.common import make_books
+from src.books import PrintedBook
+from src.library import Library
+
+
+def prepare(books, cache):
+    library = Library()
+    library.add_books(books)
+    if cache:
+        library.enable_cache()
+        for book in books[:500]:
+            library.query(author=book.author, year=book.year)
+    return library
+
+
+def single(library, old, new):
+    for book in old:
+        library.remove_book(book)
+    for book in new:
+        library.add_book(book)
+
+
+def batched(library, old, new, batch):
+    for start in range(0, len(old), batch):
+        with library.transaction() as tx:
+            for book in old[start:start + batch]:
+                tx.remove(book)
+            for book in new[start:start + batch]:
+                tx.add(book)
+
+
+def run(count, batch):
+    books = make_books(PrintedBook, count)
+    changed = count // 2
+    new = make_books(PrintedBook, count + changed)[count:]
+    print(f"{count} книг, заменяется {changed}, пакет {batch}")
+    for cache in (False, True):
+        timings = {}
+        for name in ("по одной", "транзакции"):
+            library = prepare(books, cache)
+            start = time.perf_counter()
+            if name == "по одной":
+                single(library, books[:changed], new)
+            else:
+                batched(library, books[:changed], new, batch)
+            timings[name] = time.perf_counter() - start
+        label = "с кэшем" if cache else "без кэша"
+        line = ", ".join(f"{name}: {2 * changed / elapsed:>10,.0f} оп/с" for name, elapsed in timings.items())
+        print(f"  {label:<9} {line}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.count, args.batch)
@@ -0,0 +1,61 @@
+"""Скорость создания книг (книг в секунду) с общими правилами валидации
+
+Для сравнения замеряется и прежняя проверка полей, которая на каждое поле
+заново собирала список запрещённых символов и искала цифры циклом.
+
+Запуск:
+    python -m benchmarks.bench_validation [--count N]
+"""
+import argparse
+import random
+import time
+from benchmarks.common import BOOK_TYPES, book_fields
+from src.books import Book
+
+def _legacy_check(title, author, year, genre):
+    """Проверка полей Book в том виде, в каком она была до общих правил"""
+    if title == "" or title is None or title.strip() == "":
+        raise ValueError
+    for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
+        if symbol in title:
+            raise ValueError
+    first_char = title.strip()[0]
+    if first_char.isupper() == False and first_char.isdigit() == False:
+        raise ValueError
+    for text in (author, genre):
+        if text == "" or text is None or text.strip() == "":
+            raise ValueError
+        for char in text:
+            if char.isdigit():
+                raise ValueError
+        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
+            if symbol in text:
+                raise ValueError
+    if author.strip()[0].isupper() == False:
+        raise ValueError
+    if year < 1800 or year > 2026:
+        raise ValueError
+
+
+def _rate(func, rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        func(**row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def run(count: int) -> None:
+    rng = random.Random(0)
+    base_rows = [book_fields(Book, i, rng) for i in range(count)]
+    legacy_rows = [{k: v for k, v in row.items() if k != "isbn"} for row in base_rows]
+    print(f"Прежняя проверка полей Book: {_rate(_legacy_check, legacy_rows):>12,.0f} проверок/с")
+
+    for name, cls in BOOK_TYPES.items():
+        rows = [book_fields(cls, i, rng) for i in range(count)]
+        print(f"{name:<12} {_rate(cls, rows):>12,.0f} книг/с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    run(parser.parse_args().count)
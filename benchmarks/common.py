@@ -0,0 +1,75 @@
+"""Общие генераторы данных для бенчмарков"""
+import random
+from src.books import Book, PrintedBook, EBook, AudioBook
+from src.constants import TITLES, AUTHORS, GENRES, NARRATORS, FILE_FORMATS, COVER_TYPES
+
+
+BOOK_TYPES = {
+    "Book": Book,
+    "PrintedBook": PrintedBook,
+    "EBook": EBook,
+    "AudioBook": AudioBook,
+}
+
+
+def book_fields(cls, i: int, rng: random.Random) -> dict:
+    """Набор валидных аргументов конструктора для книги класса cls"""
+    fields = {
+        "title": rng.choice(TITLES),
+        "author": rng.choice(AUTHORS),
+        "year": rng.randint(1800, 2026),
+        "genre": rng.choice(GENRES),
+        "isbn": f"ISBN-{i:09d}",
+    }
+    if cls is PrintedBook:
+        fields["pages"] = rng.randint(1, 10000)
+        fields["cover_type"] = rng.choice(COVER_TYPES)
+    elif cls is EBook:
+        fields["file_format"] = rng.choice(FILE_FORMATS)
+        fields["file_size_mb"] = round(rng.uniform(0.1, 100), 1)
+    elif cls is AudioBook:
+        fields["duration_minutes"] = rng.randint(1, 10000)
+        fields["narrator"] = rng.choice(NARRATORS)
+    return fields
+
+
+def make_books(cls, count: int, seed: int = 0) -> list:
+    """Список из count валидных книг класса cls с уникальными ISBN"""
+    rng = random.Random(seed)
+    return [cls(**book_fields(cls, i, rng)) for i in range(count)]
+
+
+def zipf_cum_weights(count: int, s: float = 1.1) -> list:
+    """Накопленные веса распределения Ципфа для count значений (первое - самое частое)"""
+    total = 0.0
+    cum_weights = []
+    for rank in range(1, count + 1):
+        total += 1 / rank ** s
+        cum_weights.append(total)
+    return cum_weights
+
+
+def author_pool() -> list:
+    """Несколько тысяч различных валидных имён авторов: фамилия и инициалы"""
+    letters = "АБВГДЕЖЗИКЛМНОПРСТУФХЦЧШЭЮЯ"
+    return [f"{surname} {first}.{second}." for surname in AUTHORS for first in letters for second in letters]
+
+
+def make_skewed_books(count: int, seed: int = 0) -> list:
+    """count книг всех типов с авторами и жанрами по закону Ципфа (популярные встречаются гораздо чаще)"""
+    rng = random.Random(seed)
+    authors = author_pool()
+    rng.shuffle(authors)
+    author_weights = zipf_cum_weights(len(authors))
+    genre_weights = zipf_cum_weights(len(GENRES), s=1.0)
+    classes = list(BOOK_TYPES.values())
+    picked_authors = rng.choices(authors, cum_weights=author_weights, k=count)
+    picked_genres = rng.choices(GENRES, cum_weights=genre_weights, k=count)
+    books = []
+    for i in range(count):
+        cls = classes[i % len(classes)]
+        fields = book_fields(cls, i, rng)
+        fields["author"] = picked_authors[i]
+        fields["genre"] = picked_genres[i]
+        books.append(cls(**fields))
+    return books
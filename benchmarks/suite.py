@@ -0,0 +1,151 @@
+"""Набор бенчмарков основных операций Library на каталогах от 10^3 до 10^6 книг
+
+Авторы и жанры распределены по закону Ципфа, ключи поиска берутся из того же
+распределения. Результаты - операций в секунду для каждой пары (операция, размер).
+С --output они сохраняются в JSON; с --baseline сравниваются с сохранёнными,
+и при замедлении больше допустимого скрипт завершается с кодом 1.
+
+Запуск:
+    python -m benchmarks.suite [--sizes 1000 10000] [--output results.json]
+                               [--baseline baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from benchmarks.common import BOOK_TYPES, book_fields, make_skewed_books
+from src.bookcollection import BookCollection
+from src.library import Library
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+MAX_POINT_OPS = 20_000  # Сколько поисков по ISBN, удалений и созданий книг замерять на каждом размере
+MAX_SCAN_WORK = 2_000_000  # Сколько книг в сумме просматривать в замерах с полным проходом
+
+
+def _rate(func, args_list, repeat):
+    """Лучшая из repeat попыток: вызовов func в секунду"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        elapsed = time.perf_counter() - start
+        best = max(best, len(args_list) / elapsed if elapsed else 0.0)
+    return best
+
+
+def _ignore_missing(find):
+    """Поиск, который не прерывает замер на отсутствующем ключе"""
+    def call(key):
+        try:
+            return find(key)
+        except KeyError:
+            return None
+    return call
+
+
+def bench_size(size, repeat, seed):
+    """Операций в секунду для каталога из size книг"""
+    books = make_skewed_books(size, seed)
+    rng = random.Random(seed)
+    results = {}
+
+    for name, cls in BOOK_TYPES.items():
+        rows = [tuple(book_fields(cls, i, rng).values()) for i in range(min(size, MAX_POINT_OPS))]
+        results[f"construct_{name}"] = _rate(cls, rows, repeat)
+
+    # add_book замеряется на пустой библиотеке, которая растёт до size книг
+    best = 0.0
+    for _ in range(repeat):
+        library = Library()
+        start = time.perf_counter()
+        for book in books:
+            library.add_book(book)
+        best = max(best, size / (time.perf_counter() - start))
+    results["add_book"] = best
+
+    sample = rng.choices(books, k=min(size, MAX_POINT_OPS))
+    results["find_by_isbn"] = _rate(library.find_by_isbn, [(book.isbn,) for book in sample], repeat)
+    # Ключи для поиска по автору, году и жанру берутся у случайных книг, то есть с тем же перекосом
+    for field in ("author", "year", "genre"):
+        find = _ignore_missing(getattr(library, f"find_by_{field}"))
+        keys = [(getattr(book, field),) for book in sample[:1000]]
+        results[f"find_by_{field}"] = _rate(find, keys, repeat)
+
+    collection = BookCollection()
+    collection.extend(books)
+    scans = max(3, MAX_SCAN_WORK // size)
+    results["collection_filter"] = _rate(lambda author: collection(author=author),
+                                         [(book.author,) for book in sample[:scans]], repeat)
+
+    # Удаление последним: после него библиотека уже не нужна
+    removed = list({book.isbn: book for book in sample}.values())
+    start = time.perf_counter()
+    for book in removed:
+        library.remove_book(book)
+    results["remove_book"] = len(removed) / (time.perf_counter() - start)
+    return results
+
+
+def run_suite(sizes, repeat=3, seed=0, log=print):
+    """Все замеры: словарь с описанием окружения и результатами "операция@размер" -> операций/с"""
+    results = {}
+    for size in sizes:
+        log(f"Каталог {size} книг")
+        for operation, rate in bench_size(size, repeat, seed).items():
+            results[f"{operation}@{size}"] = rate
+            log(f"  {operation:<20} {rate:>14,.0f} операций/с")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Сравнить результаты с базовыми; список замедлившихся (ключ, было, стало, отношение)"""
+    regressions = []
+    for key, base_rate in baseline["results"].items():
+        rate = current["results"].get(key)
+        if rate is None or not base_rate:
+            continue
+        ratio = rate / base_rate
+        if ratio < 1 - tolerance:
+            regressions.append((key, base_rate, rate, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="куда сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON с прошлыми результатами для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="допустимое замедление (доля)")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.sizes, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.tolerance)
+        for key, base_rate, rate, ratio in regressions:
+            print(f"РЕГРЕССИЯ {key}: было {base_rate:,.0f}, стало {rate:,.0f} операций/с ({ratio:.0%})")
+        if regressions:
+            return 1
+        print(f"Замедлений больше {args.tolerance:.0%} нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
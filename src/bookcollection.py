@@ -1,6 +1,7 @@
 class BookCollection:
     def __init__(self):
         self._books = []  # Внутренний список
+        self._positions = {}  # ISBN -> позиция книги в списке (для удаления за O(1))
 
     def __getitem__(self, index):
         return self._books[index] # Поддержка индексов и срезов
@@ -11,21 +12,38 @@ class BookCollection:
     def __len__(self):
         return len(self._books)
 
+    def __contains__(self, book):
+        return book.isbn in self._positions
+
     def add(self, book):
+        self._positions[book.isbn] = len(self._books)
         self._books.append(book) # Добавление книги
 
+    def extend(self, books):
+        start = len(self._books)
+        self._books.extend(books) # Добавление нескольких книг за раз
+        for position in range(start, len(self._books)):
+            self._positions[self._books[position].isbn] = position
+
     def remove(self, book):
-        self._books.remove(book) # Удаление книги
+        """Удаление книги за O(1): на её место переносится последняя книга списка"""
+        position = self._positions.pop(book.isbn, None)
+        if position is None:
+            raise ValueError(f"Книга с ISBN '{book.isbn}' не найдена в коллекции")
+        last = self._books.pop()
+        if position < len(self._books):
+            self._books[position] = last
+            self._positions[last.isbn] = position
 
     def __call__(self, author=None, year=None, genre=None):
         """Фильтрация книг по критериям при вызове коллекции как функции"""
         result = []
         for book in self._books:
-            if author and book.author != author:
+            if author is not None and book.author != author:
                 continue
-            if year and book.year != year:
+            if year is not None and book.year != year:
                 continue
-            if genre and book.genre != genre:
+            if genre is not None and book.genre != genre:
                 continue
             result.append(book)
         return result
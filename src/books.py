@@ -1,56 +1,34 @@
-from src.errors import (
-    NegativeNumberError,
-    NumberTooLargeError,
-    InvalidCoverTypeError,
-    EmptyStringError,
-    ContainsDigitsError,
-    LowercaseStartError,
-    ForbiddenSymbolError,
-    YearOutOfRangeError,
-)
+from src.encoding import intern_value
+from src.validators import FIELD_RULES
+
+
+# Правила берутся из общей таблицы один раз при импорте
+_check_title = FIELD_RULES["title"]
+_check_author = FIELD_RULES["author"]
+_check_year = FIELD_RULES["year"]
+_check_genre = FIELD_RULES["genre"]
+_check_pages = FIELD_RULES["pages"]
+_check_cover_type = FIELD_RULES["cover_type"]
+_check_file_size = FIELD_RULES["file_size_mb"]
+_check_duration = FIELD_RULES["duration_minutes"]
+_check_narrator = FIELD_RULES["narrator"]
+
 
 class Book:
+    # Фиксированный набор полей вместо __dict__ экономит память на каждом экземпляре
+    __slots__ = ("title", "author", "year", "genre", "isbn")
+
     def __init__(self, title, author, year, genre, isbn):
-        # Валидация названия
-        if title == "" or title is None or title.strip() == "":
-            raise EmptyStringError("название")
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in title:
-                raise ForbiddenSymbolError("название", title)
-        first_char = title.strip()[0]
-        if first_char.isupper() == False and first_char.isdigit() == False:
-            raise LowercaseStartError("название", title)
-
-        # Валидация автора
-        if author == "" or author is None or author.strip() == "":
-            raise EmptyStringError("автор")
-        for char in author:
-            if char.isdigit():
-                raise ContainsDigitsError("автор", author)
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in author:
-                raise ForbiddenSymbolError("автор", author)
-        if author.strip()[0].isupper() == False:
-            raise LowercaseStartError("автор", author)
-
-        # Валидация года
-        if year < 1800 or year > 2026:
-            raise YearOutOfRangeError(year, 1800, 2026)
-
-        # Валидация жанра
-        if genre == "" or genre is None or genre.strip() == "":
-            raise EmptyStringError("жанр")
-        for char in genre:
-            if char.isdigit():
-                raise ContainsDigitsError("жанр", genre)
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in genre:
-                raise ForbiddenSymbolError("жанр", genre)
+        _check_title(title)
+        _check_author(author)
+        _check_year(year)
+        _check_genre(genre)
 
         self.title = title
-        self.author = author
+        # Автор, жанр и диктор повторяются у многих книг: храним один общий экземпляр значения
+        self.author = intern_value(author)
         self.year = year
-        self.genre = genre
+        self.genre = intern_value(genre)
         self.isbn = isbn
 
     def __repr__(self):
@@ -63,18 +41,13 @@ class Book:
 class PrintedBook(Book):
     """Печатная книга"""
 
+    __slots__ = ("pages", "cover_type")
+
     def __init__(self, title, author, year, genre, isbn, pages, cover_type="мягкая"):
         super().__init__(title, author, year, genre, isbn)
 
-        # Валидация страниц
-        if pages <= 0:
-            raise NegativeNumberError("страницы", pages)
-        if pages > 10000:
-            raise NumberTooLargeError("страницы", pages, 10000)
-
-        # Валидация типа обложки
-        if cover_type != "мягкая" and cover_type != "твёрдая":
-            raise InvalidCoverTypeError(cover_type)
+        _check_pages(pages)
+        _check_cover_type(cover_type)
 
         self.pages = pages
         self.cover_type = cover_type
@@ -86,14 +59,12 @@ class PrintedBook(Book):
 class EBook(Book):
     """Электронная книга"""
 
+    __slots__ = ("file_format", "file_size_mb")
+
     def __init__(self, title, author, year, genre, isbn, file_format, file_size_mb):
         super().__init__(title, author, year, genre, isbn)
 
-        # Валидация размера файла
-        if file_size_mb <= 0:
-            raise NegativeNumberError("размер файла", file_size_mb)
-        if file_size_mb > 10000:
-            raise NumberTooLargeError("размер файла", file_size_mb, 10000)
+        _check_file_size(file_size_mb)
 
         self.file_format = file_format
         self.file_size_mb = file_size_mb
@@ -105,29 +76,16 @@ class EBook(Book):
 class AudioBook(Book):
     """Аудиокнига"""
 
+    __slots__ = ("duration_minutes", "narrator")
+
     def __init__(self, title, author, year, genre, isbn, duration_minutes, narrator):
         super().__init__(title, author, year, genre, isbn)
 
-        # Валидация длительности
-        if duration_minutes <= 0:
-            raise NegativeNumberError("длительность", duration_minutes)
-        if duration_minutes > 10000:
-            raise NumberTooLargeError("длительность", duration_minutes, 10000)
-
-        # Валидация диктора
-        if narrator == "" or narrator is None or narrator.strip() == "":
-            raise EmptyStringError("диктор")
-        for char in narrator:
-            if char.isdigit():
-                raise ContainsDigitsError("диктор", narrator)
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in narrator:
-                raise ForbiddenSymbolError("диктор", narrator)
-        if narrator.strip()[0].isupper() == False:
-            raise LowercaseStartError("диктор", narrator)
+        _check_duration(duration_minutes)
+        _check_narrator(narrator)
 
         self.duration_minutes = duration_minutes
-        self.narrator = narrator
+        self.narrator = intern_value(narrator)
 
     def __repr__(self):
         return f"Аудиокнига: '{self.title}', {self.author}, год записи: {self.year}, жанр: {self.genre}, isbn: {self.isbn}, {self.duration_minutes} мин., читает: {self.narrator}"
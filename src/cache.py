@@ -0,0 +1,155 @@
+"""Кэш результатов поиска с вытеснением давно не использованных записей (LRU)
+
+Ключ записи - условия запроса (автор, год, жанр, диапазон лет). При добавлении
+или удалении книги сбрасываются только записи, под условия которых эта книга
+подходит; остальные результаты остаются верными и продолжают использоваться.
+"""
+import threading
+from collections import OrderedDict
+
+
+def make_key(kind, author=None, year=None, genre=None, min_year=None, max_year=None):
+    """Ключ кэша; kind различает методы, которые при тех же условиях дают разный результат
+
+    (find_by_author бросает KeyError, а query возвращает пустой список; порядок книг
+    у find_by_year_range и query тоже разный).
+    """
+    return kind, author, year, genre, min_year, max_year
+
+
+def matches(key, book):
+    """Подходит ли книга под условия записи кэша"""
+    _, author, year, genre, min_year, max_year = key
+    return ((author is None or book.author == author)
+            and (year is None or book.year == year)
+            and (genre is None or book.genre == genre)
+            and (min_year is None or book.year >= min_year)
+            and (max_year is None or book.year <= max_year))
+
+
+class QueryCache:
+    """Ограниченный кэш списков книг
+
+    max_entries - сколько записей хранить, max_items - сколько книг во всех записях
+    вместе; результаты длиннее max_items не кэшируются.
+    """
+
+    def __init__(self, max_entries=1024, max_items=100_000):
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self._entries = OrderedDict()  # Ключ -> список книг, от давно использованных к недавним
+        self._items = 0
+        # Записи разложены по одному из условий, чтобы при изменении книги проверять только их
+        self._by_author = {}
+        self._by_year = {}
+        self._by_genre = {}
+        self._unkeyed = set()  # Записи только с диапазоном лет или без условий
+        self._lock = threading.Lock()  # Кэш меняется и при чтении, в том числе из нескольких потоков
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bucket(self, key):
+        """Множество, в котором зарегистрирована запись"""
+        _, author, year, genre, _, _ = key
+        if author is not None:
+            return self._by_author.setdefault(author, set())
+        if year is not None:
+            return self._by_year.setdefault(year, set())
+        if genre is not None:
+            return self._by_genre.setdefault(genre, set())
+        return self._unkeyed
+
+    def _drop(self, key):
+        """Убрать запись вместе с регистрацией"""
+        self._items -= len(self._entries.pop(key))
+        _, author, year, genre, _, _ = key
+        for index, value in ((self._by_author, author), (self._by_year, year), (self._by_genre, genre)):
+            if value is not None:
+                bucket = index[value]
+                bucket.discard(key)
+                if not bucket:
+                    del index[value]
+                return
+        self._unkeyed.discard(key)
+
+    def get(self, key, compute):
+        """Результат из кэша или вычисленный compute() (исключения compute не кэшируются)
+
+        Возвращается копия, чтобы изменение списка вызывающим не портило кэш.
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(result)
+            self.misses += 1
+        result = compute()
+        if len(result) <= self.max_items:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = list(result)
+                    self._items += len(result)
+                    self._bucket(key).add(key)
+                    while len(self._entries) > self.max_entries or self._items > self.max_items:
+                        self._drop(next(iter(self._entries)))
+                        self.evictions += 1
+        return result
+
+    def invalidate(self, book):
+        """Сбросить записи, под условия которых подходит книга"""
+        with self._lock:
+            candidates = set(self._unkeyed)
+            for index, value in ((self._by_author, book.author), (self._by_year, book.year),
+                                 (self._by_genre, book.genre)):
+                candidates.update(index.get(value, ()))
+            for key in candidates:
+                if matches(key, book):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def invalidate_many(self, books):
+        """Сбросить записи для пакета книг; для большого пакета проще очистить кэш"""
+        books = list(books)
+        if len(books) > len(self._entries):
+            with self._lock:
+                self.invalidations += len(self._entries)
+                self._clear()
+            return
+        for book in books:
+            self.invalidate(book)
+
+    def _clear(self):
+        self._entries.clear()
+        self._items = 0
+        self._by_author.clear()
+        self._by_year.clear()
+        self._by_genre.clear()
+        self._unkeyed.clear()
+
+    def clear(self):
+        """Удалить все записи"""
+        with self._lock:
+            self._clear()
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self):
+        """Счётчики кэша"""
+        return {
+            "entries": len(self._entries),
+            "items": self._items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,276 @@
+"""Двоичный каталог книг, открываемый через mmap
+
+Формат файла (порядок байт little-endian):
+    заголовок      HEADER: сигнатура, версия, число записей и строк, смещения разделов
+    записи         RECORD фиксированной длины, по одной на книгу
+    таблица строк  (string_count + 1) смещений uint64 и UTF-8 данные; строки отсортированы
+    индекс ISBN    номера записей uint32 в порядке возрастания ISBN
+
+Открытие читает только заголовок, поэтому не зависит от размера каталога.
+Книги собираются из записей только при обращении к ним.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from src.books import Book, PrintedBook, EBook, AudioBook
+from src.errors import DuplicateBookError
+
+
+MAGIC = b"BKCT"
+VERSION = 1
+
+# Сигнатура, версия, резерв, число записей, число строк, смещения таблицы строк, данных строк и индекса ISBN
+HEADER = struct.Struct("<4sHHIIQQQ")
+# Тип, флаги, год, id названия, автора, жанра, ISBN, число (страницы/МБ/минуты), id строки (обложка/формат/диктор)
+RECORD = struct.Struct("<BBHIIIIdI")
+_OFFSET = struct.Struct("<Q")
+_RECORD_WORDS = RECORD.size // 4
+
+NO_STRING = 0xFFFFFFFF
+FLAG_INT_NUMBER = 1  # Число в записи было int, а не float
+
+_TYPE_CODES = {Book: 0, PrintedBook: 1, EBook: 2, AudioBook: 3}
+_CODE_TYPES = {code: cls for cls, code in _TYPE_CODES.items()}
+
+
+def _extra_fields(book):
+    """Число и строка, которые добавляет к книге дочерний класс"""
+    if isinstance(book, PrintedBook):
+        return book.pages, book.cover_type
+    if isinstance(book, EBook):
+        return book.file_size_mb, book.file_format
+    if isinstance(book, AudioBook):
+        return book.duration_minutes, book.narrator
+    return 0, None
+
+
+def write_catalog(path, books):
+    """Записать книги в двоичный каталог; повторяющийся ISBN даёт DuplicateBookError"""
+    books = list(books)
+    strings = set()
+    for book in books:
+        number, extra = _extra_fields(book)
+        strings.update((book.title, book.author, book.genre, book.isbn))
+        if extra is not None:
+            strings.add(extra)
+    strings = sorted(strings)
+    string_ids = {value: i for i, value in enumerate(strings)}
+
+    records = bytearray()
+    isbns = []
+    for book in books:
+        number, extra = _extra_fields(book)
+        flags = FLAG_INT_NUMBER if isinstance(number, int) else 0
+        records += RECORD.pack(
+            _TYPE_CODES[type(book)], flags, book.year,
+            string_ids[book.title], string_ids[book.author], string_ids[book.genre], string_ids[book.isbn],
+            number, NO_STRING if extra is None else string_ids[extra],
+        )
+        isbns.append(book.isbn)
+
+    order = sorted(range(len(books)), key=isbns.__getitem__)
+    for previous, current in zip(order, order[1:]):
+        if isbns[previous] == isbns[current]:
+            raise DuplicateBookError(isbns[current])
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = bytearray()
+    position = 0
+    for data in encoded:
+        offsets += _OFFSET.pack(position)
+        position += len(data)
+    offsets += _OFFSET.pack(position)
+
+    string_offsets_pos = HEADER.size + len(records)
+    string_data_pos = string_offsets_pos + len(offsets)
+    isbn_index_pos = string_data_pos + position
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(books), len(strings),
+                               string_offsets_pos, string_data_pos, isbn_index_pos))
+        file.write(records)
+        file.write(offsets)
+        for data in encoded:
+            file.write(data)
+        file.write(struct.pack(f"<{len(order)}I", *order))
+
+
+class MappedCatalog:
+    """Каталог, отображённый в память; книги создаются при обращении к записи"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self._count, self._string_count, self._string_offsets_pos,
+         self._string_data_pos, self._isbn_index_pos) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Файл '{path}' не является каталогом книг версии {VERSION}")
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _string(self, string_id):
+        """Строка из таблицы строк по её номеру"""
+        position = self._string_offsets_pos + string_id * _OFFSET.size
+        start, end = struct.unpack_from("<QQ", self._mm, position)
+        return self._mm[self._string_data_pos + start:self._string_data_pos + end].decode("utf-8")
+
+    def _string_id(self, value):
+        """Номер строки в отсортированной таблице или None, если её нет"""
+        low, high = 0, self._string_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(middle) < value:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._string_count and self._string(low) == value:
+            return low
+        return None
+
+    def _decode(self, position):
+        """Собрать книгу из записи с номером position"""
+        (code, flags, year, title, author, genre, isbn,
+         number, extra) = RECORD.unpack_from(self._mm, HEADER.size + position * RECORD.size)
+        cls = _CODE_TYPES[code]
+        args = [self._string(title), self._string(author), year, self._string(genre), self._string(isbn)]
+        if cls is Book:
+            return Book(*args)
+        if flags & FLAG_INT_NUMBER:
+            number = int(number)
+        extra = self._string(extra)
+        if cls is PrintedBook:
+            return PrintedBook(*args, number, extra)
+        if cls is EBook:
+            return EBook(*args, extra, number)
+        return AudioBook(*args, number, extra)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Индекс записи вне каталога")
+        return self._decode(index)
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self._decode(position)
+
+    def _isbn_position(self, rank):
+        """Номер записи, стоящей на месте rank в индексе ISBN"""
+        return struct.unpack_from("<I", self._mm, self._isbn_index_pos + rank * 4)[0]
+
+    def find_by_isbn(self, isbn):
+        """Книга с заданным ISBN (двоичный поиск по индексу) или None"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            position = self._isbn_position(middle)
+            isbn_id = RECORD.unpack_from(self._mm, HEADER.size + position * RECORD.size)[6]
+            if self._string(isbn_id) < isbn:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count:
+            return None
+        book = self._decode(self._isbn_position(low))
+        return book if book.isbn == isbn else None
+
+    def _column(self, fmt, item, step):
+        """Одно поле всех записей списком чисел, без сборки книг"""
+        with memoryview(self._mm) as view:
+            values = view[HEADER.size:HEADER.size + self._count * RECORD.size].cast(fmt)[item::step].tolist()
+        if sys.byteorder == "big":
+            # В файле little-endian, а cast читает числа в порядке байт платформы
+            swapped = array(fmt, values)
+            swapped.byteswap()
+            values = swapped.tolist()
+        return values
+
+    def _positions_with(self, word, value_id):
+        """Номера записей, у которых 32-битное слово word равно value_id"""
+        column = self._column("I", word, _RECORD_WORDS)
+        positions = []
+        start = 0
+        while True:
+            try:
+                start = column.index(value_id, start)
+            except ValueError:
+                return positions
+            positions.append(start)
+            start += 1
+
+    def find_by_field(self, field, value):
+        """Книги с заданным автором, жанром или годом (просмотр одного поля записей)"""
+        if field == "year":
+            column = self._column("H", 1, RECORD.size // 2)
+            return [self._decode(i) for i, year in enumerate(column) if year == value]
+        value_id = self._string_id(value)
+        if value_id is None:
+            return []
+        word = {"author": 2, "genre": 3}[field]
+        return [self._decode(i) for i in self._positions_with(word, value_id)]
+
+
+class MappedLibrary:
+    """Библиотека только для чтения поверх двоичного каталога
+
+    Повторяет методы поиска Library; find_by_author/year/genre просматривают
+    одно поле всех записей и собирают книги только для найденных записей.
+    """
+
+    def __init__(self, path):
+        self.books = MappedCatalog(path)
+
+    def close(self):
+        self.books.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def find_by_isbn(self, isbn):
+        """Поиск по ISBN"""
+        return self.books.find_by_isbn(isbn)
+
+    def find_by_author(self, author):
+        """Поиск по автору"""
+        result = self.books.find_by_field("author", author)
+        if not result:
+            raise KeyError(f"Автор '{author}' не найден")
+        return result
+
+    def find_by_year(self, year):
+        """Поиск по году"""
+        result = self.books.find_by_field("year", year)
+        if not result:
+            raise KeyError(f"Книги {year} года не найдены")
+        return result
+
+    def find_by_genre(self, genre):
+        """Поиск по жанру"""
+        result = self.books.find_by_field("genre", genre)
+        if not result:
+            raise KeyError(f"Жанр '{genre}' не найден")
+        return result
+
+    def __len__(self):
+        return len(self.books)
+
+    def __contains__(self, isbn):
+        return self.books.find_by_isbn(isbn) is not None
@@ -0,0 +1,137 @@
+"""Асинхронный клиент сервера библиотеки (src.server)
+
+Запросы отправляются сразу, без ожидания предыдущих ответов, а ответы
+сопоставляются с запросами по id, поэтому один клиент можно использовать
+из многих корутин одновременно:
+
+    async with await LibraryClient.connect() as client:
+        books = await asyncio.gather(*(client.find_by_author(a) for a in authors))
+"""
+import asyncio
+import itertools
+import json
+from src.serialization import book_to_record, book_from_record
+from src.server import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE
+
+
+class ServerError(Exception):
+    """Ошибка, которую вернул сервер; kind - имя исключения на сервере"""
+
+    def __init__(self, kind, message):
+        self.kind = kind
+        self.message = message
+        super().__init__(f"{kind}: {message}")
+
+
+class LibraryClient:
+    """Соединение с сервером библиотеки"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending = {}  # id запроса -> Future ответа
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        """Раздавать ответы ожидающим запросам"""
+        error = ConnectionError("Соединение с сервером закрыто")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                request_id = response.get("id")
+                if request_id is None and self._pending:
+                    # Сервер не смог прочитать id (неверный JSON, слишком длинная строка), а отвечает
+                    # он по порядку - значит, это ответ на самый старый из ожидающих запросов
+                    request_id = next(iter(self._pending))
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError) as exc:
+            error = exc
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def request(self, op, **arguments):
+        """Отправить запрос и дождаться результата; ошибка сервера даёт ServerError
+
+        Запрос длиннее MAX_LINE байт сервер не примет, поэтому он не отправляется (ValueError).
+        """
+        if self._receiver.done():
+            raise ConnectionError("Соединение с сервером закрыто")
+        request_id = next(self._ids)
+        message = {"id": request_id, "op": op, **arguments}
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        if len(data) > MAX_LINE:
+            raise ValueError(f"Запрос длиннее {MAX_LINE} байт")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(data + b"\n")
+        await self._writer.drain()
+        response = await future
+        if not response["ok"]:
+            raise ServerError(response["error"], response["message"])
+        return response["result"]
+
+    async def add_book(self, book):
+        """Добавить книгу"""
+        await self.request("add", book=book_to_record(book))
+
+    async def remove_book(self, isbn):
+        """Удалить книгу по ISBN"""
+        await self.request("remove", isbn=isbn)
+
+    async def find_by_isbn(self, isbn):
+        """Книга по ISBN или None"""
+        record = await self.request("find_by_isbn", isbn=isbn)
+        return None if record is None else book_from_record(record)
+
+    async def find_by_author(self, author):
+        """Поиск по автору"""
+        return [book_from_record(record) for record in await self.request("find_by_author", author=author)]
+
+    async def find_by_genre(self, genre):
+        """Поиск по жанру"""
+        return [book_from_record(record) for record in await self.request("find_by_genre", genre=genre)]
+
+    async def find_by_year(self, year):
+        """Поиск по году"""
+        return [book_from_record(record) for record in await self.request("find_by_year", year=year)]
+
+    async def find_by_year_range(self, min_year=None, max_year=None):
+        """Поиск по диапазону лет"""
+        records = await self.request("find_by_year_range", min_year=min_year, max_year=max_year)
+        return [book_from_record(record) for record in records]
+
+    async def search_title(self, query):
+        """Полнотекстовый поиск по названию"""
+        return [book_from_record(record) for record in await self.request("search_title", query=query)]
+
+    async def count(self):
+        """Число книг в библиотеке"""
+        return await self.request("count")
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,143 @@
+"""Потокобезопасная библиотека
+
+RWLock пускает сколько угодно читателей одновременно, а писателя - только одного
+и только когда читателей нет. Ожидающий писатель не пропускает новых читателей,
+поэтому поток добавлений не голодает при постоянном чтении.
+"""
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from src.library import Library
+
+
+class RWLock:
+    """Блокировка «много читателей или один писатель»
+
+    Повторный захват тем же потоком разрешён: чтение внутри чтения или записи
+    и запись внутри записи. Захват записи при удерживаемом чтении даёт RuntimeError.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # Поток, который держит запись
+        self._writers_waiting = 0
+        self._local = threading.local()  # Глубина захватов текущего потока
+
+    def _depth(self, kind):
+        return getattr(self._local, kind, 0)
+
+    def acquire_read(self):
+        if self._depth("reads") or self._writer is threading.current_thread():
+            self._local.reads = self._depth("reads") + 1
+            return
+        with self._condition:
+            while self._writer is not None or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        self._local.reads = 1
+
+    def release_read(self):
+        self._local.reads -= 1
+        if self._local.reads or self._writer is threading.current_thread():
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        if self._writer is threading.current_thread():
+            self._local.writes += 1
+            return
+        if self._depth("reads"):
+            raise RuntimeError("Нельзя захватить запись, удерживая чтение")
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = threading.current_thread()
+        self._local.writes = 1
+
+    def release_write(self):
+        self._local.writes -= 1
+        if self._local.writes:
+            return
+        with self._condition:
+            self._writer = None
+            self._condition.notify_all()
+
+    @contextmanager
+    def reading(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def _reading(method):
+    """Выполнять метод под блокировкой чтения"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _writing(method):
+    """Выполнять метод под блокировкой записи"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.writing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ThreadSafeLibrary(Library):
+    """Library, которой можно пользоваться из нескольких потоков
+
+    Поиски выполняются параллельно под блокировкой чтения, изменения - по одному
+    под блокировкой записи, поэтому список книг и индексы всегда согласованы.
+    Для нескольких операций подряд без вмешательства других потоков служит
+    lock.reading() / lock.writing().
+    """
+
+    def __init__(self):
+        self.lock = RWLock()
+        super().__init__()
+
+    add_book = _writing(Library.add_book)
+    add_books = _writing(Library.add_books)
+    remove_book = _writing(Library.remove_book)
+    _apply_batch = _writing(Library._apply_batch)
+
+    find_by_isbn = _reading(Library.find_by_isbn)
+    find_by_author = _reading(Library.find_by_author)
+    find_by_year = _reading(Library.find_by_year)
+    find_by_year_range = _reading(Library.find_by_year_range)
+    count_by_year_range = _reading(Library.count_by_year_range)
+    min_year = _reading(Library.min_year)
+    max_year = _reading(Library.max_year)
+    find_by_genre = _reading(Library.find_by_genre)
+    search_title = _reading(Library.search_title)
+    autocomplete = _reading(Library.autocomplete)
+    suggest = _reading(Library.suggest)
+    query = _reading(Library.query)
+    explain = _reading(Library.explain)
+    page = _reading(Library.page)
+    facets = _reading(Library.facets)
+    type_totals = _reading(Library.type_totals)
+    stats = _reading(Library.stats)
+    snapshot = _reading(Library.snapshot)
+    __len__ = _reading(Library.__len__)
+    __contains__ = _reading(Library.__contains__)
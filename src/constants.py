@@ -45,3 +45,10 @@ NARRATORS = [
 FILE_FORMATS = ["PDF", "EPUB", "FB2", "MOBI"]
 
 COVER_TYPES = ["мягкая", "твёрдая"]
+
+# Папка, где CLI хранит снимок и журнал операций библиотеки
+DATA_DIR = "library_data"
+
+
+# Сколько книг CLI выводит на одной странице
+PAGE_SIZE = 10
@@ -0,0 +1,13 @@
+"""Общие экземпляры повторяющихся полей книг (автор, жанр, диктор)
+
+Каждое значение хранится в одном экземпляре: книги из CSV, JSON или сети
+получают не свою копию строки, а общий объект. Экземпляры берутся из таблицы
+sys.intern: она не держит строки сама, поэтому значение освобождается, когда
+не остаётся книг с ним, и таблица не растёт с каждой когда-либо виденной строкой.
+"""
+import sys
+
+
+def intern_value(value):
+    """Общий экземпляр строки value; прочие значения (в том числе подклассы str) возвращаются как есть"""
+    return sys.intern(value) if type(value) is str else value
@@ -1,6 +1,18 @@
+def _rebuild_error(cls, args, state):
+    """Восстановить исключение после pickle, не вызывая __init__ подкласса"""
+    error = cls.__new__(cls, *args)
+    error.args = args
+    error.__dict__.update(state)
+    return error
+
+
 class ValidationError(Exception):
     """Базовый класс для всех ошибок валидации"""
-    pass
+
+    def __reduce__(self):
+        # Конструкторы подклассов принимают разные аргументы, поэтому восстанавливаем атрибуты напрямую
+        # (нужно, чтобы ошибки можно было передать между процессами)
+        return _rebuild_error, (type(self), self.args, self.__dict__)
 
 
 class NegativeNumberError(ValidationError):
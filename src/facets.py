@@ -0,0 +1,58 @@
+"""Счётчики книг по типам и суммарные характеристики каталога
+
+Обновляются при каждом добавлении и удалении книги, поэтому сводка
+строится за время, пропорциональное числу типов, а не числу книг.
+"""
+from src.serialization import book_type_name
+
+
+# Числовое поле, которое суммируется для каждого типа книги, и его единица
+TYPE_TOTALS = {
+    "printed": ("pages", "страниц"),
+    "ebook": ("file_size_mb", "МБ"),
+    "audio": ("duration_minutes", "минут"),
+}
+
+
+class TypeFacets:
+    """Число книг каждого типа и сумма страниц, мегабайт и минут по типам"""
+
+    def __init__(self):
+        self._counts = {}  # Тип -> число книг
+        self._totals = {}  # Тип -> сумма числового поля
+
+    def add(self, book):
+        self._add(book, book_type_name(book))
+
+    def add_many(self, books):
+        """Учесть книги пакета; тип неизвестной книги обнаруживается до изменения счётчиков"""
+        names = [book_type_name(book) for book in books]
+        for book, name in zip(books, names):
+            self._add(book, name)
+
+    def _add(self, book, name):
+        self._counts[name] = self._counts.get(name, 0) + 1
+        total = TYPE_TOTALS.get(name)
+        if total is not None:
+            self._totals[name] = self._totals.get(name, 0) + getattr(book, total[0])
+
+    def remove(self, book):
+        name = book_type_name(book)
+        count = self._counts[name] - 1
+        total = TYPE_TOTALS.get(name)
+        if count:
+            self._counts[name] = count
+            if total is not None:
+                self._totals[name] -= getattr(book, total[0])
+        else:
+            # Последняя книга типа: обнуляем сумму точно, без накопленной погрешности float
+            del self._counts[name]
+            self._totals.pop(name, None)
+
+    def counts(self):
+        """Тип -> число книг"""
+        return dict(self._counts)
+
+    def totals(self):
+        """Тип -> сумма страниц (printed), мегабайт (ebook) или минут (audio)"""
+        return {name: round(total, 6) for name, total in self._totals.items()}
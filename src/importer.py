@@ -0,0 +1,179 @@
+"""Потоковый импорт книг из CSV и JSON Lines
+
+Файл читается построчно цепочкой генераторов, книги добавляются в библиотеку
+пакетами через Library.add_books, поэтому память не зависит от размера файла.
+Строки с ошибками не прерывают импорт, а записываются в файл отказов (JSON Lines).
+
+Запуск:
+    python -m src.importer books.csv [--rejects rejects.jsonl] [--data-dir library_data]
+"""
+import argparse
+import csv
+import json
+import time
+from src.constants import DATA_DIR
+from src.errors import ValidationError
+from src.serialization import book_from_record
+
+
+# Ошибки строки, которые попадают в файл отказов, а не прерывают импорт
+ROW_ERRORS = (ValidationError, ValueError, KeyError, TypeError)
+
+
+def _number(text):
+    """Число из CSV: int, если в нём нет дробной части, иначе float"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+# Преобразование числовых колонок CSV (в CSV все значения - строки); дробные поля
+# читаются как в JSON: "5" -> 5, "2.5" -> 2.5, чтобы оба формата давали одинаковые книги
+CSV_NUMBERS = {
+    "year": int,
+    "pages": int,
+    "file_size_mb": _number,
+    "duration_minutes": _number,
+}
+
+
+def read_csv(path):
+    """Строки CSV: тройки (номер строки, запись, ошибка разбора или None)"""
+    with open(path, encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        for record in reader:
+            try:
+                for field, convert in CSV_NUMBERS.items():
+                    if record.get(field):
+                        record[field] = convert(record[field])
+            except ValueError as error:
+                yield reader.line_num, record, error
+                continue
+            yield reader.line_num, record, None
+
+
+def read_jsonl(path):
+    """Строки JSON Lines: тройки (номер строки, запись, ошибка разбора или None)"""
+    with open(path, encoding="utf-8") as file:
+        for line_num, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield line_num, line.rstrip("\n"), error
+                continue
+            if not isinstance(record, dict):
+                # Корректный JSON, но не объект: [1, 2], "строка", число
+                yield line_num, record, ValueError(f"Строка должна быть объектом JSON, а не {type(record).__name__}")
+                continue
+            yield line_num, record, None
+
+
+def read_records(path, file_format=None):
+    """Выбрать читателя по формату или по расширению файла"""
+    if file_format is None:
+        file_format = "csv" if str(path).lower().endswith(".csv") else "jsonl"
+    if file_format == "csv":
+        return read_csv(path)
+    if file_format == "jsonl":
+        return read_jsonl(path)
+    raise ValueError(f"Неизвестный формат файла: '{file_format}'")
+
+
+def build_books(rows):
+    """Собрать книги из строк; тройки (номер строки, запись, книга или исключение)"""
+    for line_num, record, error in rows:
+        if error is None:
+            try:
+                yield line_num, record, book_from_record(record)
+                continue
+            except ROW_ERRORS as row_error:
+                error = row_error
+        yield line_num, record, error
+
+
+def batches(items, size):
+    """Разбить поток на списки длины size (последний может быть короче)"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ImportReport:
+    """Итог импорта"""
+
+    def __init__(self):
+        self.rows = 0
+        self.added = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"Строк: {self.rows}, добавлено: {self.added}, отклонено: {self.rejected}, "
+                f"{self.seconds:.2f} с ({self.rows_per_second:,.0f} строк/с)")
+
+
+def _reject_line(line_num, record, error):
+    """Строка файла отказов"""
+    return json.dumps({
+        "line": line_num,
+        "error": type(error).__name__,
+        "message": str(error),
+        "record": record,
+    }, ensure_ascii=False) + "\n"
+
+
+def import_books(library, path, reject_path=None, file_format=None, batch_size=1000):
+    """Импортировать книги из файла в библиотеку и вернуть ImportReport"""
+    report = ImportReport()
+    start = time.perf_counter()
+    rejects = open(reject_path, "w", encoding="utf-8") if reject_path is not None else None
+    try:
+        for batch in batches(build_books(read_records(path, file_format)), batch_size):
+            report.rows += len(batch)
+            valid = []
+            for line_num, record, book in batch:
+                if isinstance(book, Exception):
+                    report.rejected += 1
+                    if rejects is not None:
+                        rejects.write(_reject_line(line_num, record, book))
+                else:
+                    valid.append((line_num, record))
+            # Результаты add_books идут в том же порядке, что и книги пакета
+            result = library.add_books(book for _, _, book in batch if not isinstance(book, Exception))
+            for (line_num, record), (_, error) in zip(valid, result):
+                if error is None:
+                    report.added += 1
+                else:
+                    report.rejected += 1
+                    if rejects is not None:
+                        rejects.write(_reject_line(line_num, record, error))
+    finally:
+        if rejects is not None:
+            rejects.close()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+if __name__ == "__main__":
+    from src.storage import PersistentLibrary
+
+    parser = argparse.ArgumentParser(description="Импорт книг из CSV или JSON Lines")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--rejects", default=None, help="файл для строк с ошибками")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+    with PersistentLibrary(args.data_dir) as target:
+        print(import_books(target, args.path, args.rejects, args.format))
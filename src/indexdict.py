@@ -1,9 +1,30 @@
+import heapq
+from collections import Counter
+from bisect import bisect_left, bisect_right, insort
+from src.facets import TypeFacets
+from src.pagination import SeqOrder
+from src.textindex import TitleIndex
+from src.trie import PrefixTrie
+
+
 class IndexDict:
     def __init__(self):
+        # Вторичные индексы хранят словари ISBN -> книга: удаление из них стоит O(1)
         self._by_isbn = {}
         self._by_author = {}
         self._by_year = {}
         self._by_genre = {}
+        self._years = []  # Отсортированный список лет, для которых есть книги
+        self._by_title = TitleIndex()  # Полнотекстовый индекс по словам названий
+        # Префиксные деревья для автодополнения
+        self._names = {"author": PrefixTrie(), "genre": PrefixTrie(), "narrator": PrefixTrie()}
+        # Порядковые номера книг для постраничной выдачи: номер растёт с каждым добавлением
+        self._seqs = {}  # ISBN -> номер
+        self._next_seq = 1
+        self._order = SeqOrder()  # Все книги по возрастанию номера
+        # Книги каждого автора, года и жанра по возрастанию номера: страница ищется двоичным поиском
+        self._key_orders = {"author": {}, "year": {}, "genre": {}}
+        self._types = TypeFacets()  # Число книг и суммы по типам
 
     def __getitem__(self, key):
         # Доступ по ключу (ISBN)
@@ -18,48 +39,289 @@ class IndexDict:
     def __contains__(self, key):
         return key in self._by_isbn
 
+    @staticmethod
+    def _add_to(index, key, book):
+        """Добавить книгу в словарь книг по ключу key"""
+        posting = index.get(key)
+        if posting is None:
+            index[key] = {book.isbn: book}
+        else:
+            posting[book.isbn] = book
+
+    @staticmethod
+    def _remove_from(index, key, isbn):
+        """Убрать книгу из словаря по ключу key; пустые ключи удаляются"""
+        posting = index[key]
+        del posting[isbn]
+        if not posting:
+            del index[key]
+
+    def _add_names(self, book):
+        """Учесть автора, жанр и диктора книги в деревьях автодополнения"""
+        self._names["author"].add(book.author)
+        self._names["genre"].add(book.genre)
+        narrator = getattr(book, "narrator", None)
+        if narrator is not None:
+            self._names["narrator"].add(narrator)
+
+    def _remove_names(self, book):
+        """Убрать автора, жанр и диктора книги из деревьев автодополнения"""
+        self._names["author"].remove(book.author)
+        self._names["genre"].remove(book.genre)
+        narrator = getattr(book, "narrator", None)
+        if narrator is not None:
+            self._names["narrator"].remove(narrator)
+
+    @staticmethod
+    def _count_names(books):
+        """Сколько раз встречается каждый автор, жанр и диктор среди books"""
+        counts = {"author": Counter(), "genre": Counter(), "narrator": Counter()}
+        for book in books:
+            counts["author"][book.author] += 1
+            counts["genre"][book.genre] += 1
+            narrator = getattr(book, "narrator", None)
+            if narrator is not None:
+                counts["narrator"][narrator] += 1
+        return counts
+
+    def _assign_seq(self, book):
+        """Выдать книге следующий порядковый номер и поставить её в конец порядков по ключам"""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs[book.isbn] = seq
+        self._order.append(seq, book)
+        orders = self._key_orders
+        for field_orders, key in ((orders["author"], book.author), (orders["year"], book.year),
+                                  (orders["genre"], book.genre)):
+            order = field_orders.get(key)
+            if order is None:
+                order = field_orders[key] = SeqOrder()
+            order.append(seq, book)
+
+    def _release_seq(self, book):
+        """Забрать номер у удаляемой книги и убрать её из порядков"""
+        seq = self._seqs.pop(book.isbn)
+        self._order.remove(seq)
+        orders = self._key_orders
+        for field_orders, key in ((orders["author"], book.author), (orders["year"], book.year),
+                                  (orders["genre"], book.genre)):
+            order = field_orders[key]
+            order.remove(seq)
+            if not len(order):
+                del field_orders[key]
+
     def add_book(self, book):
         """Добавить книгу в индексы"""
+        # Тип книги проверяется первым, пока индексы ещё не изменены
+        self._types.add(book)
         self._by_isbn[book.isbn] = book
+        self._assign_seq(book)
+        if book.year not in self._by_year:
+            insort(self._years, book.year)
+        self._add_to(self._by_author, book.author, book)
+        self._add_to(self._by_year, book.year, book)
+        self._add_to(self._by_genre, book.genre, book)
+        self._by_title.add(book)
+        self._add_names(book)
 
-        # По автору (список книг)
-        if book.author not in self._by_author:
-            self._by_author[book.author] = []
-        self._by_author[book.author].append(book)
+    def add_books(self, books):
+        """Добавить в индексы сразу несколько книг (ISBN должны быть новыми)"""
+        books = list(books)  # Книги обходятся дважды, а передать могут и генератор
+        self._types.add_many(books)
+        by_author = {}
+        by_year = {}
+        by_genre = {}
+        # Один проход: раскладываем книги по группам, затем дополняем каждый индекс одним update
+        for book in books:
+            isbn = book.isbn
+            self._by_isbn[isbn] = book
+            self._assign_seq(book)
+            by_author.setdefault(book.author, {})[isbn] = book
+            by_year.setdefault(book.year, {})[isbn] = book
+            by_genre.setdefault(book.genre, {})[isbn] = book
+            self._by_title.add(book)
 
-        # По году (список книг)
-        if book.year not in self._by_year:
-            self._by_year[book.year] = []
-        self._by_year[book.year].append(book)
+        # Деревья автодополнения обходим один раз на значение, а не на книгу
+        for field, counts in self._count_names(books).items():
+            for value, count in counts.items():
+                self._names[field].add(value, count)
 
-        # По жанру (список книг)
-        if book.genre not in self._by_genre:
-            self._by_genre[book.genre] = []
-        self._by_genre[book.genre].append(book)
+        for year in by_year:
+            if year not in self._by_year:
+                insort(self._years, year)
+
+        for index, groups in ((self._by_author, by_author), (self._by_year, by_year), (self._by_genre, by_genre)):
+            for key, group in groups.items():
+                if key in index:
+                    index[key].update(group)
+                else:
+                    index[key] = group
 
     def remove_book(self, book):
-        """Удалить книгу из индексов"""
+        """Удалить книгу из индексов за O(1)"""
         if book.isbn not in self._by_isbn:
             raise KeyError(f"Книга с ISBN '{book.isbn}' не найдена")
-        del self._by_isbn[book.isbn]
-        self._by_author[book.author].remove(book)
-        self._by_year[book.year].remove(book)
-        self._by_genre[book.genre].remove(book)
+        # Ключи берём у сохранённой книги: переданная может совпадать с ней только по ISBN
+        stored = self._by_isbn.pop(book.isbn)
+        self._release_seq(stored)
+        self._remove_from(self._by_author, stored.author, stored.isbn)
+        self._remove_from(self._by_year, stored.year, stored.isbn)
+        self._remove_from(self._by_genre, stored.genre, stored.isbn)
+        self._by_title.remove(stored)
+        self._remove_names(stored)
+        self._types.remove(stored)
+        if stored.year not in self._by_year:
+            del self._years[bisect_left(self._years, stored.year)]
+
+    def remove_books(self, books):
+        """Удалить из индексов сразу несколько книг (все должны быть в индексе)
+
+        Список лет и деревья автодополнения обновляются один раз после всего пакета.
+        """
+        emptied = False
+        removed = []
+        for book in books:
+            stored = self._by_isbn.pop(book.isbn)
+            removed.append(stored)
+            self._release_seq(stored)
+            self._remove_from(self._by_author, stored.author, stored.isbn)
+            self._remove_from(self._by_year, stored.year, stored.isbn)
+            self._remove_from(self._by_genre, stored.genre, stored.isbn)
+            self._by_title.remove(stored)
+            self._types.remove(stored)
+            emptied = emptied or stored.year not in self._by_year
+        for field, counts in self._count_names(removed).items():
+            for value, count in counts.items():
+                self._names[field].remove(value, count)
+        if emptied:
+            self._years = [year for year in self._years if year in self._by_year]
+
+    def count_by(self, field, key):
+        """Количество книг с заданным значением поля author, year или genre (O(1))"""
+        index = {"author": self._by_author, "year": self._by_year, "genre": self._by_genre}[field]
+        posting = index.get(key)
+        return 0 if posting is None else len(posting)
+
+    def facet_counts(self, field):
+        """Число книг для каждого значения поля author, year, genre или type
+
+        Берутся размеры уже имеющихся индексов, книги не перебираются. Годы идут по возрастанию.
+        """
+        if field == "type":
+            return self._types.counts()
+        if field == "year":
+            return {year: len(self._by_year[year]) for year in self._years}
+        index = {"author": self._by_author, "genre": self._by_genre}[field]
+        return {key: len(posting) for key, posting in index.items()}
+
+    def type_totals(self):
+        """Сумма страниц, мегабайт и минут по типам книг"""
+        return self._types.totals()
 
     def get_by_author(self, author):
         """Получить книги по автору"""
         if author not in self._by_author:
             raise KeyError(f"Автор '{author}' не найден")
-        return self._by_author[author]
+        return list(self._by_author[author].values())
 
     def get_by_year(self, year):
         """Получить книги по году"""
         if year not in self._by_year:
             raise KeyError(f"Книги {year} года не найдены")
-        return self._by_year[year]
+        return list(self._by_year[year].values())
 
     def get_by_genre(self, genre):
         """Получить книги по жанру"""
         if genre not in self._by_genre:
             raise KeyError(f"Жанр '{genre}' не найден")
-        return self._by_genre[genre]
+        return list(self._by_genre[genre].values())
+
+    def search_title(self, query):
+        """Книги, в названии которых есть все слова запроса (слово* - поиск по префиксу)"""
+        return self._by_title.search(query)
+
+    def complete(self, field, prefix="", limit=None):
+        """Значения поля author, genre или narrator, начинающиеся с prefix"""
+        return self._names[field].complete(prefix, limit)
+
+    def suggest(self, field, value, limit=5, with_distance=False):
+        """Похожие значения поля для подсказки «Возможно, вы имели в виду»"""
+        return self._names[field].suggest(value, limit=limit, with_distance=with_distance)
+
+    def _year_slice(self, min_year, max_year):
+        """Границы отрезка self._years для лет из [min_year, max_year] (None - без границы)"""
+        start = 0 if min_year is None else bisect_left(self._years, min_year)
+        stop = len(self._years) if max_year is None else bisect_right(self._years, max_year)
+        return start, stop
+
+    def get_by_year_range(self, min_year=None, max_year=None):
+        """Получить книги с годом в диапазоне [min_year, max_year], по возрастанию года"""
+        start, stop = self._year_slice(min_year, max_year)
+        result = []
+        for year in self._years[start:stop]:
+            result.extend(self._by_year[year].values())
+        return result
+
+    def count_by_year_range(self, min_year=None, max_year=None):
+        """Количество книг с годом в диапазоне [min_year, max_year]"""
+        start, stop = self._year_slice(min_year, max_year)
+        return sum(len(self._by_year[year]) for year in self._years[start:stop])
+
+    def min_year(self):
+        """Самый ранний год среди книг"""
+        if not self._years:
+            raise KeyError("Индекс пуст")
+        return self._years[0]
+
+    def max_year(self):
+        """Самый поздний год среди книг"""
+        if not self._years:
+            raise KeyError("Индекс пуст")
+        return self._years[-1]
+
+    def seq_of(self, isbn):
+        """Порядковый номер книги или None, если книги нет"""
+        return self._seqs.get(isbn)
+
+    def last_seq(self):
+        """Номер последней добавленной книги (0, если книг ещё не было)"""
+        return self._next_seq - 1
+
+    def page_all(self, after_seq, limit):
+        """До limit пар (номер, книга) среди всех книг с номером больше after_seq"""
+        return self._order.after(after_seq, limit)
+
+    def page_by(self, field, key, after_seq, limit):
+        """До limit пар (номер, книга) с полем author, year или genre, равным key
+
+        Место после after_seq находится двоичным поиском в порядке книг этого ключа,
+        поэтому страница стоит O(log n + limit), а не O(размер списка книг ключа).
+        """
+        order = self._key_orders[field].get(key)
+        return [] if order is None else order.after(after_seq, limit)
+
+    def page_year_range(self, min_year, max_year, after_year, after_seq, limit):
+        """До limit троек (год, номер, книга) из диапазона лет после позиции (after_year, after_seq)
+
+        Порядок - по возрастанию года, внутри года - по номеру.
+        """
+        if after_year is not None and (min_year is None or after_year > min_year):
+            min_year = after_year
+        start, stop = self._year_slice(min_year, max_year)
+        result = []
+        for year in self._years[start:stop]:
+            after = after_seq if year == after_year else 0
+            for seq, book in self.page_by("year", year, after, limit - len(result)):
+                result.append((year, seq, book))
+            if len(result) >= limit:
+                break
+        return result
+
+    def stats(self, top=5):
+        """Число ключей в индексах по автору, году и жанру и top самых длинных списков книг"""
+        result = {}
+        for field, index in (("author", self._by_author), ("year", self._by_year), ("genre", self._by_genre)):
+            postings = list(index.items())  # Копия: статистику может читать другой поток
+            largest = heapq.nlargest(top, postings, key=lambda item: len(item[1]))
+            result[field] = {"keys": len(postings), "largest": [(key, len(posting)) for key, posting in largest]}
+        return result
@@ -1,28 +1,167 @@
+import threading
+import time
+import weakref
 from src.indexdict import IndexDict
 from src.bookcollection import BookCollection
+from src.cache import QueryCache, make_key
 from src.errors import DuplicateBookError, EmptyLibraryError
+from src.metrics import MetricsDumper, OperationStats
+from src.pagination import decode_cursor, make_page
+from src.query import build_plan, execute_plan
+from src.snapshot import LibrarySnapshot
+from src.transaction import Transaction
+
+
+# Операции, которые учитывает enable_metrics; для поисков считаются найдено/не найдено
+METERED_OPERATIONS = ("add_book", "add_books", "remove_book", "find_by_isbn", "find_by_author", "find_by_year",
+                      "find_by_year_range", "find_by_genre", "search_title", "autocomplete", "suggest",
+                      "query", "page")
+_MUTATIONS = {"add_book", "add_books", "remove_book"}
+
+
+class BulkAddResult:
+    """Итог пакетного добавления: по одной записи на каждую входную книгу"""
+
+    def __init__(self):
+        self.results = []  # Пары (книга, None) или (книга, DuplicateBookError)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+    @property
+    def added(self):
+        """Книги, которые попали в библиотеку"""
+        return [book for book, error in self.results if error is None]
+
+    @property
+    def rejected(self):
+        """Отклонённые книги вместе с ошибками"""
+        return [(book, error) for book, error in self.results if error is not None]
 
 
 class Library:
     def __init__(self):
         self.books = BookCollection()  # Списковая коллекция
         self.index = IndexDict()  # Словарная коллекция
+        self._metrics = None  # Операция -> OperationStats, если статистика включена
+        self._cache = None  # QueryCache, если кэш включён
+        self._snapshots = weakref.WeakSet()  # Живые снимки, которым нужны удалённые книги
+        self._snapshots_lock = threading.Lock()  # Снимки создают и освобождают читатели из других потоков
 
     def add_book(self, book):
         """Добавить книгу в библиотеку"""
         # Проверка на дубликат
         if book.isbn in self.index:
             raise DuplicateBookError(book.isbn)
-        self.books.add(book)
+        # Индекс первым проверяет тип книги, поэтому при ошибке список книг не меняется
         self.index.add_book(book)
+        self.books.add(book)
+        if self._cache is not None:
+            self._cache.invalidate(book)
+
+    def add_books(self, books):
+        """Добавить много книг за один проход
+
+        Дубликаты (внутри пакета и с уже имеющимися книгами) не прерывают
+        загрузку, а попадают в итог с ошибкой DuplicateBookError.
+        """
+        result = BulkAddResult()
+        accepted = []
+        seen = set()
+        for book in books:
+            isbn = book.isbn
+            if isbn in seen or isbn in self.index:
+                result.results.append((book, DuplicateBookError(isbn)))
+                continue
+            seen.add(isbn)
+            accepted.append(book)
+            result.results.append((book, None))
+
+        self.index.add_books(accepted)
+        self.books.extend(accepted)
+        if self._cache is not None:
+            self._cache.invalidate_many(accepted)
+        return result
 
     def remove_book(self, book):
         """Удалить книгу из библиотеки"""
         # Проверка на пустую библиотеку
         if len(self.books) == 0:
             raise EmptyLibraryError()
+        # Поля для сброса кэша берём у сохранённой книги: переданная может совпадать с ней только по ISBN
+        stored = self.index[book.isbn]
+        # Проверяем до изменений, чтобы список книг и индексы не разошлись
+        if stored is None or book not in self.books:
+            raise ValueError(f"Книга с ISBN '{book.isbn}' не найдена в коллекции")
+        self._before_remove([stored])
         self.books.remove(book)
         self.index.remove_book(book)
+        if self._cache is not None:
+            self._cache.invalidate(stored)
+
+    def _before_remove(self, books):
+        """Передать живым снимкам книги, которые сейчас будут удалены"""
+        if not self._snapshots:
+            return
+        with self._snapshots_lock:
+            snapshots = list(self._snapshots)
+        for book in books:
+            seq = self.index.seq_of(book.isbn)
+            for snapshot in snapshots:
+                snapshot._record_removal(seq, book)
+
+    def transaction(self):
+        """Транзакция (Transaction) для блока with: изменения применяются пакетом при выходе
+
+        Внутри блока tx.add(book) и tx.remove(book) проверяются сразу, но библиотека
+        меняется только в конце. Исключение в блоке отменяет все изменения.
+        """
+        return Transaction(self)
+
+    def _apply_batch(self, removed, added):
+        """Применить пакет транзакции: удалить removed и добавить added во все структуры
+
+        Сначала пакет проверяется целиком по текущему состоянию. Если при применении
+        всё же возникла ошибка, удалённые книги возвращаются, а добавленные убираются.
+        """
+        removed_isbns = set()
+        for book in removed:
+            if self.index[book.isbn] is not book:
+                raise ValueError(f"Книга с ISBN '{book.isbn}' не найдена в коллекции")
+            removed_isbns.add(book.isbn)
+        for book in added:
+            if book.isbn in self.index and book.isbn not in removed_isbns:
+                raise DuplicateBookError(book.isbn)
+
+        self._before_remove(removed)
+        try:
+            for book in removed:
+                self.books.remove(book)
+            self.index.remove_books(removed)
+            self.books.extend(added)
+            self.index.add_books(added)
+        except BaseException:
+            self._undo_batch(removed, added)
+            raise
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate_many(removed + added)
+
+    def _undo_batch(self, removed, added):
+        """Вернуть состояние до _apply_batch после ошибки (порядок книг может измениться)"""
+        for book in added:
+            if book in self.books:
+                self.books.remove(book)
+            if self.index[book.isbn] is book:
+                self.index.remove_book(book)
+        for book in removed:
+            if book not in self.books:
+                self.books.add(book)
+            if book.isbn not in self.index:
+                self.index.add_book(book)
 
     def find_by_isbn(self, isbn):
         """Поиск по ISBN"""
@@ -30,16 +169,214 @@ class Library:
 
     def find_by_author(self, author):
         """Поиск по автору"""
+        if self._cache is not None:
+            return self._cache.get(make_key("find", author=author), lambda: self.index.get_by_author(author))
         return self.index.get_by_author(author)
 
     def find_by_year(self, year):
         """Поиск по году"""
+        if self._cache is not None:
+            return self._cache.get(make_key("find", year=year), lambda: self.index.get_by_year(year))
         return self.index.get_by_year(year)
 
+    def find_by_year_range(self, min_year=None, max_year=None):
+        """Поиск по диапазону лет [min_year, max_year] (границу можно не указывать)"""
+        if self._cache is not None:
+            return self._cache.get(make_key("year_range", min_year=min_year, max_year=max_year),
+                                   lambda: self.index.get_by_year_range(min_year, max_year))
+        return self.index.get_by_year_range(min_year, max_year)
+
+    def count_by_year_range(self, min_year=None, max_year=None):
+        """Количество книг в диапазоне лет"""
+        return self.index.count_by_year_range(min_year, max_year)
+
+    def min_year(self):
+        """Самый ранний год издания в библиотеке"""
+        if len(self.books) == 0:
+            raise EmptyLibraryError()
+        return self.index.min_year()
+
+    def max_year(self):
+        """Самый поздний год издания в библиотеке"""
+        if len(self.books) == 0:
+            raise EmptyLibraryError()
+        return self.index.max_year()
+
     def find_by_genre(self, genre):
         """Поиск по жанру"""
+        if self._cache is not None:
+            return self._cache.get(make_key("find", genre=genre), lambda: self.index.get_by_genre(genre))
         return self.index.get_by_genre(genre)
 
+    def facets(self, field=None):
+        """Число книг по значениям поля (author, genre, year или type)
+
+        Без field - сводка по всем полям и суммы по типам книг ("totals").
+        Считается по счётчикам, которые обновляются при изменениях, а не по всем книгам.
+        """
+        if field is not None:
+            return self.index.facet_counts(field)
+        summary = {name: self.index.facet_counts(name) for name in ("author", "genre", "year", "type")}
+        summary["totals"] = self.type_totals()
+        return summary
+
+    def type_totals(self):
+        """Суммы по типам книг: страницы, мегабайты, минуты"""
+        return self.index.type_totals()
+
+    def search_title(self, query):
+        """Полнотекстовый поиск по названию: все слова запроса, слово* - по префиксу"""
+        return self.index.search_title(query)
+
+    def autocomplete(self, field, prefix="", limit=None):
+        """Автодополнение значений поля author, genre или narrator"""
+        return self.index.complete(field, prefix, limit)
+
+    def suggest(self, field, value, limit=5, with_distance=False):
+        """Похожие значения поля, если точного совпадения нет; with_distance - пары (расстояние, значение)"""
+        return self.index.suggest(field, value, limit, with_distance)
+
+    def query(self, author=None, year=None, genre=None, min_year=None, max_year=None):
+        """Поиск по любому сочетанию условий через пересечение индексов
+
+        Без условий возвращает все книги. min_year/max_year задают диапазон лет.
+        """
+        if self._cache is not None:
+            return self._cache.get(make_key("query", author, year, genre, min_year, max_year),
+                                   lambda: self._run_query(author, year, genre, min_year, max_year))
+        return self._run_query(author, year, genre, min_year, max_year)
+
+    def _run_query(self, author, year, genre, min_year, max_year):
+        plan = self.explain(author, year, genre, min_year, max_year)
+        return execute_plan(plan, self.index, self.books, author, year, genre, min_year, max_year)
+
+    def explain(self, author=None, year=None, genre=None, min_year=None, max_year=None):
+        """План, по которому query выполнит запрос с теми же условиями"""
+        return build_plan(self.index, len(self.books), author, year, genre, min_year, max_year)
+
+    def page(self, by=None, value=None, page_size=20, cursor=None):
+        """Одна страница книг (Page) и курсор для следующей
+
+        by=None - все книги; "author", "genre", "year" - книги со значением value;
+        "year_range" - value это пара (min_year, max_year). cursor - next_cursor предыдущей
+        страницы. Книги идут в порядке добавления, поэтому добавления и удаления между
+        страницами не приводят к повторам и пропускам уже имевшихся книг.
+        """
+        if page_size < 1:
+            raise ValueError("Размер страницы должен быть положительным")
+        if by == "year_range":
+            after_year, after_seq = decode_cursor(cursor, 2) if cursor else (None, 0)
+            found = self.index.page_year_range(*value, after_year, after_seq, page_size + 1)
+            return make_page([((year, seq), book) for year, seq, book in found], page_size)
+        after_seq = decode_cursor(cursor, 1)[0] if cursor else 0
+        if by is None:
+            found = self.index.page_all(after_seq, page_size + 1)
+        elif by in ("author", "genre", "year"):
+            found = self.index.page_by(by, value, after_seq, page_size + 1)
+        else:
+            raise ValueError(f"Неизвестный способ выборки: '{by}'")
+        return make_page([((seq,), book) for seq, book in found], page_size)
+
+    def iter_pages(self, by=None, value=None, page_size=20):
+        """Все страницы выборки по очереди (каждая запрашивается только при переходе к ней)"""
+        cursor = None
+        while True:
+            page = self.page(by, value, page_size, cursor)
+            if page.books:
+                yield page
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
+    def snapshot(self):
+        """Неизменяемый вид библиотеки на текущий момент (LibrarySnapshot)
+
+        Создаётся за O(1) и не блокирует изменения: дальнейшие добавления и удаления
+        в снимке не видны. Снимок освобождается сборщиком мусора или release().
+        """
+        snapshot = LibrarySnapshot(self)
+        with self._snapshots_lock:
+            self._snapshots.add(snapshot)
+        return snapshot
+
+    def _forget_snapshot(self, snapshot):
+        """Убрать освобождённый снимок из списка живых"""
+        with self._snapshots_lock:
+            self._snapshots.discard(snapshot)
+
+    def enable_cache(self, max_entries=1024, max_items=100_000):
+        """Кэшировать результаты find_by_author/year/genre/year_range и query
+
+        max_entries - число запомненных запросов, max_items - общее число книг в них.
+        Добавление и удаление книги сбрасывает только запросы, под которые она подходит.
+        """
+        self._cache = QueryCache(max_entries, max_items)
+        return self._cache
+
+    def disable_cache(self):
+        """Выключить кэш результатов"""
+        self._cache = None
+
+    def _metered(self, name, method):
+        """Обёртка метода, которая считает вызовы, промахи, ошибки и время"""
+        stats = self._metrics[name] = OperationStats()
+        lookup = name not in _MUTATIONS
+        clock = time.perf_counter_ns
+
+        def call(*args, **kwargs):
+            began = clock()
+            try:
+                result = method(*args, **kwargs)
+            except KeyError:
+                # find_by_* сообщают об отсутствии ключа через KeyError
+                stats.record(clock() - began, "miss")
+                raise
+            except Exception:
+                stats.record(clock() - began, "error")
+                raise
+            if lookup:
+                stats.record(clock() - began, "hit" if result else "miss")
+            else:
+                stats.record(clock() - began)
+            return result
+        return call
+
+    def enable_metrics(self):
+        """Включить сбор статистики операций
+
+        Методы подменяются обёртками только у этого экземпляра, поэтому
+        без enable_metrics никаких затрат на учёт нет.
+        """
+        if self._metrics is not None:
+            return
+        self._metrics = {}
+        for name in METERED_OPERATIONS:
+            setattr(self, name, self._metered(name, getattr(self, name)))
+
+    def disable_metrics(self):
+        """Выключить сбор статистики и вернуть исходные методы"""
+        if self._metrics is None:
+            return
+        for name in self._metrics:
+            delattr(self, name)
+        self._metrics = None
+
+    def stats(self, top=5):
+        """Снимок статистики: число книг, счётчики операций и самые длинные списки в индексах"""
+        operations = {} if self._metrics is None else \
+            {name: stats.snapshot() for name, stats in self._metrics.items() if stats.calls}
+        stats = {"books": len(self), "operations": operations, "index": self.index.stats(top)}
+        if self._cache is not None:
+            stats["cache"] = self._cache.stats()
+        return stats
+
+    def start_metrics_dump(self, interval, path=None, callback=None):
+        """Сохранять stats() каждые interval секунд в файл (JSON Lines) и/или в callback
+
+        Возвращает MetricsDumper; его stop() останавливает запись.
+        """
+        return MetricsDumper(self, interval, path, callback).start()
+
     def __len__(self):
         return len(self.books)
 
@@ -1,22 +1,12 @@
 import random
 from src.books import PrintedBook, EBook, AudioBook
 from src.library import Library
-from src.constants import TITLES, AUTHORS, GENRES, NARRATORS, FILE_FORMATS, COVER_TYPES
+from src.storage import PersistentLibrary
+from src.constants import TITLES, AUTHORS, GENRES, NARRATORS, FILE_FORMATS, COVER_TYPES, DATA_DIR, PAGE_SIZE
 from src.simulation import run_simulation
-
-
-# Константа с запрещёнными символами (set для быстрой проверки)
-FORBIDDEN_SYMBOLS = set('@#$%^&*=+<>/\\|~`')
-
-
-def has_forbidden(text: str) -> bool:
-    """Проверяет, содержит ли текст запрещённые символы"""
-    return any(char in FORBIDDEN_SYMBOLS for char in text)
-
-
-def has_digits(text: str) -> bool:
-    """Проверяет, содержит ли текст цифры"""
-    return any(char.isdigit() for char in text)
+from src.facets import TYPE_TOTALS
+# Проверки символов общие с моделью книг, чтобы CLI и валидация не расходились
+from src.validators import has_forbidden, has_digits, MIN_YEAR, MAX_YEAR
 
 
 def print_menu():
@@ -31,6 +21,7 @@ def print_menu():
     print("6. Найти книги по году")
     print("7. Показать все книги")
     print("8. Запустить симуляцию")
+    print("9. Статистика")
     print("0. Выход")
 
 
@@ -90,10 +81,10 @@ def input_year() -> int:
             print("Ошибка: введите число")
             continue
         year = int(year_str)
-        if year < 1800:
+        if year < MIN_YEAR:
             print(f"Ошибка: слишком маленький год")
             continue
-        if year > 2026:
+        if year > MAX_YEAR:
             print(f"Ошибка: слишком большой год")
             continue
         return year
@@ -278,19 +269,33 @@ def find_by_isbn(library: Library) -> None:
         print(f"Жанр: {book.genre}")
 
 
+def complete_name(library: Library, field: str, text: str) -> str:
+    """Дополнить введённое начало до значения, если вариант единственный"""
+    matches = library.autocomplete(field, text, limit=2)
+    if len(matches) == 1 and matches[0] != text:
+        print(f"Найдено по началу ввода: {matches[0]}")
+        return matches[0]
+    return text
+
+
+def print_suggestions(library: Library, field: str, text: str) -> None:
+    """Подсказать похожие значения, если поиск ничего не нашёл"""
+    matches = library.autocomplete(field, text, limit=10) or library.suggest(field, text)
+    if matches:
+        print(f"Возможно, вы имели в виду: {', '.join(matches)}")
+
+
 def find_by_author(library: Library) -> None:
     """Поиск книг по автору"""
     # Показываем доступных авторов
-    available_authors = set()
-    for book in library.books:
-        available_authors.add(book.author)
+    available_authors = library.autocomplete("author")
 
     if not available_authors:
         print("Библиотека пуста!")
         return
 
     print(f"\nАвторы в библиотеке: {', '.join(available_authors)}")
-    author = input("Введите имя автора: ").strip()
+    author = complete_name(library, "author", input("Введите имя автора (можно начало): ").strip())
 
     try:
         results = library.find_by_author(author)
@@ -299,21 +304,21 @@ def find_by_author(library: Library) -> None:
             print(f"{book}")
     except KeyError as e:
         print(f"Ошибка: {e}")
+        print_suggestions(library, "author", author)
 
 
 def find_by_genre(library: Library) -> None:
     """Поиск книг по жанру"""
-    # Показываем доступные жанры
-    available_genres = set()
-    for book in library.books:
-        available_genres.add(book.genre)
+    # Показываем доступные жанры с числом книг (по счётчикам, без перебора книг)
+    genre_counts = library.facets("genre")
 
-    if not available_genres:
+    if not genre_counts:
         print("Библиотека пуста!")
         return
 
-    print(f"\nЖанры в библиотеке: {', '.join(available_genres)}")
-    genre = input("Введите жанр: ").strip()
+    genres = sorted(genre_counts.items(), key=lambda item: (-item[1], item[0]))
+    print(f"\nЖанры в библиотеке: {', '.join(f'{genre} ({count})' for genre, count in genres)}")
+    genre = complete_name(library, "genre", input("Введите жанр (можно начало): ").strip())
 
     try:
         results = library.find_by_genre(genre)
@@ -322,16 +327,30 @@ def find_by_genre(library: Library) -> None:
             print(f"{book}")
     except KeyError as e:
         print(f"Ошибка: {e}")
+        print_suggestions(library, "genre", genre)
 
 
 def find_by_year(library: Library) -> None:
-    """Поиск книг по году"""
+    """Поиск книг по году или диапазону лет"""
     while True:
+        text = input("Введите год или диапазон (например, 1900-1950): ").strip()
         try:
-            year = int(input("Введите год: ").strip())
+            if "-" in text[1:]:
+                low, high = text.split("-", 1)
+                year_range = (int(low), int(high))
+            else:
+                year_range = None
+                year = int(text)
             break
         except ValueError:
-            print("Ошибка: введите число!")
+            print("Ошибка: введите число или два числа через дефис!")
+
+    if year_range is not None:
+        results = library.find_by_year_range(*year_range)
+        print(f"Найдено книг: {len(results)}")
+        for book in results:
+            print(f"{book}")
+        return
 
     try:
         results = library.find_by_year(year)
@@ -350,30 +369,72 @@ def show_all_books(library: Library) -> None:
 
     print(f"\nВсего книг в библиотеке: {len(library)}")
 
-    for i, book in enumerate(library.books, 1):
-        print(f"{i}. {book}")
+    # Выводим по странице; курсор не сбивается, даже если библиотеку меняют между страницами
+    number = 0
+    for page in library.iter_pages(page_size=PAGE_SIZE):
+        for book in page:
+            number += 1
+            print(f"{number}. {book}")
+        if page.next_cursor is None:
+            break
+        if input("Enter - следующая страница, q - назад в меню: ").strip().lower() == "q":
+            break
 
-def main() -> None:
+def show_stats(library: Library) -> None:
+    """Показать статистику операций и индексов"""
+    stats = library.stats()
+    print(f"\nКниг в библиотеке: {stats['books']}")
+    if stats["operations"]:
+        print(f"{'Операция':<20}{'вызовов':>9}{'найдено':>9}{'нет':>6}{'ошибок':>8}{'p50 мкс':>10}{'p99 мкс':>10}")
+        for name, operation in stats["operations"].items():
+            latency = operation["latency"]
+            print(f"{name:<20}{operation['calls']:>9}{operation['hits']:>9}{operation['misses']:>6}"
+                  f"{operation['errors']:>8}{latency['p50_us']:>10.1f}{latency['p99_us']:>10.1f}")
+    else:
+        print("Операций пока не было")
+    for field, title in (("author", "Авторы"), ("genre", "Жанры"), ("year", "Годы")):
+        index = stats["index"][field]
+        largest = ", ".join(f"{key} ({size})" for key, size in index["largest"])
+        print(f"{title}: {index['keys']}, больше всего книг: {largest or '-'}")
+    types = library.facets("type")
+    totals = library.type_totals()
+    for type_name, count in types.items():
+        total = ""
+        if type_name in totals:
+            total = f", всего {totals[type_name]:g} {TYPE_TOTALS[type_name][1]}"
+        print(f"Тип {type_name}: {count} книг{total}")
+
+
+def main(data_dir: str = DATA_DIR) -> None:
     """Точка входа в приложение"""
-    library = Library()
+    # Книги восстанавливаются из снимка и журнала операций в data_dir
+    library = PersistentLibrary(data_dir)
 
-    # Добавляем несколько начальных книг для демонстрации
-    initial_books = [
-        PrintedBook("Война и мир", "Толстой", 1869, "Роман", "ISBN-001", 1225, "твёрдая"),
-        PrintedBook("1984", "Оруэлл", 1949, "Антиутопия", "ISBN-002", 328, "мягкая"),
-        EBook("Мастер и Маргарита", "Булгаков", 1967, "Роман", "ISBN-003", "EPUB", 2.5),
-        AudioBook("Евгений Онегин", "Пушкин", 1833, "Поэзия", "ISBN-004", 180, "Смоктуновский"),
-    ]
+    # При первом запуске добавляем несколько начальных книг для демонстрации
+    if len(library) == 0:
+        initial_books = [
+            PrintedBook("Война и мир", "Толстой", 1869, "Роман", "ISBN-001", 1225, "твёрдая"),
+            PrintedBook("1984", "Оруэлл", 1949, "Антиутопия", "ISBN-002", 328, "мягкая"),
+            EBook("Мастер и Маргарита", "Булгаков", 1967, "Роман", "ISBN-003", "EPUB", 2.5),
+            AudioBook("Евгений Онегин", "Пушкин", 1833, "Поэзия", "ISBN-004", 180, "Смоктуновский"),
+        ]
+        library.add_books(initial_books)
 
-    for book in initial_books:
-        library.add_book(book)
+    print(f"Библиотека инициализирована с {len(library)} книгами")
+    library.enable_metrics()
+
+    try:
+        run_menu(library)
+    finally:
+        library.close()
 
-    print("Библиотека инициализирована с 4 книгами")
 
+def run_menu(library: Library) -> None:
+    """Главный цикл меню"""
     # Главный цикл программы
     while True:
         print_menu()
-        choice = input("Выберите действие (0-8): ").strip()
+        choice = input("Выберите действие (0-9): ").strip()
 
         if choice == "1":
             add_book(library)
@@ -391,6 +452,8 @@ def main() -> None:
             show_all_books(library)
         elif choice == "8":
             run_simulation()
+        elif choice == "9":
+            show_stats(library)
         elif choice == "0":
             print("\nДо свидания!")
             break
@@ -0,0 +1,187 @@
+"""Замеры времени операций"""
+import json
+import threading
+from array import array
+
+
+class LatencyRecorder:
+    """Длительности операций одного вида в наносекундах
+
+    Все замеры хранятся в компактном массиве (8 байт на замер), поэтому
+    процентили точные; сортировка выполняется только при запросе отчёта.
+    """
+
+    def __init__(self):
+        self._samples = array("q")
+        self._sorted = None
+        self.total_ns = 0
+
+    def record(self, ns):
+        """Добавить замер"""
+        self._samples.append(ns)
+        self.total_ns += ns
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p):
+        """Значение, не больше которого p процентов замеров (0, если замеров нет)"""
+        if not self._samples:
+            return 0
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        rank = min(len(self._sorted) - 1, max(0, round(p / 100 * len(self._sorted)) - 1))
+        return self._sorted[rank]
+
+    def summary(self):
+        """Число замеров, среднее и процентили в микросекундах"""
+        count = len(self._samples)
+        return {
+            "count": count,
+            "mean_us": self.total_ns / count / 1000 if count else 0.0,
+            "p50_us": self.percentile(50) / 1000,
+            "p90_us": self.percentile(90) / 1000,
+            "p99_us": self.percentile(99) / 1000,
+            "max_us": self.percentile(100) / 1000,
+        }
+
+
+def _bucket(ns):
+    """Номер корзины гистограммы: старшие 4 бита значения, погрешность не больше 1/8"""
+    if ns < 16:
+        return ns
+    shift = ns.bit_length() - 4
+    return shift * 8 + (ns >> shift)
+
+
+def _bucket_value(index):
+    """Середина диапазона значений корзины"""
+    if index < 16:
+        return index
+    shift = index // 8 - 1
+    return ((index % 8 + 8) << shift) + (1 << shift) // 2
+
+
+class LatencyHistogram:
+    """Гистограмма длительностей в наносекундах с фиксированным расходом памяти
+
+    В отличие от LatencyRecorder не хранит сами замеры, поэтому подходит для
+    постоянного сбора статистики; процентили приблизительные (до 1/8 значения).
+    """
+
+    def __init__(self):
+        self._counts = [0] * 512
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns):
+        """Добавить замер"""
+        self._counts[_bucket(ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def __len__(self):
+        return self.count
+
+    def percentile(self, p):
+        """Приблизительное значение, не больше которого p процентов замеров"""
+        if not self.count:
+            return 0
+        rank = max(1, round(p / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_value(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self):
+        """Число замеров, среднее и процентили в микросекундах"""
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "p50_us": self.percentile(50) / 1000,
+            "p90_us": self.percentile(90) / 1000,
+            "p99_us": self.percentile(99) / 1000,
+            "max_us": self.max_ns / 1000,
+        }
+
+
+class OperationStats:
+    """Счётчики одной операции: вызовы, найдено/не найдено, ошибки и гистограмма задержек
+
+    Операцию могут одновременно выполнять несколько потоков (поиски идут под общей
+    блокировкой чтения), поэтому счётчики меняются и читаются под своей блокировкой.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record(self, ns, outcome=None):
+        """Учесть вызов длительностью ns; outcome - "hit", "miss", "error" или None"""
+        with self._lock:
+            self.calls += 1
+            self.latency.record(ns)
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "miss":
+                self.misses += 1
+            elif outcome == "error":
+                self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "latency": self.latency.summary(),
+            }
+
+
+class MetricsDumper:
+    """Фоновый поток, который раз в interval секунд сохраняет library.stats()
+
+    Снимки дописываются строками JSON в файл path и/или передаются в callback.
+    """
+
+    def __init__(self, library, interval, path=None, callback=None):
+        self.library = library
+        self.interval = interval
+        self.path = path
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+
+    def dump(self):
+        """Сохранить один снимок статистики"""
+        stats = self.library.stats()
+        if self.path is not None:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(stats, ensure_ascii=False) + "\n")
+        if self.callback is not None:
+            self.callback(stats)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Остановить поток и сохранить последний снимок"""
+        self._stop.set()
+        self._thread.join()
+        self.dump()
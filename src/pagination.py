@@ -0,0 +1,100 @@
+"""Постраничная выдача книг с курсором
+
+Каждая книга при добавлении получает порядковый номер (seq), который больше
+всех выданных раньше. Страницы идут по возрастанию seq, а курсор хранит seq
+последней выданной книги. Поэтому продолжение выдачи не сбивается, если
+между страницами книги добавляют или удаляют: удалённые просто пропадают,
+новые появляются в конце.
+"""
+from bisect import bisect_left, bisect_right
+
+
+class Page:
+    """Страница результатов и курсор для следующей страницы (None - страниц больше нет)"""
+
+    def __init__(self, books, next_cursor):
+        self.books = books
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.books)
+
+    def __len__(self):
+        return len(self.books)
+
+    def __repr__(self):
+        return f"Страница: {len(self.books)} книг, курсор: {self.next_cursor}"
+
+
+def encode_cursor(*parts):
+    """Курсор - строка из чисел через двоеточие"""
+    return ":".join(str(part) for part in parts)
+
+
+def decode_cursor(cursor, size):
+    """Разобрать курсор из size чисел; неверный курсор даёт ValueError"""
+    parts = [int(part) for part in cursor.split(":")]
+    if len(parts) != size:
+        raise ValueError(f"Неверный курсор: '{cursor}'")
+    return parts
+
+
+def make_page(found, page_size):
+    """Страница из найденных пар (позиция, книга); позиция - кортеж чисел для курсора
+
+    found должен содержать до page_size + 1 элементов: лишний показывает, что есть следующая страница.
+    """
+    if len(found) <= page_size:
+        return Page([book for _, book in found], None)
+    found = found[:page_size]
+    return Page([book for _, book in found], encode_cursor(*found[-1][0]))
+
+
+class SeqOrder:
+    """Все книги по возрастанию seq
+
+    Удалённые книги заменяются на None, а список уплотняется, когда таких мест
+    становится больше половины. Поиск места по seq - двоичный поиск.
+    """
+
+    def __init__(self):
+        # Номера и книги лежат в одном кортеже: уплотнение заменяет оба списка одним присваиванием,
+        # и читатель из другого потока не увидит новый список номеров со старым списком книг
+        self._items = ([], [])
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._items[1]) - self._removed
+
+    def append(self, seq, book):
+        """Добавить книгу; seq должен быть больше всех предыдущих"""
+        seqs, books = self._items
+        # Сначала номер: список номеров никогда не короче списка книг
+        seqs.append(seq)
+        books.append(book)
+
+    def remove(self, seq):
+        """Убрать книгу с номером seq"""
+        seqs, books = self._items
+        books[bisect_left(seqs, seq)] = None
+        self._removed += 1
+        if self._removed * 2 > len(books):
+            self._compact()
+
+    def _compact(self):
+        seqs, books = self._items
+        kept = [(seq, book) for seq, book in zip(seqs, books) if book is not None]
+        self._items = ([seq for seq, _ in kept], [book for _, book in kept])
+        self._removed = 0
+
+    def after(self, seq, limit):
+        """До limit пар (seq, книга) с номером больше seq"""
+        seqs, books = self._items
+        result = []
+        position = bisect_right(seqs, seq)
+        while position < len(books) and len(result) < limit:
+            book = books[position]
+            if book is not None:
+                result.append((seqs[position], book))
+            position += 1
+        return result
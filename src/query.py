@@ -0,0 +1,90 @@
+"""Планировщик составных запросов к библиотеке
+
+План выбирает самый избирательный индекс (с наименьшим числом книг),
+берёт из него кандидатов и пересекает их с остальными условиями.
+Полный просмотр коллекции нужен только когда условий нет совсем.
+"""
+
+
+class QueryPlan:
+    """Выбранный способ выполнения запроса"""
+
+    def __init__(self, index, estimated, filters):
+        self.index = index  # "author", "year", "genre", "year_range", "scan" или "empty"
+        self.estimated = estimated  # Сколько книг-кандидатов даст индекс
+        self.filters = filters  # Условия, проверяемые для каждого кандидата
+
+    def __repr__(self):
+        filters = ", ".join(self.filters) if self.filters else "нет"
+        return f"План: индекс '{self.index}', кандидатов: {self.estimated}, фильтры: {filters}"
+
+
+def _criteria(author, year, genre, min_year, max_year):
+    """Заданные условия в виде {имя: значение}; None означает, что условия нет"""
+    criteria = {}
+    if author is not None:
+        criteria["author"] = author
+    if year is not None:
+        criteria["year"] = year
+    if genre is not None:
+        criteria["genre"] = genre
+    if min_year is not None or max_year is not None:
+        criteria["year_range"] = (min_year, max_year)
+    return criteria
+
+
+def build_plan(index, total, author=None, year=None, genre=None, min_year=None, max_year=None):
+    """Построить план по размерам индексов; total - число книг в библиотеке"""
+    criteria = _criteria(author, year, genre, min_year, max_year)
+    if not criteria:
+        return QueryPlan("scan", total, [])
+
+    sizes = {}
+    for field in ("author", "year", "genre"):
+        if field in criteria:
+            sizes[field] = index.count_by(field, criteria[field])
+    if "year_range" in criteria:
+        sizes["year_range"] = index.count_by_year_range(min_year, max_year)
+
+    best = min(sizes, key=sizes.get)
+    if sizes[best] == 0:
+        return QueryPlan("empty", 0, [])
+    return QueryPlan(best, sizes[best], [name for name in criteria if name != best])
+
+
+def execute_plan(plan, index, books, author=None, year=None, genre=None, min_year=None, max_year=None):
+    """Выполнить план: взять кандидатов из индекса и оставить подходящих под остальные условия"""
+    if plan.index == "empty":
+        return []
+    if plan.index == "scan":
+        return list(books)
+    if plan.index == "author":
+        candidates = index.get_by_author(author)
+    elif plan.index == "year":
+        candidates = index.get_by_year(year)
+    elif plan.index == "genre":
+        candidates = index.get_by_genre(genre)
+    else:
+        candidates = index.get_by_year_range(min_year, max_year)
+
+    filters = plan.filters
+    if not filters:
+        return candidates
+
+    check_author = "author" in filters
+    check_year = "year" in filters
+    check_genre = "genre" in filters
+    check_range = "year_range" in filters
+    result = []
+    for book in candidates:
+        if check_author and book.author != author:
+            continue
+        if check_year and book.year != year:
+            continue
+        if check_genre and book.genre != genre:
+            continue
+        if check_range and ((min_year is not None and book.year < min_year)
+                            or (max_year is not None and book.year > max_year)):
+            continue
+        result.append(book)
+    return result
@@ -0,0 +1,76 @@
+"""Преобразование книг в словари и обратно (для файлов, журналов и сети)"""
+from src.books import Book, PrintedBook, EBook, AudioBook
+
+
+# Короткие имена типов книг в записях
+BOOK_TYPES = {
+    "book": Book,
+    "printed": PrintedBook,
+    "ebook": EBook,
+    "audio": AudioBook,
+}
+
+# Поля записи для каждого типа в порядке аргументов конструктора
+BOOK_FIELDS = {
+    "book": ("title", "author", "year", "genre", "isbn"),
+    "printed": ("title", "author", "year", "genre", "isbn", "pages", "cover_type"),
+    "ebook": ("title", "author", "year", "genre", "isbn", "file_format", "file_size_mb"),
+    "audio": ("title", "author", "year", "genre", "isbn", "duration_minutes", "narrator"),
+}
+
+_TYPE_NAMES = {cls: name for name, cls in BOOK_TYPES.items()}
+
+
+def book_type_name(book):
+    """Короткое имя типа книги ("book", "printed", "ebook" или "audio")
+
+    Подкласс известного типа получает имя ближайшего известного предка.
+    """
+    cls = type(book)
+    name = _TYPE_NAMES.get(cls)
+    if name is None:
+        for base in cls.__mro__:
+            if base in _TYPE_NAMES:
+                name = _TYPE_NAMES[cls] = _TYPE_NAMES[base]
+                break
+        else:
+            raise TypeError(f"Неизвестный тип книги: {cls.__name__}")
+    return name
+
+
+def book_to_record(book):
+    """Словарь с типом и всеми полями книги"""
+    name = book_type_name(book)
+    record = {"type": name}
+    for field in BOOK_FIELDS[name]:
+        record[field] = getattr(book, field)
+    return record
+
+
+# Числовые поля записи и допустимые для них типы; остальные поля - строки
+NUMBER_FIELDS = {
+    "year": int,
+    "pages": int,
+    "file_size_mb": (int, float),
+    "duration_minutes": (int, float),
+}
+
+
+def book_from_record(record):
+    """Создать книгу из словаря; поля проверяются конструктором книги
+
+    Неизвестный тип или отсутствующее поле дают KeyError, запись не в виде
+    словаря или поле неверного типа (например, число вместо строки) - ValueError.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"Запись книги должна быть объектом, а не {type(record).__name__}")
+    name = record.get("type") or "book"
+    cls = BOOK_TYPES[name]
+    values = []
+    for field in BOOK_FIELDS[name]:
+        value = record[field]
+        kind = NUMBER_FIELDS.get(field, str)
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ValueError(f"Поле '{field}' имеет неверный тип: {type(value).__name__}")
+        values.append(value)
+    return cls(*values)
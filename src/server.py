@@ -0,0 +1,218 @@
+"""Асинхронный сервер библиотеки: JSON Lines поверх TCP
+
+Запрос - одна строка JSON: {"id": 1, "op": "find_by_author", "author": "Толстой"}.
+Ответ - строка {"id": 1, "ok": true, "result": ...} или
+{"id": 1, "ok": false, "error": "KeyError", "message": "..."}; книги передаются словарями
+из serialization. Клиент может отправить несколько запросов, не дожидаясь ответов:
+запросы одного соединения выполняются и получают ответы по порядку.
+
+Все операции выполняются в цикле событий одного потока, поэтому библиотеке
+не нужны блокировки.
+
+Запуск:
+    python -m src.server [--host 127.0.0.1] [--port 8765] [--data-dir library_data]
+"""
+import argparse
+import asyncio
+import json
+import signal
+from src.constants import DATA_DIR
+from src.errors import ValidationError
+from src.serialization import book_to_record, book_from_record
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Ошибки операций, которые возвращаются клиенту, а не закрывают соединение
+REQUEST_ERRORS = (ValidationError, KeyError, ValueError, TypeError)
+
+MAX_LINE = 2 ** 20  # Самая длинная строка запроса в байтах
+
+# Обязательные поля запроса и их типы; min_year/max_year у find_by_year_range необязательны
+REQUEST_FIELDS = {
+    "add": {"book": dict},
+    "remove": {"isbn": str},
+    "find_by_isbn": {"isbn": str},
+    "find_by_author": {"author": str},
+    "find_by_genre": {"genre": str},
+    "find_by_year": {"year": int},
+    "search_title": {"query": str},
+}
+OPTIONAL_FIELDS = {
+    "find_by_year_range": {"min_year": int, "max_year": int},
+}
+
+
+def check_request(op, request):
+    """Проверить, что у запроса есть нужные поля нужных типов (ValueError, если нет)"""
+    for field, kind in REQUEST_FIELDS.get(op, {}).items():
+        if field not in request:
+            raise ValueError(f"В запросе '{op}' нет поля '{field}'")
+        value = request[field]
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ValueError(f"Поле '{field}' имеет неверный тип: {type(value).__name__}")
+    for field, kind in OPTIONAL_FIELDS.get(op, {}).items():
+        value = request.get(field)
+        if value is not None and (not isinstance(value, kind) or isinstance(value, bool)):
+            raise ValueError(f"Поле '{field}' имеет неверный тип: {type(value).__name__}")
+
+
+def _records(books):
+    return [book_to_record(book) for book in books]
+
+
+class LibraryServer:
+    """TCP-сервер поверх одной библиотеки"""
+
+    def __init__(self, library, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.library = library
+        self.host = host
+        self.port = port
+        self._server = None
+        self._closing = False
+        self._connections = {}  # Задача обработчика -> (reader, writer)
+        self._operations = {
+            "add": self._add,
+            "remove": self._remove,
+            "find_by_isbn": self._find_by_isbn,
+            "find_by_author": lambda request: _records(self.library.find_by_author(request["author"])),
+            "find_by_genre": lambda request: _records(self.library.find_by_genre(request["genre"])),
+            "find_by_year": lambda request: _records(self.library.find_by_year(request["year"])),
+            "find_by_year_range": lambda request: _records(self.library.find_by_year_range(
+                request.get("min_year"), request.get("max_year"))),
+            "search_title": lambda request: _records(self.library.search_title(request["query"])),
+            "count": lambda request: len(self.library),
+        }
+
+    def _add(self, request):
+        self.library.add_book(book_from_record(request["book"]))
+
+    def _remove(self, request):
+        book = self.library.find_by_isbn(request["isbn"])
+        if book is None:
+            raise KeyError(f"Книга с ISBN '{request['isbn']}' не найдена")
+        self.library.remove_book(book)
+
+    def _find_by_isbn(self, request):
+        book = self.library.find_by_isbn(request["isbn"])
+        return None if book is None else book_to_record(book)
+
+    def execute(self, request):
+        """Выполнить запрос (словарь) и вернуть ответ (словарь)"""
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Запрос должен быть объектом JSON")
+            op = request.get("op")
+            operation = self._operations.get(op) if isinstance(op, str) else None
+            if operation is None:
+                raise ValueError(f"Неизвестная операция: '{op}'")
+            check_request(op, request)
+            return {"id": request_id, "ok": True, "result": operation(request)}
+        except REQUEST_ERRORS as error:
+            message = error.args[0] if isinstance(error, KeyError) and error.args else str(error)
+            return {"id": request_id, "ok": False, "error": type(error).__name__, "message": message}
+        except Exception as error:
+            # Непредвиденная ошибка одного запроса не должна обрывать соединение и ответы на следующие
+            return {"id": request_id, "ok": False, "error": type(error).__name__, "message": str(error)}
+
+    def execute_line(self, line):
+        """Ответ на одну строку запроса"""
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response = {"id": None, "ok": False, "error": "ValueError", "message": f"Неверный JSON: {error}"}
+        else:
+            response = self.execute(request)
+        return (json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    async def _read_request(reader):
+        """Следующая строка запроса; b"" - конец потока, None - строка длиннее MAX_LINE (пропущена)"""
+        oversized = False
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as error:
+                # Конец потока: последняя строка без перевода строки или ничего
+                return None if oversized else error.partial
+            except asyncio.LimitOverrunError as error:
+                # Отбрасываем уже принятую часть длинной строки и дочитываем её до перевода строки
+                await reader.readexactly(error.consumed)
+                oversized = True
+                continue
+            return None if oversized else line
+
+    async def _handle(self, reader, writer):
+        if self._closing:
+            writer.close()  # Соединение принято уже после начала остановки
+            return
+        task = asyncio.current_task()
+        self._connections[task] = (reader, writer)
+        try:
+            while True:
+                line = await self._read_request(reader)
+                if line is None:
+                    response = {"id": None, "ok": False, "error": "ValueError",
+                                "message": f"Строка запроса длиннее {MAX_LINE} байт"}
+                    writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                elif not line:
+                    break
+                else:
+                    writer.write(self.execute_line(line))
+                # drain ждёт только при переполненном буфере отправки, поэтому
+                # ответы на несколько присланных подряд запросов уходят без пауз
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def start(self):
+        """Начать принимать соединения; port=0 выбирает свободный порт"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def shutdown(self):
+        """Плавная остановка: новые соединения не принимаются, полученные запросы получают ответы"""
+        self._closing = True
+        self._server.close()
+        for reader, writer in list(self._connections.values()):
+            # Уже прочитанные строки будут обработаны, после них обработчик увидит конец потока
+            writer.transport.pause_reading()
+            reader.feed_eof()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.shutdown()
+
+
+async def serve(library, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Работать до SIGINT или SIGTERM, затем плавно остановиться"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    async with LibraryServer(library, host, port) as server:
+        print(f"Сервер библиотеки слушает {server.host}:{server.port}")
+        await stop.wait()
+    print("Сервер остановлен")
+
+
+if __name__ == "__main__":
+    from src.storage import PersistentLibrary
+
+    parser = argparse.ArgumentParser(description="Сервер библиотеки (JSON Lines поверх TCP)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+    with PersistentLibrary(args.data_dir) as target:
+        asyncio.run(serve(target, args.host, args.port))
@@ -0,0 +1,222 @@
+"""Библиотека, разделённая между несколькими процессами
+
+Книги распределяются по процессам-шардам по хешу ISBN (zlib.crc32, одинаковый
+во всех процессах). В каждом шарде своя Library. Операции с одной книгой идут
+в один шард, а поиски по автору, жанру, году и названию рассылаются всем шардам
+сразу и выполняются параллельно на разных ядрах; результаты объединяются.
+"""
+import multiprocessing
+import os
+import zlib
+from src.errors import EmptyLibraryError
+from src.library import BulkAddResult, Library
+from src.trie import sort_key
+
+
+def _serve_shard(conn):
+    """Цикл процесса-шарда: выполнять вызовы методов своей Library"""
+    library = Library()
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        method, args = message
+        try:
+            reply = (True, getattr(library, method)(*args))
+        except Exception as error:
+            reply = (False, error)
+        try:
+            conn.send(reply)
+        except Exception as error:  # Результат или ошибку не удалось передать через pickle
+            conn.send((False, RuntimeError(f"{type(error).__name__}: {error}")))
+    conn.close()
+
+
+def shard_of(isbn, shards):
+    """Номер шарда для ISBN"""
+    return zlib.crc32(isbn.encode("utf-8")) % shards
+
+
+class ShardedLibrary:
+    """Библиотека из shards процессов с тем же набором методов, что и Library
+
+    Книги из разных шардов в результатах поиска идут по шардам, внутри шарда - в порядке
+    добавления. Постраничная выдача (page) и explain не поддерживаются: у каждого шарда
+    свой порядок книг и свой план.
+    """
+
+    def __init__(self, shards=None, context="spawn"):
+        self.shards = shards or os.cpu_count() or 1
+        ctx = multiprocessing.get_context(context)
+        self._conns = []
+        self._processes = []
+        for _ in range(self.shards):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_serve_shard, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+        self._sizes = [0] * self.shards  # Число книг в каждом шарде
+
+    @staticmethod
+    def _reply(conn):
+        ok, result = conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call(self, shard, method, *args):
+        """Вызвать метод Library в одном шарде"""
+        self._conns[shard].send((method, args))
+        return self._reply(self._conns[shard])
+
+    def _scatter(self, method, *args):
+        """Вызвать метод во всех шардах параллельно; список (успех, результат) по шардам"""
+        for conn in self._conns:
+            conn.send((method, args))
+        # Ответы забираем у всех шардов, даже если где-то ошибка, иначе каналы рассинхронизируются
+        return [conn.recv() for conn in self._conns]
+
+    def _gather(self, method, *args):
+        """Результаты метода во всех шардах; первая ошибка шарда пробрасывается"""
+        results = []
+        for ok, result in self._scatter(method, *args):
+            if not ok:
+                raise result
+            results.append(result)
+        return results
+
+    def _merged(self, method, *args):
+        """Объединённые списки книг из всех шардов"""
+        return [book for books in self._gather(method, *args) for book in books]
+
+    def _shard(self, isbn):
+        return shard_of(isbn, self.shards)
+
+    def add_book(self, book):
+        """Добавить книгу в её шард"""
+        shard = self._shard(book.isbn)
+        self._call(shard, "add_book", book)
+        self._sizes[shard] += 1
+
+    def add_books(self, books):
+        """Пакетное добавление: каждый шард получает свою часть пакета одним сообщением"""
+        books = list(books)
+        parts = [[] for _ in range(self.shards)]
+        for position, book in enumerate(books):
+            parts[self._shard(book.isbn)].append(position)
+        for conn, part in zip(self._conns, parts):
+            conn.send(("add_books", ([books[position] for position in part],)))
+        replies = [conn.recv() for conn in self._conns]
+        result = BulkAddResult()
+        result.results = [None] * len(books)
+        for shard, ((ok, shard_result), part) in enumerate(zip(replies, parts)):
+            if not ok:
+                raise shard_result
+            self._sizes[shard] += len(shard_result.added)
+            for position, (_, error) in zip(part, shard_result):
+                # Книга из ответа - копия; в итог кладём исходный объект, как Library.add_books
+                result.results[position] = (books[position], error)
+        return result
+
+    def remove_book(self, book):
+        """Удалить книгу из её шарда"""
+        if len(self) == 0:
+            raise EmptyLibraryError()
+        shard = self._shard(book.isbn)
+        if self._sizes[shard] == 0:
+            raise ValueError(f"Книга с ISBN '{book.isbn}' не найдена в коллекции")
+        self._call(shard, "remove_book", book)
+        self._sizes[shard] -= 1
+
+    def find_by_isbn(self, isbn):
+        """Поиск по ISBN (в одном шарде)"""
+        return self._call(self._shard(isbn), "find_by_isbn", isbn)
+
+    def find_by_author(self, author):
+        """Поиск по автору во всех шардах"""
+        result = self._merged("query", author)
+        if not result:
+            raise KeyError(f"Автор '{author}' не найден")
+        return result
+
+    def find_by_year(self, year):
+        """Поиск по году во всех шардах"""
+        result = self._merged("query", None, year)
+        if not result:
+            raise KeyError(f"Книги {year} года не найдены")
+        return result
+
+    def find_by_genre(self, genre):
+        """Поиск по жанру во всех шардах"""
+        result = self._merged("query", None, None, genre)
+        if not result:
+            raise KeyError(f"Жанр '{genre}' не найден")
+        return result
+
+    def find_by_year_range(self, min_year=None, max_year=None):
+        """Поиск по диапазону лет (книги из всех шардов по возрастанию года)"""
+        result = self._merged("find_by_year_range", min_year, max_year)
+        result.sort(key=lambda book: book.year)  # Сортировка устойчива: порядок внутри года сохраняется
+        return result
+
+    def count_by_year_range(self, min_year=None, max_year=None):
+        """Количество книг в диапазоне лет"""
+        return sum(self._gather("count_by_year_range", min_year, max_year))
+
+    def min_year(self):
+        """Самый ранний год издания"""
+        if len(self) == 0:
+            raise EmptyLibraryError()
+        return min(year for ok, year in self._scatter("min_year") if ok)
+
+    def max_year(self):
+        """Самый поздний год издания"""
+        if len(self) == 0:
+            raise EmptyLibraryError()
+        return max(year for ok, year in self._scatter("max_year") if ok)
+
+    def search_title(self, query):
+        """Полнотекстовый поиск по названию во всех шардах"""
+        return self._merged("search_title", query)
+
+    def autocomplete(self, field, prefix="", limit=None):
+        """Автодополнение: объединение вариантов всех шардов в порядке префиксного дерева"""
+        values = set(value for values in self._gather("autocomplete", field, prefix, limit) for value in values)
+        values = sorted(values, key=sort_key)
+        return values if limit is None else values[:limit]
+
+    def suggest(self, field, value, limit=5):
+        """Похожие значения поля из всех шардов, по возрастанию расстояния, как у Library"""
+        found = sorted(set(pair for pairs in self._gather("suggest", field, value, limit, True) for pair in pairs))
+        return [value for _, value in found[:limit]]
+
+    def query(self, author=None, year=None, genre=None, min_year=None, max_year=None):
+        """Составной запрос: каждый шард выполняет его по своим индексам"""
+        return self._merged("query", author, year, genre, min_year, max_year)
+
+    def __len__(self):
+        return sum(self._sizes)
+
+    def __contains__(self, isbn):
+        return self._call(self._shard(isbn), "__contains__", isbn)
+
+    def close(self):
+        """Остановить процессы-шарды"""
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,91 +1,228 @@
+"""Симуляция работы библиотеки и генерация нагрузки
+
+Запуск:
+    python -m src.simulation [--steps N] [--seed S] [--output verbose|summary|silent]
+                             [--events add_book=3,remove_book=1] [--types printed=2,audio=1]
+"""
+import argparse
 import random
-from src.books import Book
+import time
 from src.library import Library
-from src.constants import TITLES, AUTHORS, GENRES
+from src.metrics import LatencyRecorder
+from src.serialization import BOOK_TYPES
+from src.constants import TITLES, AUTHORS, GENRES, NARRATORS, FILE_FORMATS, COVER_TYPES
+
+
+# События симуляции и их веса по умолчанию (все равновероятны)
+DEFAULT_EVENTS = {
+    "add_book": 1,
+    "remove_book": 1,
+    "search_by_author": 1,
+    "search_by_genre": 1,
+    "get_nonexistent": 1,
+}
+
+# Типы добавляемых книг (имена из serialization.BOOK_TYPES) и их веса
+DEFAULT_BOOK_TYPES = {"book": 1}
+
+OUTPUT_MODES = ("verbose", "summary", "silent")
+
+# События-поиски, для которых считаются попадания и промахи
+SEARCH_EVENTS = ("search_by_author", "search_by_genre", "get_nonexistent")
+
+
+def random_book(rng, type_name, isbn):
+    """Случайная валидная книга заданного типа"""
+    args = [rng.choice(TITLES), rng.choice(AUTHORS), rng.randint(1900, 2025), rng.choice(GENRES), isbn]
+    if type_name == "printed":
+        args += [rng.randint(1, 2000), rng.choice(COVER_TYPES)]
+    elif type_name == "ebook":
+        args += [rng.choice(FILE_FORMATS), round(rng.uniform(0.1, 100), 1)]
+    elif type_name == "audio":
+        args += [rng.randint(1, 2000), rng.choice(NARRATORS)]
+    return BOOK_TYPES[type_name](*args)
+
+
+class SimulationReport:
+    """Итог симуляции: пропускная способность, задержки по событиям, попадания поиска"""
+
+    def __init__(self, steps, seconds, books, latencies, hits, misses):
+        self.steps = steps
+        self.seconds = seconds
+        self.books = books  # Книг в библиотеке в конце
+        self.latencies = latencies  # Событие -> LatencyRecorder
+        self.hits = hits  # Событие-поиск -> число успешных поисков
+        self.misses = misses
+
+    @property
+    def ops_per_second(self):
+        return self.steps / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        lines = [f"Шагов: {self.steps}, {self.seconds:.2f} с ({self.ops_per_second:,.0f} операций/с), "
+                 f"книг в конце: {self.books}",
+                 f"{'Событие':<18}{'число':>10}{'p50 мкс':>10}{'p90 мкс':>10}{'p99 мкс':>10}{'max мкс':>10}"]
+        for event, recorder in self.latencies.items():
+            stats = recorder.summary()
+            lines.append(f"{event:<18}{stats['count']:>10}{stats['p50_us']:>10.1f}{stats['p90_us']:>10.1f}"
+                         f"{stats['p99_us']:>10.1f}{stats['max_us']:>10.1f}")
+        for event in self.hits:
+            lines.append(f"{event}: найдено {self.hits[event]}, не найдено {self.misses[event]}")
+        return "\n".join(lines)
+
+
+def run_simulation(steps: int = 20, seed: int | None = None, events: dict | None = None,
+                   book_types: dict | None = None, output: str = "verbose", trace=None) -> SimulationReport:
+    """Запуск симуляции библиотеки
 
+    events и book_types - веса событий и типов книг; output: "verbose" печатает каждый шаг
+    и итог, "summary" - только итог, "silent" ничего не печатает. trace - trace.TraceWriter,
+    в который записываются операции над библиотекой и их результаты. Возвращает SimulationReport.
+    """
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Неизвестный режим вывода: '{output}'")
+    events = DEFAULT_EVENTS if events is None else events
+    book_types = DEFAULT_BOOK_TYPES if book_types is None else book_types
+    for event in events:
+        if event not in DEFAULT_EVENTS:
+            raise ValueError(f"Неизвестное событие: '{event}'")
+    for type_name in book_types:
+        if type_name not in BOOK_TYPES:
+            raise ValueError(f"Неизвестный тип книги: '{type_name}'")
+    verbose = output == "verbose"
 
-def run_simulation(steps: int = 20, seed: int | None = None) -> None:
-    """Запуск симуляции библиотеки"""
+    # 1. Свой генератор случайных чисел: симуляция не меняет глобальный random
+    rng = random.Random(seed)
+    type_names = list(book_types)
+    type_weights = list(book_types.values())
+    next_isbn = 0  # ISBN выдаются по счётчику и никогда не повторяются
 
-    # 1. Установка seed для воспроизводимости
-    if seed is not None:
-        random.seed(seed)
+    def new_book():
+        nonlocal next_isbn
+        type_name = rng.choices(type_names, type_weights)[0] if len(type_names) > 1 else type_names[0]
+        book = random_book(rng, type_name, f"ISBN-{next_isbn}")
+        next_isbn += 1
+        return book
 
     # 2. Создание библиотеки
     library = Library()
+    record = None if trace is None else trace.record
 
     # 3. Добавление начальных книг
-    for i in range(3):
-        book = Book(
-            title=random.choice(TITLES),
-            author=random.choice(AUTHORS),
-            year=random.randint(1900, 2024),
-            genre=random.choice(GENRES),
-            isbn=f"ISBN-{i}"
-        )
+    for _ in range(3):
+        book = new_book()
         library.add_book(book)
-        print(f"[Начало] Добавлена книга: {book}")
-
-    print(f"Начало симуляции: {steps} шагов")
-
-    # 4. Список возможных событий
-    events = ["add_book", "remove_book", "search_by_author", "search_by_genre", "get_nonexistent"]
-
-    # 5. Основной цикл симуляции
-    for step in range(1, steps + 1):
-        event = random.choice(events)
-        print(f"Шаг {step}. Событие: {event}")
-
-        if event == "add_book":
-            # Добавление новой книги
-            isbn = f"ISBN-{random.randint(100, 999)}"
-            book = Book(
-                title=random.choice(TITLES),
-                author=random.choice(AUTHORS),
-                year=random.randint(1900, 2025),
-                genre=random.choice(GENRES),
-                isbn=isbn
-            )
-            library.add_book(book)
-            print(f"Добавлена: {book}")
-
-        elif event == "remove_book":
-            # Удаление случайной книги
-            if len(library) > 0:
-                book = random.choice(list(library.books))
-                library.remove_book(book)
-                print(f"Удалена: {book}")
-            else:
-                print(f"Библиотека пуста, нечего удалять")
-
-        elif event == "search_by_author":
-            # Поиск по автору
-            author = random.choice(AUTHORS)
-            try:
-                results = library.find_by_author(author)
-                print(f"Поиск по автору '{author}': найдено {len(results)} книг")
-            except KeyError:
-                print(f"Поиск по автору '{author}': не найдено")
-
-        elif event == "search_by_genre":
-            # Поиск по жанру
-            genre = random.choice(GENRES)
-            try:
-                results = library.find_by_genre(genre)
-                print(f"Поиск по жанру '{genre}': найдено {len(results)} книг")
-            except KeyError:
-                print(f"Поиск по жанру '{genre}': не найдено")
-
-        elif event == "get_nonexistent":
-            # Попытка получить несуществующую книгу
-            fake_isbn = "ISBN-NOT-EXISTS"
-            result = library.find_by_isbn(fake_isbn)
-            if result is None:
-                print(f"Книга с ISBN '{fake_isbn}' не найдена (ожидаемо)")
-            else:
-                print(f"Неожиданно найдена: {result}")
-
-    print(f"Симуляция завершена. Книг в библиотеке: {len(library)}")
+        if record:
+            record("add", book)
+        if verbose:
+            print(f"[Начало] Добавлена книга: {book}")
+
+    if verbose:
+        print(f"Начало симуляции: {steps} шагов")
+
+    hits = {event: 0 for event in SEARCH_EVENTS if event in events}
+    misses = dict(hits)
+
+    # 4. Обработчики событий. Каждый возвращает запись для трассы (op, аргумент[, результат])
+    # и сообщение; сообщение строится только в режиме verbose, а трасса пишется вне замера
+    def add_book():
+        book = new_book()
+        library.add_book(book)
+        return ("add", book), f"Добавлена: {book}" if verbose else None
+
+    def remove_book():
+        if len(library) == 0:
+            # Событие без изменений тоже попадает в трассу
+            return ("remove", None), "Библиотека пуста, нечего удалять" if verbose else None
+        # Случайная книга по индексу, без копирования всего списка
+        book = library.books[rng.randrange(len(library))]
+        library.remove_book(book)
+        return ("remove", book.isbn), f"Удалена: {book}" if verbose else None
+
+    def search_by_author():
+        author = rng.choice(AUTHORS)
+        try:
+            results = library.find_by_author(author)
+        except KeyError:
+            misses["search_by_author"] += 1
+            return ("find_author", author), f"Поиск по автору '{author}': не найдено" if verbose else None
+        hits["search_by_author"] += 1
+        message = f"Поиск по автору '{author}': найдено {len(results)} книг" if verbose else None
+        return ("find_author", author, len(results)), message
+
+    def search_by_genre():
+        genre = rng.choice(GENRES)
+        try:
+            results = library.find_by_genre(genre)
+        except KeyError:
+            misses["search_by_genre"] += 1
+            return ("find_genre", genre), f"Поиск по жанру '{genre}': не найдено" if verbose else None
+        hits["search_by_genre"] += 1
+        message = f"Поиск по жанру '{genre}': найдено {len(results)} книг" if verbose else None
+        return ("find_genre", genre, len(results)), message
+
+    def get_nonexistent():
+        fake_isbn = "ISBN-NOT-EXISTS"
+        result = library.find_by_isbn(fake_isbn)
+        if result is None:
+            misses["get_nonexistent"] += 1
+            message = f"Книга с ISBN '{fake_isbn}' не найдена (ожидаемо)" if verbose else None
+            return ("find_isbn", fake_isbn), message
+        hits["get_nonexistent"] += 1
+        return ("find_isbn", fake_isbn, result.isbn), f"Неожиданно найдена: {result}" if verbose else None
+
+    handlers = {
+        "add_book": add_book,
+        "remove_book": remove_book,
+        "search_by_author": search_by_author,
+        "search_by_genre": search_by_genre,
+        "get_nonexistent": get_nonexistent,
+    }
+    latencies = {event: LatencyRecorder() for event in events}
+    names = list(events)
+    weights = list(events.values())
+
+    # 5. Основной цикл симуляции; события выбираются пачками, чтобы не звать rng.choices на каждом шаге
+    clock = time.perf_counter_ns
+    start = time.perf_counter()
+    step = 0
+    while step < steps:
+        for event in rng.choices(names, weights, k=min(10000, steps - step)):
+            step += 1
+            handler = handlers[event]
+            began = clock()
+            entry, message = handler()
+            latencies[event].record(clock() - began)
+            if record:
+                record(*entry)
+            if verbose:
+                print(f"Шаг {step}. Событие: {event}")
+                print(message)
+    seconds = time.perf_counter() - start
+
+    report = SimulationReport(steps, seconds, len(library), latencies, hits, misses)
+    if verbose:
+        print(f"Симуляция завершена. Книг в библиотеке: {len(library)}")
+    if output != "silent":
+        print(report)
+    return report
+
+
+def parse_weights(text):
+    """Веса из строки вида "add_book=3,remove_book=1" """
+    weights = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight) if weight else 1.0
+    return weights
+
 
 if __name__ == "__main__":
-    run_simulation(steps=20, seed=42)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Симуляция работы библиотеки")
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", choices=OUTPUT_MODES, default="verbose")
+    parser.add_argument("--events", type=parse_weights, default=None, help="веса событий: add_book=3,remove_book=1")
+    parser.add_argument("--types", type=parse_weights, default=None, help="веса типов книг: printed=2,audio=1")
+    args = parser.parse_args()
+    run_simulation(args.steps, args.seed, args.events, args.types, args.output)
@@ -0,0 +1,254 @@
+"""Снимки библиотеки на момент времени
+
+Снимок не копирует книги и индексы, а читает живые индексы библиотеки.
+У каждой книги есть порядковый номер, который растёт с каждым добавлением,
+поэтому книги, добавленные после снимка, отличаются по номеру (он больше
+последнего номера на момент снимка) и просто пропускаются. Запоминать нужно
+только книги, удалённые после снимка: библиотека сообщает о них всем живым
+снимкам перед удалением. Снимок создаётся за O(1), а память растёт только
+с числом удалений.
+"""
+import heapq
+import threading
+from bisect import bisect_right, insort
+from operator import itemgetter
+from src.query import build_plan, execute_plan
+from src.serialization import book_type_name
+from src.textindex import matches
+
+
+_CHUNK = 1024  # Сколько книг читать из индекса за раз при переборе снимка
+_FIELDS = {
+    "author": lambda book: book.author,
+    "year": lambda book: book.year,
+    "genre": lambda book: book.genre,
+    "type": book_type_name,
+}
+
+
+class LibrarySnapshot:
+    """Неизменяемый вид библиотеки на момент вызова Library.snapshot()"""
+
+    def __init__(self, library):
+        self._library = library
+        self._index = library.index
+        self._last_seq = library.index.last_seq()  # Книги с большим номером добавлены после снимка
+        self._length = len(library.index)
+        self._removed = {}  # Номер -> книга, удалённая после снимка
+        self._removed_seqs = []  # Номера удалённых книг по возрастанию
+        self._removed_isbns = {}  # ISBN -> номер удалённой книги
+        # Защищает согласованность трёх полей выше: писатель дописывает их, читатель берёт срез
+        self._lock = threading.Lock()
+
+    def _record_removal(self, seq, book):
+        """Запомнить книгу, которую библиотека сейчас удалит"""
+        if seq > self._last_seq:
+            return  # Книги не было в снимке
+        with self._lock:
+            self._removed[seq] = book
+            self._removed_isbns[book.isbn] = seq
+            insort(self._removed_seqs, seq)
+
+    def _removed_between(self, after, upper):
+        """Пары (номер, книга) удалённых книг с номером из (after, upper], взятые одним срезом"""
+        with self._lock:
+            seqs = self._removed_seqs
+            return [(seq, self._removed[seq]) for seq in seqs[bisect_right(seqs, after):bisect_right(seqs, upper)]]
+
+    def release(self):
+        """Перестать получать сведения об изменениях; снимок больше нельзя читать"""
+        library = self._library
+        if library is not None:
+            library._forget_snapshot(self)
+            self._library = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _check(self):
+        if self._library is None:
+            raise RuntimeError("Снимок уже освобождён")
+
+    def _unchanged(self):
+        """Не было ни добавлений, ни удалений после снимка"""
+        return not self._removed and self._index.last_seq() == self._last_seq
+
+    def _visible(self, books):
+        """Пары (номер, книга) для книг индекса, которые были в библиотеке на момент снимка"""
+        seq_of, last = self._index.seq_of, self._last_seq
+        result = []
+        for book in books:
+            seq = seq_of(book.isbn)
+            # None - книгу удалили, пока мы читали; тогда она уже среди удалённых
+            if seq is not None and seq <= last:
+                result.append((seq, book))
+        return result
+
+    def _removed_where(self, check):
+        """Пары (номер, книга) среди удалённых после снимка книг, для которых check истинно"""
+        # Удалённые читаются после индекса: книга, исчезнувшая из индекса, уже есть здесь
+        with self._lock:
+            items = list(self._removed.items())
+        return sorted((seq, book) for seq, book in items if check(book))
+
+    def _added(self):
+        """Книги, добавленные после снимка и ещё не удалённые"""
+        return [book for _, book in self._index.page_all(self._last_seq, len(self._index) + 1)]
+
+    @staticmethod
+    def _merge(current, removed, key=itemgetter(0)):
+        """Слить книги индекса и удалённые; книга, удалённая между чтениями, берётся один раз"""
+        captured = {seq for seq, _ in removed}
+        current = [(seq, book) for seq, book in current if seq not in captured]
+        return [book for _, book in heapq.merge(current, removed, key=key)]
+
+    def _find(self, field, key, books):
+        """Книги снимка со значением поля key; books - книги из индекса библиотеки"""
+        if self._unchanged():
+            return books
+        getter = _FIELDS[field]
+        return self._merge(self._visible(books), self._removed_where(lambda book: getter(book) == key))
+
+    def _find_or_raise(self, field, key, getter, message):
+        try:
+            books = getter(key)
+        except KeyError:
+            books = []
+        result = self._find(field, key, books)
+        if not result:
+            raise KeyError(message)
+        return result
+
+    def find_by_isbn(self, isbn):
+        """Поиск по ISBN"""
+        self._check()
+        book = self._index[isbn]
+        seq = self._index.seq_of(isbn)
+        if book is not None and seq is not None and seq <= self._last_seq:
+            return book
+        seq = self._removed_isbns.get(isbn)
+        return None if seq is None else self._removed[seq]
+
+    def find_by_author(self, author):
+        """Поиск по автору"""
+        self._check()
+        return self._find_or_raise("author", author, self._index.get_by_author, f"Автор '{author}' не найден")
+
+    def find_by_year(self, year):
+        """Поиск по году"""
+        self._check()
+        return self._find_or_raise("year", year, self._index.get_by_year, f"Книги {year} года не найдены")
+
+    def find_by_genre(self, genre):
+        """Поиск по жанру"""
+        self._check()
+        return self._find_or_raise("genre", genre, self._index.get_by_genre, f"Жанр '{genre}' не найден")
+
+    def find_by_year_range(self, min_year=None, max_year=None):
+        """Поиск по диапазону лет [min_year, max_year], по возрастанию года"""
+        self._check()
+        books = self._index.get_by_year_range(min_year, max_year)
+        if self._unchanged():
+            return books
+        low = float("-inf") if min_year is None else min_year
+        high = float("inf") if max_year is None else max_year
+        current = [((book.year, seq), book) for seq, book in self._visible(books)]
+        removed = [((book.year, seq), book) for seq, book in self._removed_where(lambda book: low <= book.year <= high)]
+        removed.sort(key=itemgetter(0))
+        return self._merge(current, removed)
+
+    def count_by(self, field, key):
+        """Количество книг снимка с заданным значением поля author, year или genre"""
+        self._check()
+        count = self._index.count_by(field, key)
+        if self._unchanged():
+            return count
+        getter = _FIELDS[field]
+        count -= sum(1 for book in self._added() if getter(book) == key)
+        return count + len(self._removed_where(lambda book: getter(book) == key))
+
+    def count_by_year_range(self, min_year=None, max_year=None):
+        """Количество книг снимка с годом в диапазоне [min_year, max_year]"""
+        self._check()
+        count = self._index.count_by_year_range(min_year, max_year)
+        if self._unchanged():
+            return count
+        low = float("-inf") if min_year is None else min_year
+        high = float("inf") if max_year is None else max_year
+        count -= sum(1 for book in self._added() if low <= book.year <= high)
+        return count + len(self._removed_where(lambda book: low <= book.year <= high))
+
+    def facets(self, field):
+        """Число книг снимка по значениям поля author, genre, year или type"""
+        self._check()
+        counts = self._index.facet_counts(field)
+        if self._unchanged():
+            return counts
+        getter = _FIELDS[field]
+        for book in self._added():
+            key = getter(book)
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+        for book in list(self._removed.values()):
+            key = getter(book)
+            counts[key] = counts.get(key, 0) + 1
+        return dict(sorted(counts.items())) if field == "year" else counts
+
+    def search_title(self, query):
+        """Полнотекстовый поиск по названию среди книг снимка, в порядке добавления"""
+        self._check()
+        books = self._index.search_title(query)
+        if self._unchanged():
+            return books
+        current = sorted(self._visible(books), key=itemgetter(0))
+        return self._merge(current, self._removed_where(lambda book: matches(query, book.title)))
+
+    # Имена, под которыми планировщик запросов обращается к индексу
+    get_by_author = find_by_author
+    get_by_year = find_by_year
+    get_by_genre = find_by_genre
+    get_by_year_range = find_by_year_range
+
+    def query(self, author=None, year=None, genre=None, min_year=None, max_year=None):
+        """Составной запрос к снимку, как Library.query"""
+        plan = self.explain(author, year, genre, min_year, max_year)
+        return execute_plan(plan, self, self, author, year, genre, min_year, max_year)
+
+    def explain(self, author=None, year=None, genre=None, min_year=None, max_year=None):
+        """План, по которому query выполнит запрос"""
+        return build_plan(self, len(self), author, year, genre, min_year, max_year)
+
+    def __iter__(self):
+        """Книги снимка в порядке добавления
+
+        Индекс читается частями после последнего выданного номера, поэтому
+        изменения библиотеки во время перебора не мешают и не видны.
+        """
+        self._check()
+        after = 0
+        while True:
+            chunk = self._index.page_all(after, _CHUNK)
+            # Последняя часть: удалённые книги берём до конца снимка
+            upper = chunk[-1][0] if len(chunk) == _CHUNK else self._last_seq
+            upper = min(upper, self._last_seq)
+            # Часть индекса прочитана раньше удалённых: книга, которую удалили между этими
+            # чтениями, есть в обоих, и _merge берёт её один раз - из удалённых
+            removed = self._removed_between(after, upper)
+            current = [(seq, book) for seq, book in chunk if seq <= upper]
+            yield from self._merge(current, removed)
+            if upper >= self._last_seq:
+                return
+            after = upper
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, isbn):
+        return self.find_by_isbn(isbn) is not None
+
+    def __repr__(self):
+        return f"LibrarySnapshot(книг: {self._length}, удалено после снимка: {len(self._removed)})"
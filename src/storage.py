@@ -0,0 +1,215 @@
+"""Сохранение библиотеки на диск: журнал операций и снимки
+
+Каждое добавление и удаление дописывается в журнал (JSON Lines) с номером операции,
+транзакция - одной записью "batch" со всеми своими удалениями и добавлениями.
+Снимок - это все книги на момент операции seq; после записи снимка журнал очищается.
+При запуске загружается снимок, затем из журнала повторяются операции с большими номерами.
+"""
+import json
+import os
+from src.library import Library
+from src.serialization import book_to_record, book_from_record
+
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+LOG_FILE = "operations.log"
+
+
+class OperationLog:
+    """Журнал операций только на дозапись с пакетным fsync
+
+    fsync_every - через сколько записей сбрасывать журнал на диск (None - не вызывать fsync,
+    данные уходят на диск при заполнении буфера и при закрытии).
+    """
+
+    def __init__(self, path, fsync_every=100):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = open(path, "a", encoding="utf-8")
+        self._pending = 0  # Записи после последнего fsync
+
+    def append(self, record):
+        """Дописать операцию в журнал"""
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self.fsync_every is not None and self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """Сбросить накопленные записи на диск"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def truncate(self):
+        """Очистить журнал (после записи снимка)"""
+        self._file.truncate(0)
+        self.sync()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def drop_torn_tail(path):
+        """Обрезать файл после последней полной строки (запись, оборванную при сбое)
+
+        Иначе следующая запись допишется в конец оборванной строки и испортит обе.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+            # Ищем последний перевод строки с конца файла блоками
+            while position > 0:
+                start = max(0, position - 65536)
+                file.seek(start)
+                block = file.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                file.truncate(position)
+                file.flush()
+                os.fsync(file.fileno())
+
+    @staticmethod
+    def read(path):
+        """Прочитать операции журнала; оборванная последняя строка пропускается"""
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    break  # Запись не успела дописаться до сбоя
+                yield json.loads(line)
+
+
+def write_snapshot(path, books, seq):
+    """Атомарно записать снимок: сначала во временный файл, затем переименовать"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(json.dumps({"seq": seq, "count": len(books)}) + "\n")
+        for book in books:
+            file.write(json.dumps(book_to_record(book), ensure_ascii=False) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """Номер последней операции в снимке и генератор книг из него"""
+    if not os.path.exists(path):
+        return 0, iter(())
+    file = open(path, encoding="utf-8")
+    header = json.loads(file.readline())
+
+    def books():
+        with file:
+            for line in file:
+                yield book_from_record(json.loads(line))
+
+    return header["seq"], books()
+
+
+class PersistentLibrary(Library):
+    """Библиотека, которая переживает перезапуск
+
+    directory - папка для снимка и журнала; fsync_every - размер пакета для fsync журнала;
+    snapshot_every - через сколько операций автоматически записывать снимок (None - только вручную).
+    """
+
+    def __init__(self, directory, fsync_every=100, snapshot_every=10000):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, LOG_FILE)
+        OperationLog.drop_torn_tail(self._log_path)
+        self._seq = self._recover()
+        self._since_snapshot = 0
+        self._log = OperationLog(self._log_path, fsync_every)
+
+    def _recover(self):
+        """Восстановить книги из снимка и журнала; возвращает номер последней операции"""
+        seq, books = read_snapshot(self._snapshot_path)
+        Library.add_books(self, books)
+        for record in OperationLog.read(self._log_path):
+            if record["seq"] <= seq:
+                continue  # Операция уже есть в снимке
+            if record["op"] == "add":
+                Library.add_book(self, book_from_record(record["book"]))
+            elif record["op"] == "batch":
+                # Транзакция - одна запись: она либо дописана целиком, либо оборвана и отброшена
+                Library._apply_batch(self, [self.index[isbn] for isbn in record["remove"]],
+                                     [book_from_record(book) for book in record["add"]])
+            else:
+                Library.remove_book(self, self.index[record["isbn"]])
+            seq = record["seq"]
+        return seq
+
+    def _append(self, record):
+        """Записать операцию в журнал под следующим номером"""
+        self._seq += 1
+        record["seq"] = self._seq
+        self._log.append(record)
+        self._since_snapshot += 1
+
+    def _maybe_checkpoint(self):
+        """Сделать снимок, если после предыдущего накопилось snapshot_every операций"""
+        if self.snapshot_every is not None and self._since_snapshot >= self.snapshot_every:
+            self.checkpoint()
+
+    def add_book(self, book):
+        """Добавить книгу и записать операцию в журнал"""
+        super().add_book(book)
+        self._append({"op": "add", "book": book_to_record(book)})
+        self._maybe_checkpoint()
+
+    def add_books(self, books):
+        """Пакетное добавление; в журнал попадают только принятые книги"""
+        result = super().add_books(books)
+        for book in result.added:
+            self._append({"op": "add", "book": book_to_record(book)})
+        # Снимок только после всего пакета, иначе он разойдётся с номерами операций в журнале
+        self._maybe_checkpoint()
+        return result
+
+    def remove_book(self, book):
+        """Удалить книгу и записать операцию в журнал"""
+        super().remove_book(book)
+        self._append({"op": "remove", "isbn": book.isbn})
+        self._maybe_checkpoint()
+
+    def _apply_batch(self, removed, added):
+        """Применить транзакцию и записать её в журнал одной записью
+
+        При сбое посреди записи строка окажется оборванной, и восстановление отбросит
+        транзакцию целиком, а не применит её часть.
+        """
+        super()._apply_batch(removed, added)
+        self._append({"op": "batch", "remove": [book.isbn for book in removed],
+                      "add": [book_to_record(book) for book in added]})
+        self._maybe_checkpoint()
+
+    def checkpoint(self):
+        """Записать снимок всех книг и очистить журнал"""
+        self._log.sync()
+        write_snapshot(self._snapshot_path, self.books, self._seq)
+        self._log.truncate()
+        self._since_snapshot = 0
+
+    def close(self):
+        """Сбросить журнал на диск и закрыть его"""
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,180 @@
+"""Много прогонов симуляции: сетка параметров × набор seed на пуле процессов
+
+Каждый прогон - run_simulation(..., output="silent") в отдельном процессе. Вместо
+текста прогон возвращает RunResult с размером библиотеки, числом событий, попаданиями
+и временем. Результаты собираются в порядке (конфигурация, seed), поэтому всё, кроме
+времени, не зависит от числа процессов.
+
+Запуск:
+    python -m src.sweep [--seeds N] [--workers N] [--steps 1000 5000]
+                        [--events add_book=3,remove_book=1 add_book=1,remove_book=1] [--json PATH]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from src.simulation import run_simulation, parse_weights
+
+
+class RunResult:
+    """Итог одного прогона в виде, удобном для передачи между процессами и в JSON"""
+
+    def __init__(self, config, seed, steps, final_size, events, hits, misses, seconds, latencies):
+        self.config = config  # Имя конфигурации
+        self.seed = seed
+        self.steps = steps
+        self.final_size = final_size  # Книг в библиотеке в конце
+        self.events = events  # Событие -> сколько раз произошло
+        self.hits = hits  # Событие-поиск -> число успешных поисков
+        self.misses = misses
+        self.seconds = seconds
+        self.latencies = latencies  # Событие -> сводка задержек (LatencyRecorder.summary)
+
+    @property
+    def hit_rate(self):
+        """Доля успешных поисков среди всех поисков (None, если поисков не было)"""
+        total = sum(self.hits.values()) + sum(self.misses.values())
+        return sum(self.hits.values()) / total if total else None
+
+    @property
+    def ops_per_second(self):
+        return self.steps / self.seconds if self.seconds else 0.0
+
+    def outcome(self):
+        """Результат без замеров времени - одинаков при любом числе процессов"""
+        return (self.config, self.seed, self.steps, self.final_size, self.events, self.hits, self.misses)
+
+    def to_dict(self):
+        return {"config": self.config, "seed": self.seed, "steps": self.steps, "final_size": self.final_size,
+                "events": self.events, "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "seconds": self.seconds, "ops_per_second": self.ops_per_second, "latencies": self.latencies}
+
+
+def _run_one(task):
+    """Выполнить один прогон в процессе пула"""
+    name, params, seed = task
+    report = run_simulation(seed=seed, output="silent", **params)
+    latencies = {event: recorder.summary() for event, recorder in report.latencies.items()}
+    return RunResult(name, seed, report.steps, report.books,
+                     {event: summary["count"] for event, summary in latencies.items()},
+                     dict(report.hits), dict(report.misses), report.seconds, latencies)
+
+
+def config_name(params):
+    """Имя конфигурации по её параметрам, например "steps=1000 events=add_book=3,remove_book=1" """
+    parts = []
+    for key, value in params.items():
+        if isinstance(value, dict):
+            value = ",".join(f"{name}={weight:g}" for name, weight in value.items())
+        parts.append(f"{key}={value}")
+    return " ".join(parts) or "по умолчанию"
+
+
+def grid(**options):
+    """Все сочетания значений параметров run_simulation: grid(steps=[100, 1000], events=[...])"""
+    configs = [{}]
+    for key, values in options.items():
+        configs = [dict(config, **{key: value}) for config in configs for value in values]
+    return {config_name(config): config for config in configs}
+
+
+class SweepResult:
+    """Все прогоны и сводка по конфигурациям"""
+
+    def __init__(self, runs):
+        self.runs = runs  # RunResult в порядке (конфигурация, seed)
+
+    def by_config(self):
+        """Имя конфигурации -> её прогоны"""
+        groups = {}
+        for run in self.runs:
+            groups.setdefault(run.config, []).append(run)
+        return groups
+
+    def summary(self):
+        """По строке на конфигурацию: число прогонов, размер в конце, события, доля попаданий, скорость"""
+        rows = []
+        for config, runs in self.by_config().items():
+            sizes = [run.final_size for run in runs]
+            rates = [run.hit_rate for run in runs if run.hit_rate is not None]
+            events = {}
+            for run in runs:
+                for event, count in run.events.items():
+                    events[event] = events.get(event, 0) + count
+            rows.append({
+                "config": config,
+                "runs": len(runs),
+                "final_size_mean": statistics.fmean(sizes),
+                "final_size_stdev": statistics.stdev(sizes) if len(sizes) > 1 else 0.0,
+                "final_size_min": min(sizes),
+                "final_size_max": max(sizes),
+                "events_mean": {event: count / len(runs) for event, count in events.items()},
+                "hit_rate_mean": statistics.fmean(rates) if rates else None,
+                "ops_per_second_median": statistics.median(run.ops_per_second for run in runs),
+            })
+        return rows
+
+    def table(self):
+        """Сводка в виде текстовой таблицы"""
+        rows = self.summary()
+        width = max([len("Конфигурация")] + [len(row["config"]) for row in rows]) + 2
+        lines = [f"{'Конфигурация':<{width}}{'прогонов':>9}{'книг ср.':>10}{'σ':>8}{'мин':>7}{'макс':>7}"
+                 f"{'попадания':>11}{'оп/с (мед.)':>13}"]
+        for row in rows:
+            rate = "-" if row["hit_rate_mean"] is None else f"{row['hit_rate_mean']:.1%}"
+            lines.append(f"{row['config']:<{width}}{row['runs']:>9}{row['final_size_mean']:>10.1f}"
+                         f"{row['final_size_stdev']:>8.1f}{row['final_size_min']:>7}{row['final_size_max']:>7}"
+                         f"{rate:>11}{row['ops_per_second_median']:>13,.0f}")
+        return "\n".join(lines)
+
+    def to_json(self):
+        return {"runs": [run.to_dict() for run in self.runs], "summary": self.summary()}
+
+    def __repr__(self):
+        return self.table()
+
+
+def run_sweep(seeds, configs=None, workers=None, context="spawn"):
+    """Прогнать каждую конфигурацию с каждым seed и вернуть SweepResult
+
+    seeds - число (тогда seed от 0 до seeds - 1) или список seed; configs - словарь
+    имя -> параметры run_simulation (steps, events, book_types), по умолчанию одна
+    конфигурация с параметрами по умолчанию; workers - число процессов (1 - без пула).
+    """
+    seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+    configs = {"по умолчанию": {}} if configs is None else configs
+    tasks = [(name, params, seed) for name, params in configs.items() for seed in seeds]
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+    if workers == 1:
+        return SweepResult([_run_one(task) for task in tasks])
+    # Задачи раздаются пачками, чтобы не гонять по одному прогону через pickle
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(context)) as pool:
+        # map отдаёт результаты в порядке задач, как бы ни были распределены прогоны по процессам
+        return SweepResult(list(pool.map(_run_one, tasks, chunksize=chunksize)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Много прогонов симуляции на пуле процессов")
+    parser.add_argument("--seeds", type=int, default=100, help="число seed на конфигурацию")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--steps", type=int, nargs="+", default=[1000])
+    parser.add_argument("--events", type=parse_weights, nargs="+", default=None,
+                        help="наборы весов событий: add_book=3,remove_book=1 ...")
+    parser.add_argument("--types", type=parse_weights, nargs="+", default=None,
+                        help="наборы весов типов книг: printed=2,audio=1 ...")
+    parser.add_argument("--json", default=None, help="сохранить все прогоны и сводку в JSON")
+    args = parser.parse_args()
+
+    options = {"steps": args.steps}
+    if args.events is not None:
+        options["events"] = args.events
+    if args.types is not None:
+        options["book_types"] = args.types
+    result = run_sweep(args.seeds, grid(**options), args.workers)
+    print(result.table())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result.to_json(), file, ensure_ascii=False, indent=2)
@@ -0,0 +1,119 @@
+"""Полнотекстовый индекс по названиям книг
+
+Названия разбиваются на слова, слова приводятся к нижнему регистру (casefold),
+а «ё» заменяется на «е». Для каждого слова хранится словарь ISBN -> книга,
+отсортированный список слов нужен для поиска по префиксу.
+"""
+import re
+from bisect import bisect_left, insort
+
+
+_WORD_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r"(\w+)(\*?)")
+
+
+def normalize(text):
+    """Привести текст к виду, в котором он хранится в индексе"""
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text):
+    """Разбить текст на нормализованные слова"""
+    return _WORD_RE.findall(normalize(text))
+
+
+def _has_prefixes(title, prefixes):
+    """Есть ли в названии слово для каждого из префиксов"""
+    words = tokenize(title)
+    return all(any(word.startswith(prefix) for word in words) for prefix in prefixes)
+
+
+def matches(query, title):
+    """Подходит ли название под запрос так же, как в TitleIndex.search"""
+    terms = _QUERY_RE.findall(normalize(query))
+    if not terms:
+        return False
+    words = tokenize(title)
+    return all(any(word.startswith(term) for word in words) if star else term in words for term, star in terms)
+
+
+class TitleIndex:
+    """Инвертированный индекс слово -> книги"""
+
+    def __init__(self):
+        self._postings = {}  # Слово -> {ISBN: книга}
+        self._words = []  # Все слова индекса по алфавиту
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add(self, book):
+        """Добавить название книги в индекс"""
+        for word in set(tokenize(book.title)):
+            posting = self._postings.get(word)
+            if posting is None:
+                self._postings[word] = {book.isbn: book}
+                insort(self._words, word)
+            else:
+                posting[book.isbn] = book
+
+    def remove(self, book):
+        """Убрать название книги из индекса; слова без книг удаляются"""
+        for word in set(tokenize(book.title)):
+            posting = self._postings[word]
+            del posting[book.isbn]
+            if not posting:
+                del self._postings[word]
+                del self._words[bisect_left(self._words, word)]
+
+    def _prefix_words(self, prefix):
+        """Слова индекса, начинающиеся с prefix"""
+        start = bisect_left(self._words, prefix)
+        # Все слова с этим префиксом меньше, чем префикс с максимальным символом Unicode на конце
+        stop = bisect_left(self._words, prefix + "\U0010ffff", start)
+        return self._words[start:stop]
+
+    def search(self, query):
+        """Книги, в названии которых есть все слова запроса
+
+        Слово со звёздочкой на конце ищется как префикс: "мастер*" найдёт "Мастер" и "Мастера".
+        """
+        terms = _QUERY_RE.findall(normalize(query))
+        if not terms:
+            return []
+
+        # Для каждого слова запроса: (оценка числа книг, слово, списки книг подходящих слов индекса)
+        plans = []
+        for word, star in terms:
+            if star:
+                postings = [self._postings[match] for match in self._prefix_words(word)]
+            else:
+                posting = self._postings.get(word)
+                postings = [] if posting is None else [posting]
+            if not postings:
+                return []
+            plans.append((sum(map(len, postings)), word, star, postings))
+
+        # Кандидатов берём у самого редкого слова, остальные слова проверяем у каждого кандидата
+        plans.sort(key=lambda plan: plan[0])
+        _, _, _, postings = plans[0]
+        if len(postings) == 1:
+            candidates = postings[0]
+        else:
+            candidates = {}
+            for posting in postings:
+                candidates.update(posting)
+
+        exact = [postings[0] for _, _, star, postings in plans[1:] if not star]
+        prefixes = [word for _, word, star, _ in plans[1:] if star]
+        if exact:
+            # Пересечение множеств ISBN считается на C, порядок книг берём у кандидатов
+            isbns = candidates.keys() & exact[0].keys()
+            for posting in exact[1:]:
+                isbns &= posting.keys()
+            books = [book for isbn, book in candidates.items() if isbn in isbns]
+        else:
+            books = list(candidates.values())
+        if prefixes:
+            books = [book for book in books if _has_prefixes(book.title, prefixes)]
+        return books
@@ -0,0 +1,260 @@
+"""Запись и воспроизведение потока операций симуляции
+
+run_simulation(trace=TraceWriter(path)) записывает каждую операцию над библиотекой
+вместе с ожидаемым результатом. Файл - JSON Lines: первая строка - заголовок
+с параметрами симуляции, далее по строке на операцию в виде короткого массива
+[операция, аргумент] или [операция, аргумент, ожидаемый результат]. Книга
+записывается массивом [тип, поля...]; ["remove", null] - удаление из пустой библиотеки,
+которое ничего не изменило. Если имя файла оканчивается на .gz, файл сжимается.
+
+replay(path, library) прогоняет ту же нагрузку на любой библиотеке с методами Library
+(Library, ThreadSafeLibrary, PersistentLibrary, ShardedLibrary): сначала трасса целиком
+читается в память, а ISBN удаляемых книг заменяются книгами из их событий add; затем
+операции выполняются подряд без пауз. Возвращается пропускная способность и
+расхождения с записанными результатами.
+
+Запуск:
+    python -m src.trace record PATH [--steps N] [--seed S] [--events add_book=3,remove_book=1] [--types ...]
+    python -m src.trace replay PATH [--backend library|cached|threadsafe|sharded] [--no-verify]
+"""
+import argparse
+import gzip
+import json
+import time
+from src.concurrency import ThreadSafeLibrary
+from src.errors import DuplicateBookError, EmptyLibraryError
+from src.library import Library
+from src.serialization import BOOK_FIELDS, BOOK_TYPES, book_type_name
+from src.sharding import ShardedLibrary
+from src.simulation import parse_weights, run_simulation
+
+
+TRACE_VERSION = 1
+OPERATIONS = ("add", "remove", "find_isbn", "find_author", "find_genre")
+MAX_MISMATCHES = 20  # Сколько расхождений хранить в отчёте (считаются все)
+BACKENDS = ("library", "cached", "threadsafe", "sharded")
+
+
+def _open(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode_book(book):
+    name = book_type_name(book)
+    return [name] + [getattr(book, field) for field in BOOK_FIELDS[name]]
+
+
+def _decode_book(fields):
+    return BOOK_TYPES[fields[0]](*fields[1:])
+
+
+class TraceWriter:
+    """Запись операций в файл трассы; meta попадает в заголовок"""
+
+    def __init__(self, path, **meta):
+        self.path = path
+        self.count = 0
+        self._file = _open(path, "w")
+        self._file.write(json.dumps({"trace": TRACE_VERSION, **meta}, ensure_ascii=False) + "\n")
+
+    def record(self, op, arg, expected=None):
+        """Записать операцию; для add аргумент - книга, для остальных - ISBN, автор или жанр
+
+        remove с аргументом None - удаление, для которого в библиотеке не нашлось книг.
+        """
+        if op == "add":
+            arg = _encode_book(arg)
+        item = [op, arg] if expected is None else [op, arg, expected]
+        self._file.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_trace(path):
+    """Заголовок трассы и список операций (op, аргумент, ожидаемый результат); книги создаются заранее"""
+    with _open(path, "r") as file:
+        header = json.loads(file.readline())
+        if header.get("trace") != TRACE_VERSION:
+            raise ValueError(f"Файл '{path}' не является трассой версии {TRACE_VERSION}")
+        events = []
+        for line in file:
+            item = json.loads(line)
+            op, arg = item[0], item[1]
+            if op not in OPERATIONS:
+                raise ValueError(f"Неизвестная операция в трассе: '{op}'")
+            if op == "add":
+                arg = _decode_book(arg)
+            events.append((op, arg, item[2] if len(item) > 2 else None))
+    return header, events
+
+
+class ReplayReport:
+    """Итог воспроизведения: скорость, число операций по видам и расхождения с трассой"""
+
+    def __init__(self, ops, seconds, counts, mismatches, mismatch_count):
+        self.ops = ops
+        self.seconds = seconds
+        self.counts = counts  # Операция -> сколько раз выполнена
+        self.mismatches = mismatches  # Первые расхождения: (номер операции, op, аргумент, ожидалось, получено)
+        self.mismatch_count = mismatch_count
+
+    @property
+    def ops_per_second(self):
+        return self.ops / self.seconds if self.seconds else 0.0
+
+    @property
+    def ok(self):
+        """Все результаты совпали с записанными"""
+        return self.mismatch_count == 0
+
+    def __repr__(self):
+        lines = [f"Операций: {self.ops}, {self.seconds:.3f} с ({self.ops_per_second:,.0f} операций/с)",
+                 ", ".join(f"{op}: {count}" for op, count in self.counts.items())]
+        if self.ok:
+            lines.append("Результаты совпадают с трассой")
+        else:
+            lines.append(f"Расхождений с трассой: {self.mismatch_count}")
+            for number, op, arg, expected, actual in self.mismatches:
+                lines.append(f"  #{number} {op}({arg!r}): ожидалось {expected!r}, получено {actual!r}")
+        return "\n".join(lines)
+
+
+def _count_or_none(find, key):
+    """Число найденных книг или None, если поиск сообщил об отсутствии ключа"""
+    try:
+        return len(find(key))
+    except KeyError:
+        return None
+
+
+def replay(trace, library, verify=True):
+    """Выполнить операции трассы на library и вернуть ReplayReport
+
+    trace - путь к файлу или результат read_trace. Без verify результаты не сравниваются,
+    и замер показывает только скорость библиотеки.
+    """
+    _, events = trace if isinstance(trace, tuple) else read_trace(trace)
+
+    # Удаляемая книга находится до замера, по её событию add: в замер, как и в симуляции,
+    # попадает только remove_book, без поиска по ISBN
+    added = {}
+    steps = []
+    for op, arg, expected in events:
+        if op == "add":
+            added[arg.isbn] = arg
+        elif op == "remove" and arg is not None:
+            arg = added.get(arg, arg)
+        steps.append((op, arg, expected))
+
+    # Ошибки add и remove считаются расхождениями, а не прерывают воспроизведение
+    def add(book):
+        try:
+            library.add_book(book)
+        except DuplicateBookError:
+            return "дубликат"
+
+    def remove(book):
+        if book is None:
+            # В симуляции библиотека была пуста и удалять было нечего
+            return None if len(library) == 0 else "не пуста"
+        if isinstance(book, str):
+            # Книга не добавлялась в трассе (например, была в библиотеке заранее): ищем по ISBN
+            book = library.find_by_isbn(book)
+            if book is None:
+                return "нет книги"
+        try:
+            library.remove_book(book)
+        except (ValueError, EmptyLibraryError):
+            return "нет книги"
+
+    def find_isbn(isbn):
+        book = library.find_by_isbn(isbn)
+        return None if book is None else book.isbn
+
+    handlers = {
+        "add": add,
+        "remove": remove,
+        "find_isbn": find_isbn,
+        "find_author": lambda author: _count_or_none(library.find_by_author, author),
+        "find_genre": lambda genre: _count_or_none(library.find_by_genre, genre),
+    }
+    counts = dict.fromkeys(OPERATIONS, 0)
+    mismatches = []
+    mismatch_count = 0
+
+    start = time.perf_counter()
+    if verify:
+        for number, (op, arg, expected) in enumerate(steps, 1):
+            actual = handlers[op](arg)
+            counts[op] += 1
+            if actual != expected:
+                mismatch_count += 1
+                if len(mismatches) < MAX_MISMATCHES:
+                    # В отчёт - аргумент из трассы (для remove - ISBN, а не книга)
+                    mismatches.append((number, op, events[number - 1][1], expected, actual))
+    else:
+        for op, arg, _ in steps:
+            handlers[op](arg)
+            counts[op] += 1
+    seconds = time.perf_counter() - start
+
+    counts = {op: count for op, count in counts.items() if count}
+    return ReplayReport(len(events), seconds, counts, mismatches, mismatch_count)
+
+
+def make_backend(name):
+    """Пустая библиотека для replay по имени: library, cached, threadsafe или sharded"""
+    if name == "library":
+        return Library()
+    if name == "cached":
+        library = Library()
+        library.enable_cache()
+        return library
+    if name == "threadsafe":
+        return ThreadSafeLibrary()
+    if name == "sharded":
+        return ShardedLibrary()
+    raise ValueError(f"Неизвестная библиотека: '{name}'")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Запись и воспроизведение трасс симуляции")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="записать трассу симуляции")
+    record.add_argument("path")
+    record.add_argument("--steps", type=int, default=100_000)
+    record.add_argument("--seed", type=int, default=42)
+    record.add_argument("--events", type=parse_weights, default=None)
+    record.add_argument("--types", type=parse_weights, default=None)
+    play = commands.add_parser("replay", help="воспроизвести трассу")
+    play.add_argument("path")
+    play.add_argument("--backend", choices=BACKENDS, nargs="+", default=["library"])
+    play.add_argument("--no-verify", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        with TraceWriter(args.path, steps=args.steps, seed=args.seed) as writer:
+            run_simulation(args.steps, args.seed, args.events, args.types, output="summary", trace=writer)
+        print(f"Записано операций: {writer.count} -> {args.path}")
+    else:
+        loaded = read_trace(args.path)
+        for name in args.backend:
+            backend = make_backend(name)
+            try:
+                print(f"[{name}]")
+                print(replay(loaded, backend, verify=not args.no_verify))
+            finally:
+                close = getattr(backend, "close", None)
+                if close is not None:
+                    close()
@@ -0,0 +1,76 @@
+"""Транзакции: пакет добавлений и удалений, который применяется целиком или никак
+
+Операции внутри транзакции проверяются сразу (дубликаты, удаление отсутствующей
+книги), но библиотеку не меняют, а копятся в буфере. При выходе из блока with
+буфер применяется ко всем структурам одним пакетом (Library._apply_batch);
+если в блоке возникло исключение, буфер отбрасывается и библиотека остаётся прежней.
+"""
+from src.errors import DuplicateBookError
+
+
+class Transaction:
+    """Буфер изменений библиотеки до фиксации"""
+
+    def __init__(self, library):
+        self._library = library
+        self._added = {}  # ISBN -> книга, добавленная в транзакции
+        self._removed = {}  # ISBN -> книга библиотеки, удалённая в транзакции
+        self._finished = False
+
+    def _check(self):
+        if self._finished:
+            raise RuntimeError("Транзакция уже завершена")
+
+    def find_by_isbn(self, isbn):
+        """Поиск по ISBN с учётом изменений транзакции"""
+        book = self._added.get(isbn)
+        if book is not None or isbn in self._removed:
+            return book
+        return self._library.index[isbn]
+
+    def add(self, book):
+        """Добавить книгу при фиксации"""
+        self._check()
+        if self.find_by_isbn(book.isbn) is not None:
+            raise DuplicateBookError(book.isbn)
+        self._added[book.isbn] = book
+
+    def remove(self, book):
+        """Удалить книгу при фиксации"""
+        self._check()
+        isbn = book.isbn
+        if isbn in self._added:
+            # Книга добавлена в этой же транзакции: операции взаимно уничтожаются
+            del self._added[isbn]
+            return
+        stored = None if isbn in self._removed else self._library.index[isbn]
+        if stored is None:
+            raise ValueError(f"Книга с ISBN '{isbn}' не найдена в коллекции")
+        self._removed[isbn] = stored
+
+    def __len__(self):
+        """Число изменений, которые будут применены"""
+        return len(self._added) + len(self._removed)
+
+    def commit(self):
+        """Применить все изменения одним пакетом"""
+        self._check()
+        self._finished = True
+        if self._added or self._removed:
+            self._library._apply_batch(list(self._removed.values()), list(self._added.values()))
+
+    def rollback(self):
+        """Отбросить изменения"""
+        self._finished = True
+        self._added.clear()
+        self._removed.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
@@ -0,0 +1,141 @@
+"""Префиксное дерево для автодополнения авторов, жанров и дикторов
+
+Ключи нормализуются так же, как в полнотекстовом индексе (регистр, ё/е),
+а в узле хранятся исходные написания значения и число книг с каждым из них:
+«Толстой» и «толстой» попадают в один узел, но подсказываются оба, пока у
+каждого есть книги.
+"""
+from src.textindex import normalize
+
+
+def sort_key(value):
+    """Ключ порядка, в котором complete выдаёт значения"""
+    return normalize(value), value
+
+
+class _Node:
+    __slots__ = ("children", "count", "values")
+
+    def __init__(self):
+        self.children = {}  # Символ -> дочерний узел
+        self.count = 0  # Сколько книг с этим ключом во всех написаниях
+        self.values = {}  # Исходное написание -> число книг с ним
+
+
+class PrefixTrie:
+    """Префиксное дерево значений с подсчётом повторов"""
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self):
+        return self._size  # Число различных написаний
+
+    def __contains__(self, value):
+        node = self._find(normalize(value))
+        return node is not None and node.count > 0
+
+    def _find(self, key):
+        """Узел для нормализованного ключа или None"""
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def add(self, value, count=1):
+        """Учесть ещё count книг со значением value"""
+        node = self._root
+        for char in normalize(value):
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+        if value not in node.values:
+            self._size += 1
+            node.values[value] = 0
+        node.values[value] += count
+        node.count += count
+
+    def remove(self, value, count=1):
+        """Убрать count книг со значением value; узлы без значений удаляются"""
+        key = normalize(value)
+        path = [self._root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                raise KeyError(value)
+            path.append(node)
+        node = path[-1]
+        if node.values.get(value, 0) < count:
+            raise KeyError(value)
+        node.count -= count
+        node.values[value] -= count
+        if node.values[value] == 0:
+            del node.values[value]
+            self._size -= 1
+        if node.count > 0:
+            return
+        # Поднимаемся вверх и удаляем ставшие пустыми узлы
+        for char, parent in zip(reversed(key), reversed(path[:-1])):
+            child = parent.children[char]
+            if child.children or child.count:
+                break
+            del parent.children[char]
+
+    def complete(self, prefix="", limit=None):
+        """Значения, начинающиеся с prefix, по алфавиту (не больше limit)
+
+        Порядок - по sort_key: нормализованный ключ, затем исходное написание.
+        """
+        node = self._find(normalize(prefix))
+        if node is None:
+            return []
+        result = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.count:
+                result.extend(sorted(node.values))
+                if limit is not None and len(result) >= limit:
+                    del result[limit:]
+                    break
+            # Дети в обратном порядке, чтобы со стека они снимались по алфавиту
+            stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+        return result
+
+    def count(self, value):
+        """Сколько книг со значением value"""
+        node = self._find(normalize(value))
+        return 0 if node is None else node.count
+
+    def suggest(self, word, max_distance=2, limit=5, with_distance=False):
+        """Похожие значения для «Возможно, вы имели в виду» (расстояние Левенштейна)
+
+        Обход дерева отсекает ветки, в которых расстояние уже больше max_distance.
+        Значения идут по возрастанию (расстояние, значение); with_distance=True
+        возвращает сами пары, чтобы выдачу нескольких деревьев можно было слить.
+        """
+        key = normalize(word)
+        found = []
+
+        def walk(node, char, previous):
+            row = [previous[0] + 1]
+            for i in range(1, len(key) + 1):
+                cost = 0 if key[i - 1] == char else 1
+                row.append(min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + cost))
+            if node.count and row[-1] <= max_distance:
+                found.extend((row[-1], value) for value in node.values)
+            if min(row) <= max_distance:
+                for next_char, child in node.children.items():
+                    walk(child, next_char, row)
+
+        first_row = list(range(len(key) + 1))
+        for char, child in self._root.children.items():
+            walk(child, char, first_row)
+        found.sort()
+        if with_distance:
+            return found[:limit]
+        return [value for _, value in found[:limit]]
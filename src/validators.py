@@ -0,0 +1,133 @@
+"""Общие правила валидации полей книг
+
+Правила собираются один раз при импорте модуля и используются
+и конструкторами книг, и CLI, чтобы проверки не расходились.
+"""
+import re
+from src.constants import COVER_TYPES
+from src.errors import (
+    NegativeNumberError,
+    NumberTooLargeError,
+    InvalidCoverTypeError,
+    EmptyStringError,
+    ContainsDigitsError,
+    LowercaseStartError,
+    ForbiddenSymbolError,
+    YearOutOfRangeError,
+)
+
+
+# Запрещённые символы (frozenset для проверок в CLI, регулярное выражение для поиска)
+FORBIDDEN_SYMBOLS = frozenset('@#$%^&*=+<>/\\|~`')
+_FORBIDDEN_RE = re.compile("[" + re.escape("".join(sorted(FORBIDDEN_SYMBOLS))) + "]")
+
+MIN_YEAR = 1800
+MAX_YEAR = 2026
+MAX_NUMBER = 10000
+
+
+def has_forbidden(text: str) -> bool:
+    """Проверяет, содержит ли текст запрещённые символы"""
+    return _FORBIDDEN_RE.search(text) is not None
+
+
+def has_digits(text: str) -> bool:
+    """Проверяет, содержит ли текст цифры"""
+    # map(str.isdigit) учитывает те же символы, что и str.isdigit, но без цикла на Python
+    return any(map(str.isdigit, text))
+
+
+class TextRule:
+    """Правило для текстового поля: пустота, цифры, запрещённые символы, первая буква"""
+
+    # Сколько уже проверенных значений запоминать (авторы и жанры повторяются)
+    CACHE_SIZE = 4096
+
+    def __init__(self, field_name, check_digits=False, capital_start=False, digit_start=False):
+        self.field_name = field_name
+        self.check_digits = check_digits
+        self.capital_start = capital_start
+        self.digit_start = digit_start
+        self._accepted = set()
+
+    def __call__(self, value):
+        """Проверить значение; при ошибке выбрасывается исключение из src.errors"""
+        try:
+            if value in self._accepted:
+                return value
+        except TypeError:
+            pass
+
+        if value is None or value.strip() == "":
+            raise EmptyStringError(self.field_name)
+        if self.check_digits and has_digits(value):
+            raise ContainsDigitsError(self.field_name, value)
+        if _FORBIDDEN_RE.search(value) is not None:
+            raise ForbiddenSymbolError(self.field_name, value)
+        if self.capital_start:
+            first_char = value.strip()[0]
+            if not first_char.isupper() and not (self.digit_start and first_char.isdigit()):
+                raise LowercaseStartError(self.field_name, value)
+
+        if len(self._accepted) < self.CACHE_SIZE:
+            self._accepted.add(value)
+        return value
+
+
+class RangeRule:
+    """Правило для числового поля: больше нуля и не больше максимума"""
+
+    def __init__(self, field_name, max_value=MAX_NUMBER):
+        self.field_name = field_name
+        self.max_value = max_value
+
+    def __call__(self, value):
+        if value <= 0:
+            raise NegativeNumberError(self.field_name, value)
+        if value > self.max_value:
+            raise NumberTooLargeError(self.field_name, value, self.max_value)
+        return value
+
+
+class YearRule:
+    """Правило для года издания"""
+
+    def __init__(self, min_year=MIN_YEAR, max_year=MAX_YEAR):
+        self.min_year = min_year
+        self.max_year = max_year
+
+    def __call__(self, value):
+        if value < self.min_year or value > self.max_year:
+            raise YearOutOfRangeError(value, self.min_year, self.max_year)
+        return value
+
+
+class ChoiceRule:
+    """Правило для поля с фиксированным набором значений (тип обложки)"""
+
+    def __init__(self, choices=COVER_TYPES):
+        self.choices = frozenset(choices)
+
+    def __call__(self, value):
+        if value not in self.choices:
+            raise InvalidCoverTypeError(value)
+        return value
+
+
+# Таблица правил по именам полей книг
+FIELD_RULES = {
+    "title": TextRule("название", capital_start=True, digit_start=True),
+    "author": TextRule("автор", check_digits=True, capital_start=True),
+    "year": YearRule(),
+    "genre": TextRule("жанр", check_digits=True),
+    "pages": RangeRule("страницы"),
+    "cover_type": ChoiceRule(),
+    "file_size_mb": RangeRule("размер файла"),
+    "duration_minutes": RangeRule("длительность"),
+    "narrator": TextRule("диктор", check_digits=True, capital_start=True),
+}
+
+
+def validate(field, value):
+    """Проверить значение поля книги по таблице правил"""
+    return FIELD_RULES[field](value)
@@ -47,3 +47,8 @@ class TestAudioBook:
         """Ошибка при дикторе с маленькой буквы"""
         with pytest.raises(LowercaseStartError):
             AudioBook("Название", "Автор", 2000, "Жанр", "ISBN-001", 180, "диктор")
+
+    def test_audiobook_has_no_instance_dict(self):
+        """Дочерний класс тоже не заводит __dict__"""
+        book = AudioBook("Название", "Автор", 2000, "Жанр", "ISBN-001", 180, "Диктор")
+        assert not hasattr(book, "__dict__")
@@ -91,4 +91,11 @@ class TestBook:
         """Строковое представление книги"""
         book = Book("Война и мир", "Толстой", 1869, "Роман", "ISBN-001")
         assert "Война и мир" in repr(book)
-        assert "Толстой" in repr(book)
\ No newline at end of file
+        assert "Толстой" in repr(book)
+
+    def test_book_has_no_instance_dict(self):
+        """Книга хранит поля в __slots__, без __dict__"""
+        book = Book("Название", "Автор", 2000, "Жанр", "ISBN-001")
+        assert not hasattr(book, "__dict__")
+        with pytest.raises(AttributeError):
+            book.publisher = "Издательство"
@@ -86,3 +86,23 @@ class TestBookCollection:
         collection.add(book3)
         result = collection(author="Толстой", genre="Роман")
         assert len(result) == 2
+
+    def test_remove_from_middle_keeps_indexing(self):
+        """После удаления из середины индексы и срезы остаются согласованными"""
+        collection = BookCollection()
+        books = [Book(f"Книга{i}", "Автор", 2000, "Жанр", f"ISBN-{i}") for i in range(5)]
+        for book in books:
+            collection.add(book)
+        collection.remove(books[1])
+        assert len(collection) == 4
+        assert books[1] not in collection
+        assert sorted(b.isbn for b in collection[:]) == ["ISBN-0", "ISBN-2", "ISBN-3", "ISBN-4"]
+        for book in list(collection):
+            collection.remove(book)
+        assert len(collection) == 0
+
+    def test_remove_missing_book_error(self):
+        """Ошибка при удалении книги, которой нет в коллекции"""
+        collection = BookCollection()
+        with pytest.raises(ValueError):
+            collection.remove(Book("Название", "Автор", 2000, "Жанр", "ISBN-001"))
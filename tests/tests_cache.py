@@ -0,0 +1,70 @@
+import pytest
+from src.books import Book
+from src.cache import QueryCache, make_key
+from src.library import Library
+
+
+@pytest.fixture
+def library():
+    library = Library()
+    library.add_book(Book("Война и мир", "Толстой", 1869, "Роман", "ISBN-001"))
+    library.add_book(Book("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-002"))
+    library.add_book(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-003"))
+    library.add_book(Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-004"))
+    library.enable_cache()
+    return library
+
+
+class TestQueryCache:
+    """Тесты для кэша результатов поиска"""
+
+    def test_repeated_query_hits_cache(self, library):
+        """Повторный поиск берётся из кэша и возвращает копию"""
+        first = library.find_by_author("Толстой")
+        first.clear()
+        second = library.find_by_author("Толстой")
+        assert [book.isbn for book in second] == ["ISBN-001", "ISBN-002"]
+        stats = library.stats()["cache"]
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_precise_invalidation(self, library):
+        """Новая книга сбрасывает только запросы, под которые она подходит"""
+        library.find_by_author("Толстой")
+        library.find_by_genre("Повесть")
+        library.query(author="Достоевский", genre="Роман")
+        library.find_by_year_range(1860, 1870)
+        library.add_book(Book("Воскресение", "Толстой", 1899, "Роман", "ISBN-005"))
+        cache = library._cache
+        assert make_key("find", author="Толстой") not in cache._entries
+        assert make_key("find", genre="Повесть") in cache._entries
+        assert make_key("query", "Достоевский", None, "Роман") in cache._entries
+        assert make_key("year_range", min_year=1860, max_year=1870) in cache._entries
+        assert len(library.find_by_author("Толстой")) == 3
+
+    def test_remove_invalidates(self, library):
+        """Удалённая книга пропадает из закэшированных результатов"""
+        assert len(library.query(genre="Роман", min_year=1860)) == 3
+        library.remove_book(library.find_by_isbn("ISBN-003"))
+        assert [book.isbn for book in library.query(genre="Роман", min_year=1860)] == ["ISBN-001", "ISBN-002"]
+        assert library.find_by_year(1836)[0].isbn == "ISBN-004"
+
+    def test_missing_key_still_raises(self, library):
+        """Пустой результат query не подменяет KeyError у find_by_author"""
+        assert library.query(author="Пушкин") == []
+        with pytest.raises(KeyError):
+            library.find_by_author("Пушкин")
+
+    def test_lru_and_item_budget(self):
+        """Вытесняются давно не использованные записи; слишком большие не кэшируются"""
+        cache = QueryCache(max_entries=2, max_items=3)
+        cache.get(make_key("find", author="А"), lambda: [1])
+        cache.get(make_key("find", author="Б"), lambda: [2])
+        cache.get(make_key("find", author="А"), lambda: [1])  # А становится недавней
+        cache.get(make_key("find", author="В"), lambda: [3])
+        assert make_key("find", author="Б") not in cache._entries
+        assert make_key("find", author="А") in cache._entries
+        cache.get(make_key("find", author="Г"), lambda: [1, 2, 3, 4])
+        assert make_key("find", author="Г") not in cache._entries
+        cache.get(make_key("find", author="Д"), lambda: [1, 2, 3])
+        assert list(cache._entries) == [make_key("find", author="Д")]
+        assert cache.stats()["evictions"] == 3
@@ -0,0 +1,69 @@
+import pytest
+from src.books import Book, PrintedBook, EBook, AudioBook
+from src.catalog import write_catalog, MappedCatalog, MappedLibrary
+from src.errors import DuplicateBookError
+
+
+BOOKS = [
+    PrintedBook("Война и мир", "Толстой", 1869, "Роман", "ISBN-001", 1225, "твёрдая"),
+    PrintedBook("1984", "Оруэлл", 1949, "Антиутопия", "ISBN-002", 328, "мягкая"),
+    EBook("Мастер и Маргарита", "Булгаков", 1967, "Роман", "ISBN-003", "EPUB", 2.5),
+    AudioBook("Евгений Онегин", "Пушкин", 1833, "Поэзия", "ISBN-004", 180, "Смоктуновский"),
+    Book("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-000"),
+]
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / "books.cat"
+    write_catalog(path, BOOKS)
+    return path
+
+
+class TestCatalog:
+    """Тесты для двоичного каталога"""
+
+    def test_records_round_trip(self, catalog_path):
+        """Книги всех типов читаются с теми же типами и полями"""
+        with MappedCatalog(catalog_path) as catalog:
+            assert len(catalog) == len(BOOKS)
+            for original, restored in zip(BOOKS, catalog):
+                assert type(restored) is type(original)
+                assert repr(restored) == repr(original)
+            assert catalog[-1].isbn == "ISBN-000"
+            assert [book.isbn for book in catalog[1:3]] == ["ISBN-002", "ISBN-003"]
+
+    def test_int_and_float_numbers_kept(self, catalog_path):
+        """Целые страницы остаются int, а размер файла - float"""
+        with MappedCatalog(catalog_path) as catalog:
+            assert catalog[0].pages == 1225 and isinstance(catalog[0].pages, int)
+            assert catalog[2].file_size_mb == 2.5
+
+    def test_find_by_isbn(self, catalog_path):
+        """Поиск по ISBN через индекс"""
+        with MappedLibrary(catalog_path) as library:
+            assert library.find_by_isbn("ISBN-003").title == "Мастер и Маргарита"
+            assert library.find_by_isbn("ISBN-999") is None
+            assert "ISBN-000" in library
+            assert "ISBN-0" not in library
+
+    def test_find_by_fields(self, catalog_path):
+        """Поиск по автору, жанру и году"""
+        with MappedLibrary(catalog_path) as library:
+            assert [book.isbn for book in library.find_by_author("Толстой")] == ["ISBN-001", "ISBN-000"]
+            assert len(library.find_by_genre("Роман")) == 3
+            assert library.find_by_year(1949)[0].isbn == "ISBN-002"
+            with pytest.raises(KeyError):
+                library.find_by_author("Гоголь")
+
+    def test_duplicate_isbn_error(self, tmp_path):
+        """Ошибка при записи двух книг с одним ISBN"""
+        with pytest.raises(DuplicateBookError):
+            write_catalog(tmp_path / "books.cat", [BOOKS[0], BOOKS[0]])
+
+    def test_not_a_catalog_error(self, tmp_path):
+        """Ошибка при открытии файла другого формата"""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            MappedCatalog(path)
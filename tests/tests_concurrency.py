@@ -0,0 +1,173 @@
+import random
+import sys
+import threading
+import pytest
+from src.books import Book
+from src.concurrency import RWLock, ThreadSafeLibrary
+
+
+AUTHORS = ["Толстой", "Пушкин", "Гоголь", "Чехов"]
+
+
+def make_book(i):
+    return Book(f"Книга{i}", AUTHORS[i % len(AUTHORS)], 1850 + i % 50, "Роман", f"ISBN-{i}")
+
+
+def check_consistent(library):
+    """Список книг и все индексы содержат одни и те же книги"""
+    isbns = {book.isbn for book in library.books}
+    assert isbns == set(library.index)
+    by_author = [book.isbn for author in AUTHORS if author in library.index._by_author
+                 for book in library.index._by_author[author].values()]
+    assert sorted(by_author) == sorted(isbns)
+    assert len(library.find_by_year_range()) == len(isbns)
+
+
+class TestRWLock:
+    """Тесты для блокировки читателей и писателей"""
+
+    def test_readers_share_lock(self):
+        """Два читателя держат блокировку одновременно"""
+        lock = RWLock()
+        inside = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.reading():
+                inside.wait()  # Не дождётся второго, если чтение исключительное
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self):
+        """Читатель ждёт, пока писатель не отпустит блокировку"""
+        lock = RWLock()
+        events = []
+
+        def reader_body():
+            with lock.reading():
+                events.append("read")
+
+        lock.acquire_write()
+        reader = threading.Thread(target=reader_body)
+        reader.start()
+        reader.join(0.1)
+        events.append("write done")
+        lock.release_write()
+        reader.join()
+        assert events == ["write done", "read"]
+
+    def test_reentrant_and_no_upgrade(self):
+        """Вложенное чтение разрешено, повышение чтения до записи - нет"""
+        lock = RWLock()
+        with lock.writing():
+            with lock.reading():
+                with lock.writing():
+                    pass
+        with lock.reading():
+            with lock.reading():
+                pass
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+        with lock.writing():
+            pass
+
+
+class TestThreadSafeLibrary:
+    """Нагрузочный тест потокобезопасной библиотеки"""
+
+    def test_stress_concurrent_add_remove_search(self):
+        """Параллельные добавления, удаления и поиски не нарушают согласованность"""
+        library = ThreadSafeLibrary()
+        library.add_books(make_book(i) for i in range(200))
+        errors = []
+        stop = threading.Event()
+
+        def writer(seed):
+            rng = random.Random(seed)
+            for _ in range(500):
+                i = rng.randrange(400)
+                try:
+                    with library.lock.writing():
+                        book = library.find_by_isbn(f"ISBN-{i}")
+                        if book is None:
+                            library.add_book(make_book(i))
+                        else:
+                            library.remove_book(book)
+                except Exception as error:
+                    errors.append(error)
+
+        def reader(seed):
+            rng = random.Random(seed)
+            while not stop.is_set():
+                author = rng.choice(AUTHORS)
+                try:
+                    with library.lock.reading():
+                        books = library.find_by_author(author) if author in library.index._by_author else []
+                        assert all(book.author == author for book in books)
+                        assert len(library.books) == len(library.index)
+                    library.query(author=author, min_year=1860)
+                    library.page(by="author", value=author, page_size=10)
+                except Exception as error:
+                    errors.append(error)
+
+        writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+        readers = [threading.Thread(target=reader, args=(seed,)) for seed in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        assert errors == []
+        check_consistent(library)
+
+    def test_facets_and_stats_wait_for_writer(self):
+        """facets и stats читают под блокировкой чтения и ждут писателя"""
+        library = ThreadSafeLibrary()
+        library.add_books(make_book(i) for i in range(8))
+        results = []
+        readers = [threading.Thread(target=lambda: results.append(library.facets("author"))),
+                   threading.Thread(target=lambda: results.append(library.stats()["books"]))]
+        with library.lock.writing():
+            for thread in readers:
+                thread.start()
+            for thread in readers:
+                thread.join(0.1)
+            waited = results == []
+            library.remove_book(library.find_by_isbn("ISBN-0"))
+        for thread in readers:
+            thread.join()
+        assert waited
+        assert {"Толстой": 1, "Пушкин": 2, "Гоголь": 2, "Чехов": 2} in results
+        assert 7 in results
+
+    def test_metrics_from_many_threads(self):
+        """Счётчики статистики не теряют вызовы параллельных поисков"""
+        library = ThreadSafeLibrary()
+        library.add_books(make_book(i) for i in range(100))
+        library.enable_metrics()
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            def reader(seed):
+                rng = random.Random(seed)
+                for _ in range(2000):
+                    library.find_by_isbn(f"ISBN-{rng.randrange(200)}")
+
+            threads = [threading.Thread(target=reader, args=(seed,)) for seed in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        stats = library.stats()["operations"]["find_by_isbn"]
+        assert stats["calls"] == 16000
+        assert stats["hits"] + stats["misses"] == 16000
+        assert stats["latency"]["count"] == 16000
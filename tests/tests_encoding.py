@@ -0,0 +1,44 @@
+from src.books import Book, AudioBook
+from src.encoding import intern_value
+from src.library import Library
+
+
+def fresh(text):
+    """Новый объект строки с тем же значением"""
+    return (text + " ")[:-1]
+
+
+class TestInternValue:
+    """Тесты для общих экземпляров значений"""
+
+    def test_returns_shared_instance(self):
+        """Равные строки заменяются одним общим экземпляром"""
+        first = intern_value(fresh("Толстой"))
+        assert intern_value(fresh("Толстой")) is first
+
+    def test_released_with_last_reference(self):
+        """Значение не остаётся в памяти после того, как на него не осталось ссылок"""
+        text = fresh("Неповторимый Автор")
+        shared = intern_value(fresh(text))
+        assert intern_value(text) is shared
+        del shared
+        # Прежний общий экземпляр освобождён, и общим становится новый объект
+        assert intern_value(text) is text
+
+class TestInternedBooks:
+    """Книги хранят общие экземпляры автора, жанра и диктора"""
+
+    def test_books_share_field_values(self):
+        """У двух книг с одинаковыми полями - одни и те же объекты строк"""
+        first = AudioBook("Онегин", fresh("Пушкин"), 1833, fresh("Поэзия"), "ISBN-1", 180, fresh("Смоктуновский"))
+        second = AudioBook("Онегин", fresh("Пушкин"), 1833, fresh("Поэзия"), "ISBN-2", 180, fresh("Смоктуновский"))
+        assert first.author is second.author
+        assert first.genre is second.genre
+        assert first.narrator is second.narrator
+
+    def test_public_api_uses_plain_strings(self):
+        """Поиск принимает обычные строки и возвращает их же значения"""
+        library = Library()
+        library.add_book(Book("Нос", fresh("Гоголь"), 1836, fresh("Повесть"), "ISBN-1"))
+        assert library.find_by_author(fresh("Гоголь"))[0].author == "Гоголь"
+        assert library.facets("genre") == {"Повесть": 1}
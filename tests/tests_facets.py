@@ -0,0 +1,69 @@
+import pytest
+from src.books import Book, PrintedBook, EBook, AudioBook
+from src.library import Library
+
+
+def make_library():
+    library = Library()
+    library.add_books([
+        PrintedBook("Война и мир", "Толстой", 1869, "Роман", "ISBN-001", 1225, "твёрдая"),
+        PrintedBook("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-002", 864, "мягкая"),
+        EBook("Мастер и Маргарита", "Булгаков", 1967, "Роман", "ISBN-003", "EPUB", 2.5),
+        AudioBook("Евгений Онегин", "Пушкин", 1833, "Поэзия", "ISBN-004", 180, "Смоктуновский"),
+    ])
+    library.add_book(Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-005"))
+    return library
+
+
+class TestFacets:
+    """Тесты для счётчиков по значениям полей и типам"""
+
+    def test_field_counts(self):
+        """Число книг по автору, жанру и году"""
+        library = make_library()
+        assert library.facets("author") == {"Толстой": 2, "Булгаков": 1, "Пушкин": 1, "Гоголь": 1}
+        assert library.facets("genre")["Роман"] == 3
+        assert list(library.facets("year")) == [1833, 1836, 1869, 1877, 1967]
+
+    def test_type_counts_and_totals(self):
+        """Число книг и суммы страниц, мегабайт и минут по типам"""
+        summary = make_library().facets()
+        assert summary["type"] == {"printed": 2, "ebook": 1, "audio": 1, "book": 1}
+        assert summary["totals"] == {"printed": 2089, "ebook": 2.5, "audio": 180}
+        assert make_library().type_totals() == summary["totals"]
+
+    def test_counts_follow_removals(self):
+        """Удаление уменьшает счётчики, пустые значения пропадают"""
+        library = make_library()
+        library.remove_book(library.find_by_isbn("ISBN-001"))
+        library.remove_book(library.find_by_isbn("ISBN-003"))
+        summary = library.facets()
+        assert summary["author"]["Толстой"] == 1
+        assert "Булгаков" not in summary["author"]
+        assert summary["type"] == {"printed": 1, "audio": 1, "book": 1}
+        assert summary["totals"] == {"printed": 864, "audio": 180}
+
+    def test_subclass_counts_as_known_type(self):
+        """Подкласс известного типа учитывается как его ближайший известный предок"""
+        class Comic(PrintedBook):
+            __slots__ = ()
+
+        library = make_library()
+        library.add_book(Comic("Комикс", "Гоголь", 1990, "Повесть", "ISBN-006", 40, "мягкая"))
+        library.add_books([Comic("Комикс 2", "Гоголь", 1991, "Повесть", "ISBN-007", 60, "мягкая")])
+        assert library.facets("type")["printed"] == 4
+        assert library.type_totals()["printed"] == 2189
+
+    def test_unknown_type_leaves_library_unchanged(self):
+        """Объект неизвестного типа отклоняется до изменения списка книг и индексов"""
+        class Stranger:
+            isbn, author, year, genre, title = "ISBN-404", "Гоголь", 1800, "Повесть", "Чужой"
+
+        library = make_library()
+        with pytest.raises(TypeError):
+            library.add_book(Stranger())
+        with pytest.raises(TypeError):
+            library.add_books([Book("Шинель", "Гоголь", 1842, "Повесть", "ISBN-006"), Stranger()])
+        assert len(library) == 5
+        assert "ISBN-404" not in library and "ISBN-006" not in library
+        assert library.facets("author")["Гоголь"] == 1
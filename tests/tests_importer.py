@@ -0,0 +1,97 @@
+import json
+from src.books import PrintedBook, EBook, AudioBook
+from src.importer import import_books
+from src.library import Library
+
+
+CSV_TEXT = """type,title,author,year,genre,isbn,pages,cover_type,file_format,file_size_mb,duration_minutes,narrator
+printed,Война и мир,Толстой,1869,Роман,ISBN-001,1225,твёрдая,,,,
+ebook,Мастер и Маргарита,Булгаков,1967,Роман,ISBN-002,,,EPUB,2.5,,
+audio,Евгений Онегин,Пушкин,1833,Поэзия,ISBN-003,,,,,180,Смоктуновский
+printed,Идиот,Достоевский,тысяча,Роман,ISBN-004,640,мягкая,,,,
+printed,Бесы,достоевский,1872,Роман,ISBN-005,768,мягкая,,,,
+printed,Дубликат,Толстой,1869,Роман,ISBN-001,100,мягкая,,,,
+"""
+
+
+class TestImporter:
+    """Тесты для потокового импорта книг"""
+
+    def test_import_csv(self, tmp_path):
+        """Импорт CSV с книгами всех типов и ошибочными строками"""
+        path = tmp_path / "books.csv"
+        path.write_text(CSV_TEXT, encoding="utf-8")
+        rejects = tmp_path / "rejects.jsonl"
+        library = Library()
+
+        report = import_books(library, path, rejects, batch_size=2)
+
+        assert (report.rows, report.added, report.rejected) == (6, 3, 3)
+        assert isinstance(library.find_by_isbn("ISBN-001"), PrintedBook)
+        assert isinstance(library.find_by_isbn("ISBN-002"), EBook)
+        audio = library.find_by_isbn("ISBN-003")
+        assert isinstance(audio, AudioBook) and audio.duration_minutes == 180
+
+        rows = [json.loads(line) for line in rejects.read_text(encoding="utf-8").splitlines()]
+        assert [(row["line"], row["error"]) for row in rows] == [
+            (5, "ValueError"), (6, "LowercaseStartError"), (7, "DuplicateBookError"),
+        ]
+        assert rows[2]["record"]["title"] == "Дубликат"
+
+    def test_import_jsonl(self, tmp_path):
+        """Импорт JSON Lines: битая строка и неизвестный тип не прерывают импорт"""
+        path = tmp_path / "books.jsonl"
+        lines = [
+            json.dumps({"type": "book", "title": "Книга", "author": "Автор", "year": 2000,
+                        "genre": "Жанр", "isbn": "ISBN-001"}, ensure_ascii=False),
+            "{не json",
+            "",
+            json.dumps({"type": "comics", "title": "Комикс", "author": "Автор", "year": 2000,
+                        "genre": "Жанр", "isbn": "ISBN-002"}, ensure_ascii=False),
+            json.dumps({"title": "Без типа", "author": "Автор", "year": 2001,
+                        "genre": "Жанр", "isbn": "ISBN-003"}, ensure_ascii=False),
+        ]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        library = Library()
+
+        report = import_books(library, path)
+
+        assert (report.rows, report.added, report.rejected) == (4, 2, 2)
+        assert sorted(library.index) == ["ISBN-001", "ISBN-003"]
+        assert report.rows_per_second > 0
+
+    def test_jsonl_rows_that_are_not_objects_are_rejected(self, tmp_path):
+        """Строки-массивы, строки и числа попадают в отказы, импорт продолжается"""
+        path = tmp_path / "books.jsonl"
+        book = json.dumps({"type": "book", "title": "Книга", "author": "Автор", "year": 2000,
+                           "genre": "Жанр", "isbn": "ISBN-001"}, ensure_ascii=False)
+        path.write_text("\n".join(["[1, 2]", '"x"', "42", book]) + "\n", encoding="utf-8")
+        rejects = tmp_path / "rejects.jsonl"
+        library = Library()
+
+        report = import_books(library, path, rejects)
+
+        assert (report.rows, report.added, report.rejected) == (4, 1, 3)
+        rows = [json.loads(line) for line in rejects.read_text(encoding="utf-8").splitlines()]
+        assert [(row["line"], row["record"]) for row in rows] == [(1, [1, 2]), (2, "x"), (3, 42)]
+        assert all("объектом JSON" in row["message"] for row in rows)
+
+    def test_csv_and_jsonl_give_same_numbers(self, tmp_path):
+        """Одна и та же книга из CSV и из JSON Lines получает одинаковые числовые поля"""
+        csv_path = tmp_path / "books.csv"
+        csv_path.write_text("type,title,author,year,genre,isbn,file_format,file_size_mb\n"
+                            "ebook,Нос,Гоголь,1836,Повесть,ISBN-001,PDF,5\n"
+                            "ebook,Шинель,Гоголь,1842,Повесть,ISBN-002,PDF,2.5\n", encoding="utf-8")
+        jsonl_path = tmp_path / "books.jsonl"
+        jsonl_path.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in [
+            {"type": "ebook", "title": "Нос", "author": "Гоголь", "year": 1836, "genre": "Повесть",
+             "isbn": "ISBN-001", "file_format": "PDF", "file_size_mb": 5},
+            {"type": "ebook", "title": "Шинель", "author": "Гоголь", "year": 1842, "genre": "Повесть",
+             "isbn": "ISBN-002", "file_format": "PDF", "file_size_mb": 2.5},
+        ]) + "\n", encoding="utf-8")
+        from_csv, from_jsonl = Library(), Library()
+        import_books(from_csv, csv_path)
+        import_books(from_jsonl, jsonl_path)
+        for isbn in ("ISBN-001", "ISBN-002"):
+            left, right = from_csv.find_by_isbn(isbn).file_size_mb, from_jsonl.find_by_isbn(isbn).file_size_mb
+            assert (type(left), left) == (type(right), right)
@@ -104,3 +104,83 @@ class TestIndexDict:
         book = Book("Название", "Автор", 2000, "Жанр", "ISBN-001")
         with pytest.raises(KeyError):
             index.remove_book(book)
+
+    def test_add_books_extends_existing_lists(self):
+        """Пакетное добавление дополняет уже существующие индексы"""
+        index = IndexDict()
+        index.add_book(Book("Книга1", "Толстой", 2000, "Роман", "ISBN-001"))
+        index.add_books([
+            Book("Книга2", "Толстой", 2000, "Повесть", "ISBN-002"),
+            Book("Книга3", "Пушкин", 2001, "Роман", "ISBN-003"),
+        ])
+        assert len(index) == 3
+        assert len(index.get_by_author("Толстой")) == 2
+        assert len(index.get_by_genre("Роман")) == 2
+        assert len(index.get_by_year(2001)) == 1
+
+    def test_add_books_from_generator(self):
+        """Пакетное добавление из генератора обновляет и деревья автодополнения"""
+        index = IndexDict()
+        book = Book("Книга1", "Толстой", 2000, "Роман", "ISBN-001")
+        index.add_books(item for item in [book])
+        assert index.complete("author") == ["Толстой"]
+        assert index.complete("genre") == ["Роман"]
+        index.remove_book(book)
+        assert len(index) == 0
+        assert index.complete("author") == []
+
+    def test_remove_book_keeps_other_books(self):
+        """Удаление одной книги не трогает остальные в тех же индексах"""
+        index = IndexDict()
+        book1 = Book("Книга1", "Толстой", 2000, "Роман", "ISBN-001")
+        book2 = Book("Книга2", "Толстой", 2000, "Роман", "ISBN-002")
+        index.add_book(book1)
+        index.add_book(book2)
+        index.remove_book(book1)
+        assert index.get_by_author("Толстой") == [book2]
+        assert index.get_by_year(2000) == [book2]
+        assert index.get_by_genre("Роман") == [book2]
+
+    def test_remove_last_book_drops_key(self):
+        """После удаления последней книги автора поиск по нему даёт KeyError"""
+        index = IndexDict()
+        book = Book("Название", "Автор", 2000, "Жанр", "ISBN-001")
+        index.add_book(book)
+        index.remove_book(book)
+        with pytest.raises(KeyError):
+            index.get_by_author("Автор")
+
+    def test_get_by_author_returns_copy(self):
+        """Изменение результата поиска не портит индекс"""
+        index = IndexDict()
+        index.add_book(Book("Название", "Автор", 2000, "Жанр", "ISBN-001"))
+        index.get_by_author("Автор").clear()
+        assert len(index.get_by_author("Автор")) == 1
+
+    def test_get_by_year_range(self):
+        """Поиск по диапазону лет возвращает книги по возрастанию года"""
+        index = IndexDict()
+        index.add_book(Book("Книга1", "Автор", 1950, "Жанр", "ISBN-001"))
+        index.add_books([
+            Book("Книга2", "Автор", 1900, "Жанр", "ISBN-002"),
+            Book("Книга3", "Автор", 2000, "Жанр", "ISBN-003"),
+            Book("Книга4", "Автор", 1925, "Жанр", "ISBN-004"),
+        ])
+        result = index.get_by_year_range(1900, 1950)
+        assert [book.year for book in result] == [1900, 1925, 1950]
+        assert index.count_by_year_range(1901, None) == 3
+        assert index.get_by_year_range(1800, 1850) == []
+
+    def test_year_range_follows_removal(self):
+        """Минимум и максимум года обновляются при удалении книг"""
+        index = IndexDict()
+        old = Book("Книга1", "Автор", 1900, "Жанр", "ISBN-001")
+        new = Book("Книга2", "Автор", 2000, "Жанр", "ISBN-002")
+        index.add_book(old)
+        index.add_book(new)
+        assert (index.min_year(), index.max_year()) == (1900, 2000)
+        index.remove_book(old)
+        assert index.min_year() == 2000
+        index.remove_book(new)
+        with pytest.raises(KeyError):
+            index.max_year()
@@ -115,3 +115,45 @@ class TestLibrary:
         library.add_book(audio)
 
         assert len(library) == 4
+
+    def test_add_books_bulk(self):
+        """Пакетное добавление книг"""
+        library = Library()
+        books = [Book(f"Книга {i}", "Автор", 2000 + i, "Жанр", f"ISBN-{i}") for i in range(3)]
+        result = library.add_books(books)
+        assert len(library) == 3
+        assert result.added == books
+        assert result.rejected == []
+        assert len(library.find_by_author("Автор")) == 3
+        assert len(library.find_by_year(2001)) == 1
+
+    def test_add_books_reports_duplicates(self):
+        """Дубликаты в пакете и в библиотеке не прерывают загрузку"""
+        library = Library()
+        library.add_book(Book("Книга", "Автор", 2000, "Жанр", "ISBN-001"))
+        books = [
+            Book("Первая", "Автор", 2000, "Жанр", "ISBN-001"),
+            Book("Вторая", "Автор", 2000, "Жанр", "ISBN-002"),
+            Book("Третья", "Автор", 2000, "Жанр", "ISBN-002"),
+            Book("Четвёртая", "Автор", 2000, "Жанр", "ISBN-003"),
+        ]
+        result = library.add_books(books)
+        assert len(result) == 4
+        assert [error is None for _, error in result] == [False, True, False, True]
+        assert all(isinstance(error, DuplicateBookError) for _, error in result.rejected)
+        assert len(library) == 3
+        assert library.find_by_isbn("ISBN-002").title == "Вторая"
+
+    def test_find_by_year_range(self):
+        """Поиск по диапазону лет и границы годов"""
+        library = Library()
+        for i, year in enumerate([1869, 1910, 1949, 1967]):
+            library.add_book(Book("Название", "Автор", year, "Жанр", f"ISBN-{i}"))
+        assert len(library.find_by_year_range(1900, 1950)) == 2
+        assert library.count_by_year_range(min_year=1949) == 2
+        assert (library.min_year(), library.max_year()) == (1869, 1967)
+
+    def test_min_year_empty_library_error(self):
+        """Ошибка при запросе границ года у пустой библиотеки"""
+        with pytest.raises(EmptyLibraryError):
+            Library().min_year()
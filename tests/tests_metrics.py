@@ -0,0 +1,81 @@
+import json
+import pytest
+from src.books import Book
+from src.errors import DuplicateBookError
+from src.library import Library
+from src.metrics import LatencyHistogram
+
+
+@pytest.fixture
+def library():
+    library = Library()
+    library.add_book(Book("Война и мир", "Толстой", 1869, "Роман", "ISBN-001"))
+    library.add_book(Book("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-002"))
+    library.add_book(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-003"))
+    return library
+
+
+class TestLatencyHistogram:
+    """Тесты для гистограммы задержек"""
+
+    def test_percentiles_are_close(self):
+        """Процентили отличаются от точных не больше чем на 1/8"""
+        histogram = LatencyHistogram()
+        for ns in range(1, 100001):
+            histogram.record(ns)
+        assert histogram.percentile(50) == pytest.approx(50000, rel=1 / 8)
+        assert histogram.percentile(99) == pytest.approx(99000, rel=1 / 8)
+        assert histogram.summary()["max_us"] == 100.0
+
+
+class TestLibraryMetrics:
+    """Тесты для статистики операций Library"""
+
+    def test_disabled_by_default(self, library):
+        """Без enable_metrics методы не подменяются, операций в статистике нет"""
+        assert "find_by_author" not in vars(library)
+        library.find_by_author("Толстой")
+        assert library.stats()["operations"] == {}
+
+    def test_hits_misses_errors(self, library):
+        """Поиски считают найдено/не найдено, исключения пробрасываются и учитываются"""
+        library.enable_metrics()
+        library.find_by_author("Толстой")
+        with pytest.raises(KeyError):
+            library.find_by_author("Пушкин")
+        library.find_by_isbn("ISBN-404")
+        with pytest.raises(DuplicateBookError):
+            library.add_book(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-003"))
+
+        operations = library.stats()["operations"]
+        assert operations["find_by_author"]["calls"] == 2
+        assert operations["find_by_author"]["hits"] == 1
+        assert operations["find_by_author"]["misses"] == 1
+        assert operations["find_by_isbn"]["misses"] == 1
+        assert operations["add_book"]["errors"] == 1
+        assert operations["find_by_author"]["latency"]["count"] == 2
+
+    def test_disable_restores_methods(self, library):
+        """disable_metrics возвращает исходные методы"""
+        library.enable_metrics()
+        library.disable_metrics()
+        assert "find_by_author" not in vars(library)
+        assert library.stats()["operations"] == {}
+
+    def test_largest_postings(self, library):
+        """В статистике индексов есть самые длинные списки книг"""
+        index = library.stats(top=1)["index"]
+        assert index["author"] == {"keys": 2, "largest": [("Толстой", 2)]}
+        assert index["genre"]["largest"] == [("Роман", 3)]
+        assert index["year"]["keys"] == 2
+
+    def test_periodic_dump(self, library, tmp_path):
+        """Снимки статистики дописываются в файл, последний - при остановке"""
+        library.enable_metrics()
+        path = tmp_path / "stats.jsonl"
+        dumper = library.start_metrics_dump(60, path=str(path))
+        library.find_by_genre("Роман")
+        dumper.stop()
+        snapshots = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert snapshots[-1]["operations"]["find_by_genre"]["hits"] == 1
+        assert snapshots[-1]["books"] == 3
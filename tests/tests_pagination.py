@@ -0,0 +1,95 @@
+import pytest
+from src.books import Book
+from src.library import Library
+from src.pagination import SeqOrder
+
+
+@pytest.fixture
+def library():
+    """Библиотека из 10 книг: чётные - Толстого, нечётные - Пушкина, годы 1850-1854"""
+    library = Library()
+    for i in range(10):
+        author = "Толстой" if i % 2 == 0 else "Пушкин"
+        library.add_book(Book(f"Книга{i}", author, 1850 + i % 5, "Роман", f"ISBN-{i}"))
+    return library
+
+
+def collect(library, **kwargs):
+    """ISBN всех книг выборки, собранные по страницам"""
+    return [book.isbn for page in library.iter_pages(**kwargs) for book in page]
+
+
+class TestPagination:
+    """Тесты для постраничной выдачи Library.page"""
+
+    def test_pages_cover_all_books(self, library):
+        """Страницы по порядку содержат все книги ровно один раз"""
+        first = library.page(page_size=4)
+        assert [book.isbn for book in first] == ["ISBN-0", "ISBN-1", "ISBN-2", "ISBN-3"]
+        assert first.next_cursor is not None
+        assert collect(library, page_size=4) == [f"ISBN-{i}" for i in range(10)]
+
+    def test_last_page_has_no_cursor(self, library):
+        """У последней страницы нет курсора, даже если она заполнена полностью"""
+        page = library.page(page_size=5)
+        page = library.page(page_size=5, cursor=page.next_cursor)
+        assert len(page) == 5
+        assert page.next_cursor is None
+
+    def test_page_by_author_and_year(self, library):
+        """Постраничный поиск по автору и году совпадает с find_by_*"""
+        assert collect(library, by="author", value="Толстой", page_size=2) == \
+            [book.isbn for book in library.find_by_author("Толстой")]
+        assert collect(library, by="year", value=1851, page_size=1) == ["ISBN-1", "ISBN-6"]
+        assert library.page(by="genre", value="Поэзия").books == []
+
+    def test_page_by_year_range(self, library):
+        """Диапазон лет выдаётся по возрастанию года с курсором внутри года"""
+        result = collect(library, by="year_range", value=(1851, 1853), page_size=3)
+        assert result == [book.isbn for book in library.find_by_year_range(1851, 1853)]
+        assert len(result) == 6
+
+    def test_cursor_stable_under_changes(self, library):
+        """Добавления и удаления между страницами не дают повторов и пропусков"""
+        page = library.page(page_size=4)
+        library.remove_book(library.find_by_isbn("ISBN-1"))  # уже выдана
+        library.remove_book(library.find_by_isbn("ISBN-5"))  # ещё не выдана
+        library.add_book(Book("Новая", "Гоголь", 1860, "Роман", "ISBN-NEW"))
+        rest = []
+        while page.next_cursor is not None:
+            page = library.page(page_size=4, cursor=page.next_cursor)
+            rest.extend(book.isbn for book in page)
+        assert rest == ["ISBN-4", "ISBN-6", "ISBN-7", "ISBN-8", "ISBN-9", "ISBN-NEW"]
+
+    def test_invalid_arguments(self, library):
+        """Неверный способ выборки, размер страницы или курсор дают ValueError"""
+        with pytest.raises(ValueError):
+            library.page(by="title", value="Книга")
+        with pytest.raises(ValueError):
+            library.page(page_size=0)
+        with pytest.raises(ValueError):
+            library.page(by="year_range", value=(None, None), cursor="5")
+
+    def test_seq_order_compaction(self):
+        """После уплотнения SeqOrder продолжает выдачу с того же номера"""
+        order = SeqOrder()
+        for seq in range(1, 11):
+            order.append(seq, f"книга{seq}")
+        for seq in range(1, 8):
+            order.remove(seq)
+        assert order.after(0, 10) == [(8, "книга8"), (9, "книга9"), (10, "книга10")]
+        assert order.after(8, 1) == [(9, "книга9")]
+
+    def test_page_by_key_after_removals(self):
+        """Страницы автора верны после удалений, уплотнения порядка и удаления последней книги автора"""
+        library = Library()
+        library.add_books([Book(f"Книга {i}", "Толстой" if i % 2 else "Гоголь", 1900, "Роман", f"ISBN-{i:03d}")
+                           for i in range(100)])
+        for i in range(1, 80, 2):
+            library.remove_book(library.find_by_isbn(f"ISBN-{i:03d}"))
+        pages = list(library.iter_pages("author", "Толстой", page_size=3))
+        assert [book.isbn for page in pages for book in page] == [f"ISBN-{i:03d}" for i in range(81, 100, 2)]
+        for i in range(81, 100, 2):
+            library.remove_book(library.find_by_isbn(f"ISBN-{i:03d}"))
+        assert "Толстой" not in library.index._key_orders["author"]
+        assert library.page("author", "Толстой").books == []
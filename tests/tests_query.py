@@ -0,0 +1,56 @@
+import pytest
+from src.books import Book
+from src.library import Library
+from src.bookcollection import BookCollection
+
+
+@pytest.fixture
+def library():
+    """Библиотека, где у Толстого много книг, а романов 1869 года - одна"""
+    library = Library()
+    for i in range(5):
+        library.add_book(Book(f"Книга{i}", "Толстой", 1850 + i, "Повесть", f"ISBN-T{i}"))
+    library.add_book(Book("Война и мир", "Толстой", 1869, "Роман", "ISBN-001"))
+    library.add_book(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-002"))
+    library.add_book(Book("Бесы", "Достоевский", 1872, "Роман", "ISBN-003"))
+    return library
+
+
+class TestQuery:
+    """Тесты для составных запросов Library.query"""
+
+    def test_query_uses_most_selective_index(self, library):
+        """Ведущим выбирается индекс с наименьшим числом книг"""
+        plan = library.explain(author="Толстой", genre="Роман")
+        assert plan.index == "genre"
+        assert plan.estimated == 3
+        assert plan.filters == ["author"]
+        assert [book.isbn for book in library.query(author="Толстой", genre="Роман")] == ["ISBN-001"]
+
+    def test_query_with_year_range(self, library):
+        """Диапазон лет тоже может быть ведущим индексом"""
+        plan = library.explain(author="Толстой", min_year=1869, max_year=1900)
+        assert plan.index == "year_range"
+        result = library.query(author="Толстой", min_year=1869, max_year=1900)
+        assert [book.isbn for book in result] == ["ISBN-001"]
+
+    def test_query_missing_key_is_empty(self, library):
+        """Неизвестное значение даёт пустой результат без просмотра"""
+        assert library.explain(author="Пушкин", genre="Роман").index == "empty"
+        assert library.query(author="Пушкин", genre="Роман") == []
+
+    def test_query_without_criteria_scans(self, library):
+        """Без условий выполняется полный просмотр"""
+        assert library.explain().index == "scan"
+        assert len(library.query()) == len(library)
+
+    def test_query_matches_collection_filter(self, library):
+        """Результат совпадает с фильтрацией коллекции"""
+        expected = {book.isbn for book in library.books(year=1869, genre="Роман")}
+        assert {book.isbn for book in library.query(year=1869, genre="Роман")} == expected
+
+    def test_collection_filter_does_not_skip_falsy_values(self):
+        """Пустая строка - это условие, а не его отсутствие"""
+        collection = BookCollection()
+        collection.add(Book("Название", "Автор", 2000, "Жанр", "ISBN-001"))
+        assert collection(genre="") == []
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import pytest
+from src.books import PrintedBook, AudioBook
+from src.client import LibraryClient, ServerError
+from src.library import Library
+from src.server import MAX_LINE, LibraryServer
+
+
+def make_library():
+    library = Library()
+    library.add_book(PrintedBook("Война и мир", "Толстой", 1869, "Роман", "ISBN-001", 1225, "твёрдая"))
+    library.add_book(AudioBook("Евгений Онегин", "Пушкин", 1833, "Поэзия", "ISBN-004", 180, "Смоктуновский"))
+    return library
+
+
+def run_with_server(scenario):
+    """Запустить сервер на свободном порту и выполнить scenario(server)"""
+    async def main():
+        async with LibraryServer(make_library(), port=0) as server:
+            return await scenario(server)
+    return asyncio.run(main())
+
+
+class TestLibraryServer:
+    """Тесты для асинхронного сервера и клиента"""
+
+    def test_client_operations(self):
+        """Добавление, поиск и удаление через клиента"""
+        async def scenario(server):
+            async with await LibraryClient.connect(port=server.port) as client:
+                await client.add_book(PrintedBook("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-005", 864, "мягкая"))
+                by_author = await client.find_by_author("Толстой")
+                audio = await client.find_by_isbn("ISBN-004")
+                await client.remove_book("ISBN-001")
+                return [book.isbn for book in by_author], audio, await client.count()
+
+        isbns, audio, count = run_with_server(scenario)
+        assert isbns == ["ISBN-001", "ISBN-005"]
+        assert isinstance(audio, AudioBook) and audio.narrator == "Смоктуновский"
+        assert count == 2
+
+    def test_errors_are_returned(self):
+        """Ошибки операций приходят клиенту, соединение остаётся рабочим"""
+        async def scenario(server):
+            async with await LibraryClient.connect(port=server.port) as client:
+                with pytest.raises(ServerError) as missing:
+                    await client.find_by_genre("Фантастика")
+                with pytest.raises(ServerError) as duplicate:
+                    await client.add_book(PrintedBook("Война и мир", "Толстой", 1869, "Роман", "ISBN-001", 1, "мягкая"))
+                with pytest.raises(ServerError) as unknown:
+                    await client.request("drop_all")
+                return missing.value.kind, duplicate.value.kind, unknown.value.kind, await client.count()
+
+        assert run_with_server(scenario) == ("KeyError", "DuplicateBookError", "ValueError", 2)
+
+    def test_pipelined_requests(self):
+        """Много одновременных запросов по одному соединению получают свои ответы"""
+        async def scenario(server):
+            async with await LibraryClient.connect(port=server.port) as client:
+                isbns = [f"ISBN-{i:03d}" for i in range(100, 200)]
+                await asyncio.gather(*(client.add_book(
+                    PrintedBook("Книга", "Гоголь", 1840, "Повесть", isbn, 100, "мягкая")) for isbn in isbns))
+                found = await asyncio.gather(*(client.find_by_isbn(isbn) for isbn in isbns))
+                return [book.isbn for book in found] == isbns, await client.count()
+
+        assert run_with_server(scenario) == (True, 102)
+
+    def test_graceful_shutdown_answers_received_requests(self):
+        """Запросы, полученные до остановки, получают ответы, затем соединение закрывается"""
+        async def main():
+            server = LibraryServer(make_library(), port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            lines = "".join(json.dumps({"id": i, "op": "count"}) + "\n" for i in range(3))
+            writer.write(lines.encode("utf-8"))
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            await server.shutdown()
+            responses = [json.loads(line) for line in (await reader.read()).splitlines()]
+            writer.close()
+            return responses
+
+        responses = asyncio.run(main())
+        assert [response["id"] for response in responses] == [0, 1, 2]
+        assert all(response["result"] == 2 for response in responses)
+
+    def test_malformed_requests_keep_connection(self):
+        """Запрос неверной формы и слишком длинная строка получают ошибку, следующие запросы - ответы"""
+        async def scenario(server):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            lines = [
+                json.dumps({"id": 1, "op": "add", "book": [1]}),
+                json.dumps({"id": 2, "op": "add", "book": {"title": "Т", "author": "А", "year": 2000,
+                                                            "genre": "Ж", "isbn": 5}}),
+                json.dumps({"id": 3, "op": "find_by_author", "author": ["Толстой"]}),
+                "x" * (MAX_LINE + 10),
+                json.dumps({"id": 4, "op": "count"}),
+            ]
+            writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(5)]
+            writer.close()
+            return responses
+
+        responses = run_with_server(scenario)
+        assert [response["ok"] for response in responses] == [False, False, False, False, True]
+        assert [response["id"] for response in responses] == [1, 2, 3, None, 4]
+        assert responses[4]["result"] == 2
+
+    def test_client_oversized_request(self):
+        """Клиент не отправляет запрос длиннее MAX_LINE, соединение остаётся рабочим"""
+        async def scenario(server):
+            async with await LibraryClient.connect(port=server.port) as client:
+                book = PrintedBook("Т" * MAX_LINE, "Толстой", 1869, "Роман", "ISBN-009", 10, "мягкая")
+                with pytest.raises(ValueError):
+                    await asyncio.wait_for(client.add_book(book), 3)
+                return await asyncio.wait_for(client.count(), 3)
+
+        assert run_with_server(scenario) == 2
+
+    def test_client_reply_without_id(self):
+        """Ответ сервера без id достаётся самому старому ожидающему запросу"""
+        async def answer(reader, writer):
+            while await reader.readline():
+                writer.write(b'{"id": null, "ok": false, "error": "ValueError", "message": "bad"}\n')
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(answer, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                async with await LibraryClient.connect(port=port) as client:
+                    with pytest.raises(ServerError):
+                        await asyncio.wait_for(client.count(), 3)
+                    assert client._pending == {}
+
+        asyncio.run(main())
@@ -0,0 +1,99 @@
+import pytest
+from src.books import Book, PrintedBook
+from src.errors import DuplicateBookError, EmptyLibraryError
+from src.library import Library
+from src.sharding import ShardedLibrary, shard_of
+
+
+@pytest.fixture(scope="module")
+def books():
+    authors = ["Толстой", "Пушкин", "Гоголь"]
+    return [Book(f"Книга номер{i}", authors[i % 3], 1850 + i % 7, "Роман" if i % 2 else "Повесть", f"ISBN-{i}")
+            for i in range(60)]
+
+
+@pytest.fixture
+def sharded(books):
+    library = ShardedLibrary(shards=3)
+    library.add_books(books)
+    yield library
+    library.close()
+
+
+def isbns(books):
+    return sorted(book.isbn for book in books)
+
+
+class TestShardedLibrary:
+    """Тесты для библиотеки из нескольких процессов"""
+
+    def test_books_spread_over_shards(self, books):
+        """Книги распределяются по всем шардам"""
+        assert {shard_of(book.isbn, 3) for book in books} == {0, 1, 2}
+
+    def test_matches_library(self, sharded, books):
+        """Поиски дают те же книги, что и обычная Library"""
+        library = Library()
+        library.add_books(books)
+        assert len(sharded) == len(library) == 60
+        assert isbns(sharded.find_by_author("Пушкин")) == isbns(library.find_by_author("Пушкин"))
+        assert isbns(sharded.find_by_genre("Роман")) == isbns(library.find_by_genre("Роман"))
+        assert isbns(sharded.find_by_year(1851)) == isbns(library.find_by_year(1851))
+        assert isbns(sharded.query(author="Гоголь", min_year=1853)) == isbns(library.query(author="Гоголь", min_year=1853))
+        assert [book.year for book in sharded.find_by_year_range(1852, 1854)] == \
+            [book.year for book in library.find_by_year_range(1852, 1854)]
+        assert sharded.count_by_year_range(1852, 1854) == library.count_by_year_range(1852, 1854)
+        assert (sharded.min_year(), sharded.max_year()) == (1850, 1856)
+        assert sharded.autocomplete("author") == ["Гоголь", "Пушкин", "Толстой"]
+        assert len(sharded.search_title("номер1*")) == len(library.search_title("номер1*"))
+
+    def test_name_lookups_match_library(self):
+        """Автодополнение и подсказки сливаются в том же порядке, что у Library"""
+        names = ["Толстов", "Толстой", "Ёж", "Евдокимов"]
+        # Раскладываем значения по шардам так, чтобы в шарде 0 оказались «худшие» варианты
+        isbns = iter(f"ISBN-{i}" for i in range(1000))
+        shards = [0, 1, 0, 1]
+        books = [Book("Книга", name, 1900, "Роман", next(isbn for isbn in isbns if shard_of(isbn, 2) == shard))
+                 for name, shard in zip(names, shards)]
+        library = Library()
+        library.add_books(books)
+        sharded = ShardedLibrary(shards=2)
+        try:
+            sharded.add_books(books)
+            assert sharded.suggest("author", "Толстой", limit=1) == library.suggest("author", "Толстой", limit=1) \
+                == ["Толстой"]
+            assert sharded.suggest("author", "Толстой") == library.suggest("author", "Толстой")
+            assert sharded.autocomplete("author", "е", limit=1) == library.autocomplete("author", "е", limit=1) \
+                == ["Евдокимов"]
+            assert sharded.autocomplete("author") == library.autocomplete("author")
+        finally:
+            sharded.close()
+
+    def test_point_operations(self, sharded):
+        """Добавление, поиск по ISBN и удаление работают через один шард"""
+        book = PrintedBook("Мёртвые души", "Гоголь", 1842, "Поэма", "ISBN-MD", 352, "мягкая")
+        sharded.add_book(book)
+        assert "ISBN-MD" in sharded
+        assert sharded.find_by_isbn("ISBN-MD").pages == 352
+        sharded.remove_book(book)
+        assert sharded.find_by_isbn("ISBN-MD") is None
+        assert len(sharded) == 60
+
+    def test_errors_cross_processes(self, sharded, books):
+        """Ошибки шардов пробрасываются с исходным типом"""
+        with pytest.raises(DuplicateBookError) as error:
+            sharded.add_book(books[0])
+        assert error.value.isbn == "ISBN-0"
+        with pytest.raises(KeyError):
+            sharded.find_by_author("Чехов")
+        result = sharded.add_books([books[1], Book("Новая", "Чехов", 1900, "Рассказ", "ISBN-NEW")])
+        assert [book.isbn for book in result.added] == ["ISBN-NEW"]
+        assert len(sharded) == 61
+
+    def test_empty_library(self):
+        """Удаление из пустой библиотеки даёт EmptyLibraryError"""
+        with ShardedLibrary(shards=2) as library:
+            with pytest.raises(EmptyLibraryError):
+                library.remove_book(Book("Книга", "Толстой", 1900, "Роман", "ISBN-1"))
+            with pytest.raises(EmptyLibraryError):
+                library.min_year()
@@ -0,0 +1,113 @@
+import time
+import pytest
+from src.metrics import LatencyRecorder
+from src.simulation import run_simulation
+from src.sweep import grid, run_sweep
+
+
+class TestLatencyRecorder:
+    """Тесты для замеров задержек"""
+
+    def test_percentiles(self):
+        """Процентили считаются по всем замерам"""
+        recorder = LatencyRecorder()
+        for ns in range(1000, 101000, 1000):
+            recorder.record(ns)
+        assert len(recorder) == 100
+        assert recorder.percentile(50) == 50000
+        assert recorder.percentile(99) == 99000
+        assert recorder.summary()["max_us"] == 100.0
+
+    def test_empty(self):
+        """Без замеров все значения нулевые"""
+        assert LatencyRecorder().summary()["p99_us"] == 0
+
+
+class TestSimulation:
+    """Тесты для симуляции"""
+
+    def test_many_adds_without_duplicates(self):
+        """ISBN не повторяются даже при тысячах добавлений"""
+        report = run_simulation(steps=5000, seed=1, events={"add_book": 1}, output="silent")
+        assert report.books == 5003
+        assert len(report.latencies["add_book"]) == 5000
+
+    def test_event_and_type_mix(self):
+        """Учитываются только заданные события, попадания и промахи считаются"""
+        report = run_simulation(steps=2000, seed=2, events={"add_book": 2, "remove_book": 1, "get_nonexistent": 1},
+                                book_types={"printed": 1, "audio": 1}, output="silent")
+        assert set(report.latencies) == {"add_book", "remove_book", "get_nonexistent"}
+        assert sum(len(recorder) for recorder in report.latencies.values()) == 2000
+        assert report.misses["get_nonexistent"] == len(report.latencies["get_nonexistent"])
+        assert report.ops_per_second > 0
+
+    def test_reproducible_with_seed(self):
+        """Одинаковый seed даёт одинаковый ход симуляции"""
+        first = run_simulation(steps=500, seed=7, output="silent")
+        second = run_simulation(steps=500, seed=7, output="silent")
+        assert first.books == second.books
+        assert first.hits == second.hits
+
+    def test_trace_outside_measurement(self):
+        """Запись в трассу не входит в замеры задержек и не меняет ход симуляции"""
+        class SlowTrace:
+            def __init__(self):
+                self.entries = []
+
+            def record(self, *entry):
+                time.sleep(0.01)
+                self.entries.append(entry)
+
+        trace = SlowTrace()
+        report = run_simulation(steps=30, seed=7, output="silent", trace=trace)
+        assert len(trace.entries) == 3 + 30
+        assert all(recorder.summary()["p50_us"] < 5000 for recorder in report.latencies.values())
+        assert report.hits == run_simulation(steps=30, seed=7, output="silent").hits
+
+    def test_output_modes(self, capsys):
+        """verbose печатает шаги, summary - только итог, silent - ничего"""
+        run_simulation(steps=5, seed=3)
+        assert "Шаг 5." in capsys.readouterr().out
+        run_simulation(steps=5, seed=3, output="summary")
+        out = capsys.readouterr().out
+        assert "Шаг 1." not in out and "операций/с" in out
+        run_simulation(steps=5, seed=3, output="silent")
+        assert capsys.readouterr().out == ""
+
+    def test_invalid_arguments(self):
+        """Неизвестное событие, тип книги или режим вывода дают ValueError"""
+        with pytest.raises(ValueError):
+            run_simulation(events={"burn_book": 1}, output="silent")
+        with pytest.raises(ValueError):
+            run_simulation(book_types={"scroll": 1}, output="silent")
+        with pytest.raises(ValueError):
+            run_simulation(output="loud")
+
+
+class TestSweep:
+    """Тесты для множества прогонов симуляции"""
+
+    def test_grid(self):
+        """grid перебирает все сочетания параметров"""
+        configs = grid(steps=[10, 20], events=[{"add_book": 1}, {"add_book": 1, "remove_book": 1}])
+        assert len(configs) == 4
+        assert configs["steps=10 events=add_book=1"] == {"steps": 10, "events": {"add_book": 1}}
+
+    def test_results_do_not_depend_on_workers(self):
+        """Один процесс и пул дают одинаковые прогоны в одинаковом порядке"""
+        configs = grid(steps=[200], events=[{"add_book": 2, "remove_book": 1, "search_by_author": 1}])
+        serial = run_sweep(6, configs, workers=1)
+        pooled = run_sweep(6, configs, workers=2)
+        assert [run.outcome() for run in serial.runs] == [run.outcome() for run in pooled.runs]
+        assert [run.seed for run in pooled.runs] == list(range(6))
+
+    def test_summary(self):
+        """Сводка считает размер библиотеки, события и долю попаданий по всем seed"""
+        result = run_sweep([1, 2, 3], {"only_add": {"steps": 50, "events": {"add_book": 1}}}, workers=1)
+        row, = result.summary()
+        assert row["runs"] == 3
+        assert row["final_size_mean"] == row["final_size_min"] == 53  # 3 начальные книги + 50
+        assert row["events_mean"] == {"add_book": 50}
+        assert row["hit_rate_mean"] is None
+        assert "only_add" in result.table()
+        assert result.to_json()["runs"][0]["seed"] == 1
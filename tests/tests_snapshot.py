@@ -0,0 +1,132 @@
+import gc
+import random
+import sys
+import threading
+import pytest
+from src.books import Book, EBook
+from src.concurrency import ThreadSafeLibrary
+from src.library import Library
+
+
+@pytest.fixture
+def library():
+    library = Library()
+    library.add_book(Book("Война и мир", "Толстой", 1869, "Роман", "ISBN-001"))
+    library.add_book(Book("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-002"))
+    library.add_book(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-003"))
+    library.add_book(EBook("Нос", "Гоголь", 1836, "Повесть", "ISBN-004", "PDF", 1.5))
+    return library
+
+
+def isbns(books):
+    return [book.isbn for book in books]
+
+
+class TestLibrarySnapshot:
+    """Тесты для снимков библиотеки"""
+
+    def test_changes_after_snapshot_are_invisible(self, library):
+        """Добавления и удаления после снимка в нём не видны"""
+        snapshot = library.snapshot()
+        library.add_book(Book("Воскресение", "Толстой", 1899, "Роман", "ISBN-005"))
+        library.remove_book(library.find_by_isbn("ISBN-001"))
+        assert len(snapshot) == 4
+        assert isbns(snapshot) == ["ISBN-001", "ISBN-002", "ISBN-003", "ISBN-004"]
+        assert isbns(snapshot.find_by_author("Толстой")) == ["ISBN-001", "ISBN-002"]
+        assert isbns(snapshot.find_by_year_range(1860, 1900)) == ["ISBN-001", "ISBN-003", "ISBN-002"]
+        assert "ISBN-001" in snapshot and "ISBN-005" not in snapshot
+        assert isbns(library.find_by_author("Толстой")) == ["ISBN-002", "ISBN-005"]
+
+    def test_readded_isbn_shows_old_book(self, library):
+        """Книга, удалённая и добавленная заново с другими полями, в снимке прежняя"""
+        snapshot = library.snapshot()
+        library.remove_book(library.find_by_isbn("ISBN-004"))
+        library.add_book(Book("Шинель", "Гоголь", 1842, "Повесть", "ISBN-004"))
+        assert snapshot.find_by_isbn("ISBN-004").title == "Нос"
+        assert isbns(snapshot.find_by_year(1836)) == ["ISBN-004"]
+        with pytest.raises(KeyError):
+            snapshot.find_by_year(1842)
+
+    def test_counts_query_and_facets(self, library):
+        """Счётчики, составные запросы, поиск по названию и сводки считаются по снимку"""
+        snapshot = library.snapshot()
+        library.remove_book(library.find_by_isbn("ISBN-003"))
+        library.add_book(Book("Бесы", "Достоевский", 1872, "Роман", "ISBN-006"))
+        assert snapshot.count_by("author", "Достоевский") == 1
+        assert snapshot.count_by_year_range(1860, 1880) == 3
+        assert isbns(snapshot.query(genre="Роман", min_year=1869, max_year=1869)) == ["ISBN-001", "ISBN-003"]
+        assert isbns(snapshot.search_title("идиот")) == ["ISBN-003"]
+        assert snapshot.facets("year") == {1836: 1, 1869: 2, 1877: 1}
+        assert snapshot.facets("type") == {"book": 3, "ebook": 1}
+
+    def test_iteration_while_mutating(self, library):
+        """Перебор снимка не ломается, если библиотеку меняют в это время"""
+        library.add_books([Book(f"Книга {i}", "Автор", 1900, "Роман", f"ISBN-1{i:04d}") for i in range(3000)])
+        snapshot = library.snapshot()
+        expected = isbns(library.books)
+        seen = []
+        for number, book in enumerate(snapshot):
+            seen.append(book.isbn)
+            if number % 3 == 0:
+                library.remove_book(library.find_by_isbn(expected[-1 - number // 3]))
+                library.add_book(Book("Новая", "Автор", 2000, "Роман", f"ISBN-2{number:04d}"))
+        assert seen == expected
+
+    def test_memory_only_for_removals(self, library):
+        """Снимок хранит только книги, удалённые после него, и отпускается после release"""
+        snapshot = library.snapshot()
+        library.add_books([Book(f"Книга {i}", "Автор", 1900, "Роман", f"ISBN-1{i:04d}") for i in range(100)])
+        assert snapshot._removed == {}
+        library.remove_book(library.find_by_isbn("ISBN-10000"))  # Добавлена после снимка
+        assert snapshot._removed == {}
+        snapshot.release()
+        with pytest.raises(RuntimeError):
+            snapshot.find_by_author("Толстой")
+        with library.snapshot():
+            pass
+        library.snapshot()
+        gc.collect()
+        assert len(library._snapshots) == 0
+
+    def test_consistent_under_concurrent_writer(self):
+        """Перебор снимка из другого потока видит ровно книги на момент снимка, пока писатель работает"""
+        library = ThreadSafeLibrary()
+        library.add_books([Book(f"Книга {i}", "Автор", 1900, "Роман", f"ISBN-{i:05d}") for i in range(3000)])
+        stop = threading.Event()
+        errors = []
+
+        def writer():
+            rng = random.Random(1)
+            number = 3000
+            try:
+                while not stop.is_set():
+                    library.add_book(Book("Новая", "Автор", 2000, "Роман", f"ISBN-{number:05d}"))
+                    number += 1
+                    isbn = rng.choice(library.books).isbn
+                    library.remove_book(library.find_by_isbn(isbn))
+            except Exception as error:  # Ошибка писателя должна провалить тест, а не потеряться в потоке
+                errors.append(error)
+
+        def releaser():
+            while not stop.is_set():
+                library.snapshot().release()
+
+        threads = [threading.Thread(target=writer), threading.Thread(target=releaser)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            for thread in threads:
+                thread.start()
+            for _ in range(100):
+                with library.lock.reading():
+                    snapshot = library.snapshot()
+                    expected = sorted(book.isbn for book in library.books)
+                seen = [book.isbn for book in snapshot]
+                assert sorted(seen) == expected
+                snapshot.release()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            sys.setswitchinterval(interval)
+        assert errors == []
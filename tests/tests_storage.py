@@ -0,0 +1,80 @@
+from src.books import Book, PrintedBook, EBook, AudioBook
+from src.storage import PersistentLibrary, OperationLog, LOG_FILE
+from src.serialization import book_to_record, book_from_record
+
+
+def make_book(i):
+    return Book(f"Книга {i}", "Автор", 2000, "Жанр", f"ISBN-{i}")
+
+
+class TestStorage:
+    """Тесты для журнала операций и снимков"""
+
+    def test_record_round_trip(self):
+        """Книги всех типов переводятся в словарь и обратно"""
+        books = [
+            make_book(1),
+            PrintedBook("Печатная", "Автор", 2001, "Жанр", "ISBN-002", 300, "твёрдая"),
+            EBook("Электронная", "Автор", 2002, "Жанр", "ISBN-003", "PDF", 5.0),
+            AudioBook("Аудио", "Автор", 2003, "Жанр", "ISBN-004", 180, "Диктор"),
+        ]
+        for book in books:
+            restored = book_from_record(book_to_record(book))
+            assert type(restored) is type(book)
+            assert repr(restored) == repr(book)
+
+    def test_recover_from_log(self, tmp_path):
+        """После перезапуска книги восстанавливаются из журнала"""
+        with PersistentLibrary(tmp_path, fsync_every=1) as library:
+            for i in range(3):
+                library.add_book(make_book(i))
+            library.remove_book(library.find_by_isbn("ISBN-1"))
+
+        with PersistentLibrary(tmp_path) as library:
+            assert len(library) == 2
+            assert "ISBN-1" not in library
+            assert len(library.find_by_author("Автор")) == 2
+
+    def test_recover_from_snapshot_and_log_tail(self, tmp_path):
+        """Снимок очищает журнал, а операции после него повторяются из журнала"""
+        with PersistentLibrary(tmp_path, snapshot_every=None) as library:
+            library.add_books([make_book(i) for i in range(5)])
+            library.checkpoint()
+            assert list(OperationLog.read(tmp_path / LOG_FILE)) == []
+            library.remove_book(library.find_by_isbn("ISBN-0"))
+            library.add_book(make_book(10))
+
+        with PersistentLibrary(tmp_path) as library:
+            assert sorted(library.index) == ["ISBN-1", "ISBN-10", "ISBN-2", "ISBN-3", "ISBN-4"]
+
+    def test_automatic_snapshot(self, tmp_path):
+        """Снимок пишется автоматически после накопления операций"""
+        with PersistentLibrary(tmp_path, snapshot_every=3) as library:
+            library.add_books([make_book(i) for i in range(4)])
+            library.add_book(make_book(4))
+        assert len(list(OperationLog.read(tmp_path / LOG_FILE))) == 1
+
+        with PersistentLibrary(tmp_path) as library:
+            assert len(library) == 5
+
+    def test_torn_last_record_is_ignored(self, tmp_path):
+        """Оборванная при сбое последняя запись журнала пропускается"""
+        with PersistentLibrary(tmp_path) as library:
+            library.add_book(make_book(1))
+        with open(tmp_path / LOG_FILE, "a", encoding="utf-8") as file:
+            file.write('{"op": "add", "book": {"ty')
+
+        with PersistentLibrary(tmp_path) as library:
+            assert len(library) == 1
+
+    def test_write_after_torn_record_survives_restart(self, tmp_path):
+        """После восстановления оборванная запись обрезается, и новые записи читаются при следующем запуске"""
+        with PersistentLibrary(tmp_path) as library:
+            library.add_book(make_book(1))
+        with open(tmp_path / LOG_FILE, "a", encoding="utf-8") as file:
+            file.write('{"op": "add", "book": {"ty')
+
+        with PersistentLibrary(tmp_path) as library:
+            library.add_book(make_book(2))
+        with PersistentLibrary(tmp_path) as library:
+            assert sorted(book.isbn for book in library.books) == ["ISBN-1", "ISBN-2"]
@@ -0,0 +1,53 @@
+from src.books import Book
+from src.textindex import TitleIndex, tokenize
+from src.library import Library
+
+
+class TestTitleIndex:
+    """Тесты для полнотекстового индекса по названиям"""
+
+    def test_tokenize_folds_case_and_yo(self):
+        """Слова приводятся к нижнему регистру, ё заменяется на е"""
+        assert tokenize("Ёлки и ПАЛКИ, Trees!") == ["елки", "и", "палки", "trees"]
+
+    def test_search_all_words(self):
+        """Поиск находит книги, где есть все слова запроса"""
+        index = TitleIndex()
+        book1 = Book("Мастер и Маргарита", "Булгаков", 1967, "Роман", "ISBN-001")
+        book2 = Book("Мастер на все руки", "Автор", 2000, "Жанр", "ISBN-002")
+        index.add(book1)
+        index.add(book2)
+        assert index.search("мастер") == [book1, book2]
+        assert index.search("МАСТЕР маргарита") == [book1]
+        assert index.search("мастер лето") == []
+        assert index.search("") == []
+
+    def test_search_prefix(self):
+        """Слово со звёздочкой ищется по префиксу"""
+        index = TitleIndex()
+        book1 = Book("Ёжик в тумане", "Автор", 2000, "Жанр", "ISBN-001")
+        book2 = Book("Ежевика", "Автор", 2000, "Жанр", "ISBN-002")
+        index.add(book1)
+        index.add(book2)
+        assert {b.isbn for b in index.search("еж*")} == {"ISBN-001", "ISBN-002"}
+        assert index.search("еж* тум*") == [book1]
+
+    def test_remove_drops_words(self):
+        """После удаления слова названия больше не находятся"""
+        index = TitleIndex()
+        book = Book("Отцы и дети", "Тургенев", 1862, "Роман", "ISBN-001")
+        index.add(book)
+        index.remove(book)
+        assert len(index) == 0
+        assert index.search("отц*") == []
+
+    def test_library_search_title_follows_add_and_remove(self):
+        """Библиотека поддерживает индекс при добавлении и удалении книг"""
+        library = Library()
+        book = Book("Мастер и Маргарита", "Булгаков", 1967, "Роман", "ISBN-001")
+        library.add_book(book)
+        library.add_books([Book("Master and Margarita", "Bulgakov", 1967, "Novel", "ISBN-002")])
+        assert library.search_title("мастер") == [book]
+        assert [b.isbn for b in library.search_title("marg*")] == ["ISBN-002"]
+        library.remove_book(book)
+        assert library.search_title("мастер") == []
@@ -0,0 +1,68 @@
+import pytest
+from src.concurrency import ThreadSafeLibrary
+from src.library import Library
+from src.simulation import run_simulation
+from src.trace import TraceWriter, read_trace, replay
+
+
+EVENTS = {"add_book": 3, "remove_book": 1, "search_by_author": 2, "search_by_genre": 1, "get_nonexistent": 1}
+
+
+def record(path, steps=500, seed=7):
+    with TraceWriter(str(path), steps=steps, seed=seed) as writer:
+        report = run_simulation(steps, seed, EVENTS, {"printed": 1, "audio": 1}, output="silent", trace=writer)
+    return writer, report
+
+
+class TestTrace:
+    """Тесты для записи и воспроизведения трасс"""
+
+    def test_record_and_read(self, tmp_path):
+        """В трассе - начальные книги и все шаги, книги восстанавливаются с типами"""
+        writer, report = record(tmp_path / "trace.jsonl")
+        header, events = read_trace(str(tmp_path / "trace.jsonl"))
+        assert header["seed"] == 7
+        assert len(events) == writer.count == 503
+        adds = [arg for op, arg, _ in events if op == "add"]
+        removes = sum(1 for op, arg, _ in events if op == "remove" and arg is not None)
+        assert len(adds) - removes == report.books
+        assert {type(book).__name__ for book in adds} == {"PrintedBook", "AudioBook"}
+
+    @pytest.mark.parametrize("backend", [Library, ThreadSafeLibrary])
+    def test_replay_matches(self, tmp_path, backend):
+        """Воспроизведение на любой библиотеке даёт те же результаты"""
+        path = tmp_path / "trace.jsonl.gz"
+        _, report = record(path)
+        library = backend()
+        result = replay(str(path), library)
+        assert result.ok, result
+        assert len(library) == report.books
+        assert result.counts["find_author"] == report.latencies["search_by_author"].summary()["count"]
+        assert result.ops_per_second > 0
+
+    def test_removes_from_empty_library_recorded(self, tmp_path):
+        """Удаление из пустой библиотеки тоже записывается, и трасса повторяет все шаги симуляции"""
+        path = tmp_path / "trace.jsonl"
+        with TraceWriter(str(path)) as writer:
+            report = run_simulation(300, 3, {"add_book": 1, "remove_book": 3}, output="silent", trace=writer)
+        _, events = read_trace(str(path))
+        empty = [event for event in events if event[:2] == ("remove", None)]
+        assert empty
+        assert writer.count == 3 + 300
+        assert sum(1 for op, _, _ in events if op == "remove") == report.latencies["remove_book"].summary()["count"]
+        result = replay(str(path), Library())
+        assert result.ok, result
+        assert result.counts["remove"] == report.latencies["remove_book"].summary()["count"]
+
+    def test_mismatches_reported(self, tmp_path):
+        """Отличия от записанных результатов попадают в отчёт"""
+        record(tmp_path / "trace.jsonl")
+        header, events = read_trace(str(tmp_path / "trace.jsonl"))
+        library = Library()
+        library.add_book(events[0][1])  # Первая книга уже есть - add даст дубликат
+        result = replay((header, events), library)
+        assert not result.ok
+        assert result.mismatches[0][:2] == (1, "add")
+        assert "Расхождений с трассой" in repr(result)
+        # Без проверки результаты не сравниваются
+        assert replay((header, events), Library(), verify=False).mismatch_count == 0
@@ -0,0 +1,126 @@
+import pytest
+from src.books import Book
+from src.concurrency import ThreadSafeLibrary
+from src.errors import DuplicateBookError
+from src.indexdict import IndexDict
+from src.library import Library
+from src.storage import LOG_FILE, PersistentLibrary
+
+
+@pytest.fixture
+def library():
+    library = Library()
+    library.add_book(Book("Война и мир", "Толстой", 1869, "Роман", "ISBN-001"))
+    library.add_book(Book("Анна Каренина", "Толстой", 1877, "Роман", "ISBN-002"))
+    library.add_book(Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-003"))
+    return library
+
+
+def isbns(books):
+    return sorted(book.isbn for book in books)
+
+
+class TestTransaction:
+    """Тесты для транзакций библиотеки"""
+
+    def test_changes_applied_on_exit(self, library):
+        """Изменения видны только после выхода из блока и попадают во все структуры"""
+        with library.transaction() as tx:
+            tx.add(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-004"))
+            tx.remove(library.find_by_isbn("ISBN-003"))
+            assert "ISBN-004" not in library and "ISBN-003" in library
+            assert tx.find_by_isbn("ISBN-003") is None
+        assert isbns(library.books) == ["ISBN-001", "ISBN-002", "ISBN-004"]
+        assert isbns(library.find_by_year(1869)) == ["ISBN-001", "ISBN-004"]
+        assert library.index.min_year() == 1869
+        with pytest.raises(KeyError):
+            library.find_by_author("Гоголь")
+
+    def test_error_rolls_back(self, library):
+        """Ошибка внутри блока отменяет все изменения транзакции"""
+        with pytest.raises(DuplicateBookError):
+            with library.transaction() as tx:
+                tx.remove(library.find_by_isbn("ISBN-001"))
+                tx.add(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-004"))
+                tx.add(Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-003"))
+        assert isbns(library.books) == ["ISBN-001", "ISBN-002", "ISBN-003"]
+        with pytest.raises(ValueError):
+            with library.transaction() as tx:
+                tx.remove(Book("Бесы", "Достоевский", 1872, "Роман", "ISBN-009"))
+        assert len(library) == 3
+
+    def test_replace_and_cancel_in_one_transaction(self, library):
+        """Удаление и повторное добавление ISBN заменяет книгу, добавление и удаление ничего не меняют"""
+        library.enable_cache()
+        assert len(library.find_by_author("Гоголь")) == 1
+        with library.transaction() as tx:
+            tx.remove(library.find_by_isbn("ISBN-003"))
+            tx.add(Book("Шинель", "Гоголь", 1842, "Повесть", "ISBN-003"))
+            temporary = Book("Бесы", "Достоевский", 1872, "Роман", "ISBN-005")
+            tx.add(temporary)
+            tx.remove(temporary)
+            assert len(tx) == 2
+        assert library.find_by_author("Гоголь")[0].title == "Шинель"
+        assert "ISBN-005" not in library
+
+    def test_failed_apply_restores_state(self, library, monkeypatch):
+        """Сбой при записи в индекс возвращает удалённые книги и убирает добавленные"""
+        def broken(self, books):
+            raise MemoryError()
+        monkeypatch.setattr(IndexDict, "add_books", broken)
+        with pytest.raises(MemoryError):
+            with library.transaction() as tx:
+                tx.remove(library.find_by_isbn("ISBN-001"))
+                tx.add(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-004"))
+        assert isbns(library.books) == ["ISBN-001", "ISBN-002", "ISBN-003"]
+        assert isbns(library.find_by_author("Толстой")) == ["ISBN-001", "ISBN-002"]
+        assert "ISBN-004" not in library.index
+
+    def test_conflict_detected_at_commit(self):
+        """Если книгу удалили из другого места до фиксации, транзакция не применяется"""
+        library = ThreadSafeLibrary()
+        book = Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-003")
+        library.add_book(book)
+        tx = library.transaction()
+        tx.remove(book)
+        tx.add(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-004"))
+        library.remove_book(book)
+        with pytest.raises(ValueError):
+            tx.commit()
+        assert len(library) == 0
+
+    def test_remove_missing_book_keeps_structures(self, library):
+        """remove_book отсутствующей книги ничего не меняет"""
+        with pytest.raises(ValueError):
+            library.remove_book(Book("Бесы", "Достоевский", 1872, "Роман", "ISBN-009"))
+        assert len(library.books) == len(library.index) == 3
+
+    def test_persistent_transaction_is_logged(self, tmp_path):
+        """Операции транзакции попадают в журнал и переживают перезапуск"""
+        with PersistentLibrary(str(tmp_path)) as library:
+            library.add_book(Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-003"))
+            with library.transaction() as tx:
+                tx.remove(library.find_by_isbn("ISBN-003"))
+                tx.add(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-004"))
+        with PersistentLibrary(str(tmp_path)) as library:
+            assert isbns(library.books) == ["ISBN-004"]
+
+    def test_crash_mid_batch_drops_whole_transaction(self, tmp_path):
+        """Оборванная при сбое запись транзакции не применяется даже частично"""
+        with PersistentLibrary(str(tmp_path)) as library:
+            library.add_book(Book("Нос", "Гоголь", 1836, "Повесть", "ISBN-003"))
+            with library.transaction() as tx:
+                tx.remove(library.find_by_isbn("ISBN-003"))
+                tx.add(Book("Идиот", "Достоевский", 1869, "Роман", "ISBN-004"))
+                tx.add(Book("Бесы", "Достоевский", 1872, "Роман", "ISBN-005"))
+        log = tmp_path / LOG_FILE
+        data = log.read_bytes()
+        last = data.rindex(b"\n", 0, len(data) - 1) + 1
+        assert b'"batch"' in data[last:]
+        log.write_bytes(data[:last + (len(data) - last) // 2])  # Сбой посреди записи транзакции
+
+        with PersistentLibrary(str(tmp_path)) as library:
+            assert isbns(library.books) == ["ISBN-003"]
+            library.add_book(Book("Шинель", "Гоголь", 1842, "Повесть", "ISBN-006"))
+        with PersistentLibrary(str(tmp_path)) as library:
+            assert isbns(library.books) == ["ISBN-003", "ISBN-006"]
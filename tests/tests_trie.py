@@ -0,0 +1,87 @@
+import pytest
+from src.books import Book, AudioBook
+from src.library import Library
+from src.trie import PrefixTrie
+
+
+class TestPrefixTrie:
+    """Тесты для префиксного дерева автодополнения"""
+
+    def test_complete_by_prefix(self):
+        """Дополнение по началу без учёта регистра, по алфавиту"""
+        trie = PrefixTrie()
+        for value in ["Толстой", "Тургенев", "Пушкин", "Толкин"]:
+            trie.add(value)
+        assert trie.complete("то") == ["Толкин", "Толстой"]
+        assert trie.complete("") == ["Пушкин", "Толкин", "Толстой", "Тургенев"]
+        assert trie.complete("Т", limit=1) == ["Толкин"]
+        assert trie.complete("Х") == []
+
+    def test_counts_repeated_values(self):
+        """Значение исчезает только когда удалены все книги с ним"""
+        trie = PrefixTrie()
+        trie.add("Роман")
+        trie.add("Роман")
+        trie.remove("Роман")
+        assert "Роман" in trie
+        assert trie.count("Роман") == 1
+        trie.remove("Роман")
+        assert "Роман" not in trie
+        assert len(trie) == 0
+        assert trie.complete("р") == []
+
+    def test_remove_keeps_longer_values(self):
+        """Удаление короткого значения не трогает более длинные с тем же началом"""
+        trie = PrefixTrie()
+        trie.add("Рома")
+        trie.add("Роман")
+        trie.remove("Рома")
+        assert trie.complete("ром") == ["Роман"]
+
+    def test_remove_missing_error(self):
+        """Ошибка при удалении отсутствующего значения"""
+        trie = PrefixTrie()
+        trie.add("Роман")
+        with pytest.raises(KeyError):
+            trie.remove("Ром")
+
+    def test_keeps_each_spelling(self):
+        """Написания, отличающиеся регистром или ё/е, подсказываются отдельно, пока у них есть книги"""
+        trie = PrefixTrie()
+        trie.add("Фёдоров")
+        trie.add("Федоров", 2)
+        trie.add("фёдоров")
+        assert trie.complete("фе") == ["Федоров", "Фёдоров", "фёдоров"]
+        assert trie.count("Федоров") == 4
+        assert len(trie) == 3
+        trie.remove("Фёдоров")
+        assert trie.complete("фе") == ["Федоров", "фёдоров"]
+        assert trie.suggest("Федров") == ["Федоров", "фёдоров"]
+        with pytest.raises(KeyError):
+            trie.remove("Фёдоров")
+        trie.remove("Федоров", 2)
+        assert trie.complete("") == ["фёдоров"]
+
+    def test_suggest_similar(self):
+        """Подсказка похожих значений с опечаткой"""
+        trie = PrefixTrie()
+        for value in ["Толстой", "Достоевский", "Пушкин"]:
+            trie.add(value)
+        assert trie.suggest("толстй") == ["Толстой"]
+        assert trie.suggest("Пушкен") == ["Пушкин"]
+        assert trie.suggest("Гоголь") == []
+        assert trie.suggest("толстй", with_distance=True) == [(1, "Толстой")]
+
+    def test_library_autocomplete(self):
+        """Библиотека поддерживает деревья при добавлении и удалении книг"""
+        library = Library()
+        book = Book("Название", "Толстой", 2000, "Роман", "ISBN-001")
+        audio = AudioBook("Аудио", "Тургенев", 2001, "Повесть", "ISBN-002", 180, "Смоктуновский")
+        library.add_book(book)
+        library.add_books([audio])
+        assert library.autocomplete("author", "т") == ["Толстой", "Тургенев"]
+        assert library.autocomplete("narrator") == ["Смоктуновский"]
+        library.remove_book(audio)
+        assert library.autocomplete("author", "т") == ["Толстой"]
+        assert library.autocomplete("narrator") == []
+        assert library.suggest("genre", "Ромн") == ["Роман"]
@@ -0,0 +1,84 @@
+import pytest
+from src.validators import FIELD_RULES, validate, has_forbidden, has_digits
+from src.errors import (
+    EmptyStringError,
+    ContainsDigitsError,
+    LowercaseStartError,
+    ForbiddenSymbolError,
+    YearOutOfRangeError,
+    NegativeNumberError,
+    NumberTooLargeError,
+    InvalidCoverTypeError,
+)
+
+
+class TestValidators:
+    """Тесты для общих правил валидации"""
+
+    def test_valid_values_pass(self):
+        """Корректные значения возвращаются без изменений"""
+        assert validate("title", "1984") == "1984"
+        assert validate("author", "Толстой") == "Толстой"
+        assert validate("year", 2000) == 2000
+        assert validate("pages", 300) == 300
+
+    def test_empty_and_none(self):
+        """Пустая строка, пробелы и None считаются пустыми"""
+        for value in ("", "   ", None):
+            with pytest.raises(EmptyStringError):
+                validate("genre", value)
+
+    def test_digits_checked_only_where_required(self):
+        """Цифры запрещены в авторе, но допустимы в названии"""
+        with pytest.raises(ContainsDigitsError):
+            validate("author", "Автор1")
+        assert validate("title", "Книга 2") == "Книга 2"
+
+    def test_unicode_digits_detected(self):
+        """Цифрой считается всё, что считает str.isdigit"""
+        with pytest.raises(ContainsDigitsError):
+            validate("narrator", "Диктор²")
+
+    def test_digits_checked_before_forbidden_symbols(self):
+        """Порядок проверок совпадает с исходным конструктором книги"""
+        with pytest.raises(ContainsDigitsError):
+            validate("author", "Автор1@")
+
+    def test_forbidden_symbol(self):
+        """Запрещённые символы"""
+        with pytest.raises(ForbiddenSymbolError):
+            validate("title", "Книга\\")
+
+    def test_lowercase_start(self):
+        """Название может начинаться с цифры, автор — нет"""
+        with pytest.raises(LowercaseStartError):
+            validate("title", "книга")
+        with pytest.raises(LowercaseStartError):
+            validate("author", "  автор")
+
+    def test_cached_value_still_validated_for_other_field(self):
+        """Кэш проверенных значений у каждого поля свой"""
+        validate("title", "Книга 1")
+        with pytest.raises(ContainsDigitsError):
+            validate("genre", "Книга 1")
+
+    def test_numeric_ranges(self):
+        """Числовые диапазоны"""
+        with pytest.raises(YearOutOfRangeError):
+            validate("year", 1799)
+        with pytest.raises(NegativeNumberError):
+            validate("duration_minutes", 0)
+        with pytest.raises(NumberTooLargeError):
+            validate("file_size_mb", 10000.5)
+
+    def test_cover_type(self):
+        """Тип обложки из фиксированного набора"""
+        with pytest.raises(InvalidCoverTypeError):
+            FIELD_RULES["cover_type"]("картонная")
+
+    def test_cli_helpers(self):
+        """Проверки CLI используют те же правила"""
+        assert has_forbidden("a|b")
+        assert not has_forbidden("Война и мир")
+        assert has_digits("Автор 3")
+        assert not has_digits("Автор")